@@ -0,0 +1,113 @@
+"""
+Bakes the images of the game: every image at every factor the game scales it to is written already scaled
+and as raw pixels in the layout of the display to the baked folder (BAKED_ASSETS_DIR), with a manifest the ResourceManager reads
+Only images whose source or factor changed since the last bake are written again
+Run from the root of the project: python bake_assets.py [--force] [--clean]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from utils import resource_path
+from src.Game_Constants import RESIZE_FACTOR, BAKED_ASSETS_DIR
+from src.Scene_Loader import SceneLoader
+from src.BakedAssets import bake, scaled_size
+from src.Player import Player
+from src.Enemies import Red_Ghost, Stalker_Ghost
+
+LEVELS_DIR = "data"
+IMAGE_EXT = ('.png', '.jpg', '.jpeg')
+
+# Classes that load and scale their own image (IMAGE_PATH, IMAGE_FACTOR)
+CODE_IMAGES = [Player, Red_Ghost, Stalker_Ghost]
+
+
+def _images_in(folder):
+    paths = []
+    for root, _, files in os.walk(resource_path(folder)):
+        for filename in sorted(files):
+            if filename.lower().endswith(IMAGE_EXT):
+                paths.append(os.path.join(root, filename))
+    return paths
+
+
+def _flash_requests(zone_data):
+    """
+    Interactables scale their flash image to the size of their image (see Interactable), the size is read here
+    """
+    requests = []
+    for objects_data_list in zone_data.values():
+        for obj_data in objects_data_list:
+            if obj_data.get("type") != "Interactable":
+                continue
+            image_path, flash_path = obj_data.get("image_path"), obj_data.get("flash_image_path")
+            if not image_path or image_path == "None" or not flash_path or flash_path == "None":
+                continue
+            try:
+                source_size = pygame.image.load(resource_path(image_path)).get_size()
+            except (pygame.error, FileNotFoundError):
+                continue
+            size = scaled_size(source_size, obj_data.get("resize_factor", RESIZE_FACTOR))
+            requests.append((resource_path(flash_path), size))
+    return requests
+
+
+def collect_requests():
+    """
+    Returns the (path, factor) of every image the game loads through ResourceManager.get_scaled_image
+    (factor is a (width, height) for the flash images)
+    """
+    requests = []
+
+    # Objects of every level, as they are built (see SceneLoader.image_requests)
+    for filename in sorted(os.listdir(resource_path(LEVELS_DIR))):
+        if not filename.endswith(".json"):
+            continue
+        with open(resource_path(os.path.join(LEVELS_DIR, filename)), "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and "zones" in data:
+            requests.extend(SceneLoader.image_requests(data["zones"]))
+            requests.extend(_flash_requests(data["zones"]))
+
+    # ResourceManager.load_all_images loads assets/images as they are, Animation scales every frame by RESIZE_FACTOR
+    requests.extend((path, 1) for path in _images_in("assets/images"))
+    requests.extend((path, RESIZE_FACTOR) for path in _images_in("assets/animations"))
+    requests.extend((resource_path(cls.IMAGE_PATH), cls.IMAGE_FACTOR) for cls in CODE_IMAGES)
+
+    return list(dict.fromkeys(requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--force", action="store_true", help="bake every image again")
+    parser.add_argument("--clean", action="store_true", help="delete the baked images and exit")
+    args = parser.parse_args()
+
+    if args.clean:
+        shutil.rmtree(resource_path(BAKED_ASSETS_DIR), ignore_errors=True)
+        print(f"Deleted {BAKED_ASSETS_DIR}/")
+        return
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    start = time.perf_counter()
+    requests = collect_requests()
+    stats = bake(requests, force=args.force)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(requests)} images: {stats['baked']} baked, {stats['kept']} up to date, "
+          f"{stats['removed']} removed, {stats['missing']} missing, {stats['failed']} failed ({elapsed:.2f} s)")
+
+    pygame.quit()
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Load time of every image of the game (the assets/images folder and the images of every level) with
+1, 2, 4... workers of the ImageLoader, in threads and in processes
+Run from the root of the project: python benchmarks/image_decode.py [--repeat N] [--max-workers N]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from utils import resource_path
+from src.ImageLoader import ImageLoader
+from src.Scene_Loader import SceneLoader
+
+LEVELS = ("data/forest.json", "data/scene_output_new.json", "data/school_interior.json")
+
+
+def collect_requests():
+    requests = []
+    for level in LEVELS:
+        with open(resource_path(level), "r") as f:
+            requests.extend(SceneLoader.image_requests(json.load(f).get("zones", {})))
+
+    for root, _, files in os.walk(resource_path("assets/images")):
+        for filename in files:
+            if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+                requests.append((os.path.join(root, filename), 1))
+
+    return [request for request in dict.fromkeys(requests) if os.path.exists(request[0])]
+
+
+def measure(requests, workers, use_processes, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ImageLoader(workers, use_processes).load(requests)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration, the best one is shown")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    requests = collect_requests()
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    print(f"{len(requests)} images, {os.cpu_count()} cores, best of {args.repeat}")
+    print(f"{'workers':>8} {'threads (ms)':>14} {'processes (ms)':>16}")
+
+    baseline = None
+    for workers in worker_counts:
+        threads = measure(requests, workers, False, args.repeat)
+        processes = measure(requests, workers, True, args.repeat) if workers > 1 else threads
+        baseline = baseline or threads
+        print(f"{workers:>8} {threads * 1000:>14.1f} {processes * 1000:>16.1f}   x{baseline / min(threads, processes):.2f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
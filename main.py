@@ -1,5 +1,8 @@
+import multiprocessing
 from src.Game import Game
 
 if __name__ == "__main__":
+    # The ImageLoader can decode in processes, needed for them in the packaged (frozen) game
+    multiprocessing.freeze_support()
     game = Game()
     game.run()
\ No newline at end of file
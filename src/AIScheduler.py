@@ -0,0 +1,109 @@
+import time
+import pygame
+from .Game_Constants import SCREEN_WIDTH, SCREEN_HEIGHT, AI_SCREEN_MARGIN, AI_LOD_LEVELS, AI_TICK_BUDGET_MS
+
+
+class _AIState:
+    """
+    Scheduling state of one enemy
+    accumulated: ms since its last update (passed as delta_time when it's ticked)
+    sleep: ms it can still sleep (set from behaviour.sleep_time())
+    """
+    __slots__ = ("accumulated", "sleep")
+
+    def __init__(self):
+        self.accumulated = 0.0
+        self.sleep = 0.0
+
+
+class AIScheduler:
+    """
+    Decides which enemies of a scene are updated each frame
+        - Enemies on screen (or flashing, batched, or with a frame based behaviour) are updated every frame
+        - Dormant enemies sleep for the time their behaviour reports in sleep_time() (e.g. a Stalker waiting)
+        - Offscreen enemies tick at the rates of AI_LOD_LEVELS depending on their distance to the player
+    Skipped time is accumulated and given as delta_time on the next tick, so timers and speeds stay the same
+    Reduced rate ticks share a per-frame budget (AI_TICK_BUDGET_MS), the ones left out go first next frame
+    """
+    def __init__(self, budget_ms=AI_TICK_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self.screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT).inflate(AI_SCREEN_MARGIN * 2, AI_SCREEN_MARGIN * 2)
+        self._states = {}
+        self.stats = {"ticked": 0, "sleeping": 0, "waiting": 0, "deferred": 0}
+
+    def reset(self):
+        """
+        Forgets the scheduling state (the enemies of the scene changed), every enemy is ticked in the next update
+        """
+        self._states.clear()
+
+    def _interval(self, enemy, player):
+        """
+        Returns the ms between ticks for an enemy, 0 means every frame
+        """
+        if enemy.rect.colliderect(self.screen_rect):
+            return 0
+
+        dx = enemy.rect.centerx - player.rect.centerx
+        dy = enemy.rect.centery - player.rect.centery
+        distance_sq = dx * dx + dy * dy
+        for max_distance, interval in AI_LOD_LEVELS:
+            if max_distance is None or distance_sq <= max_distance * max_distance:
+                return interval
+        return 0
+
+    def _tick(self, enemy, state):
+        delta_time = state.accumulated
+        state.accumulated = 0.0
+        enemy.update(delta_time)
+
+        sleep_time = getattr(enemy.behaviours, "sleep_time", None)
+        state.sleep = sleep_time() * 1000 if sleep_time else 0.0
+        self.stats["ticked"] += 1
+
+    def update(self, delta_time, enemies, player=None):
+        """
+        Updates the enemies that are due this frame
+        Without a player every enemy is updated (same as enemies.update)
+        """
+        stats = self.stats
+        for key in stats:
+            stats[key] = 0
+
+        due = []
+        for enemy in list(enemies):
+            state = self._states.get(enemy)
+            if state is None:
+                state = _AIState()
+                self._states[enemy] = state
+            state.accumulated += delta_time
+
+            if player is None or enemy.batched or enemy.is_flashing or getattr(enemy.behaviours, "frame_based", False):
+                self._tick(enemy, state)
+                continue
+
+            if state.sleep > 0:
+                state.sleep -= delta_time
+                if state.sleep > 0:
+                    stats["sleeping"] += 1
+                    continue
+
+            interval = self._interval(enemy, player)
+            if interval == 0:
+                self._tick(enemy, state)
+            elif state.accumulated >= interval:
+                due.append((enemy, state))
+            else:
+                stats["waiting"] += 1
+
+        if not due:
+            return
+
+        # The ones that waited the longest go first, whatever doesn't fit in the budget waits for the next frame
+        due.sort(key=lambda item: item[1].accumulated, reverse=True)
+        start = time.perf_counter()
+        for index, (enemy, state) in enumerate(due):
+            if (time.perf_counter() - start) * 1000 > self.budget_ms:
+                stats["deferred"] = len(due) - index
+                break
+            self._tick(enemy, state)
@@ -2,197 +2,211 @@ from src.GameState import game_state
 from src.Game_Constants import MAPS, LEVEL_MUSIC, LEVEL_DARKNESS
 from utils import resource_path
 from src.ResourceManager import ResourceManager
-from src.Game_Enums import Actions
+from src.Game_Enums import Actions, SoundCategories
+from src.ActionParams import ActionParams, parse_action_params
+from src.ActionRegistry import ActionRegistry, ActionHandler
+from src.AudioManager import audio_manager
+from src.Logger import get_logger
 import pygame
 import random
 
+log = get_logger("ActionManager")
+
 class ActionManager:
+    """
+    Executes actions through the ActionRegistry
+    Every built-in action is a method of this class registered at the bottom of this file,
+    new ones can be added with ActionRegistry.register without touching this class
+    """
     def __init__(self, sound_library=None):
         self.sound_library = sound_library if sound_library else {}
 
-    def parse_params(self, param_string):
-        params = {}
-        if not param_string: return params
-        
-        clean_string = param_string.replace('\n', ';').replace('\r', '')
-        
-        pairs = clean_string.split(';')
-        for pair in pairs:
-            if '=' in pair:
-                key, value = pair.split('=', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                value = value.replace('\\n', '\n') 
-
-                if value.lower() == 'true': value = True
-                elif value.lower() == 'false': value = False
-                else:
-                    try: value = int(value)
-                    except: pass 
-                
-                params[key] = value
-        return params
-
-    def execute(self, action_type, param_string, player, scene):
-        print(f"[ACTION] {action_type} -> {param_string}")
-        params = self.parse_params(param_string)
+    def parse_params(self, param_string, action_type=None):
+        """
+        Parses a 'key=value;...' string into read-only typed parameters (see ActionParams)
+        Levels parse their parameters when they are loaded, this is for strings built at runtime
+        """
+        return parse_action_params(param_string, action_type)
+
+    def execute(self, action, params, player, scene):
+        """
+        Executes an action
+        Parameters:
+            action: The ActionHandler resolved at load, or an action name (one of the Actions values)
+            params: ActionParams parsed at load (a raw 'key=value' string is parsed here as a fallback)
+        """
+        handler = action if isinstance(action, ActionHandler) else ActionRegistry.resolve(action)
+
+        if not isinstance(params, ActionParams):
+            params = self.parse_params(params, handler.action)
 
         sound_name = params.get("sound")
         if sound_name and sound_name != "silent":
             if sound_name in self.sound_library:
-                self.sound_library[sound_name].play()
+                audio_manager.play(self.sound_library[sound_name], SoundCategories.STINGER)
             else:
-                print(f"Sound '{sound_name}' not found.")
-
-
-        if action_type == Actions.SET_FLAG:
-            key = params.get("flag")
-            val = params.get("value")
-            if key: game_state.set_flag(key, val)
-            
-        elif action_type == Actions.INCREMENT_FLAG:
-            key = params.get("flag")
-            amount = params.get("value", 1)
-            if key: game_state.increment_flag(key, amount)
-
-        elif action_type == Actions.TELEPORT:
-            zone_str = str(params.get("zone"))
-            x = params.get("x")
-            y = params.get("y")
-            
-            if x is not None and y is not None:
-                game_state.request_teleport(zone_str, x, y)
-                print(f"[ActionManager] Teleport requested to {zone_str} at ({x}, {y})")
-
-        elif action_type == Actions.PLAY_SOUND:
-            sound_name = params.get("sound")
-            sound_volume = float(params.get("volume", 1.0))
-            if sound_name in self.sound_library:
+                log.warning("Sound '%s' not found", sound_name)
 
-                self.sound_library[sound_name].set_volume(sound_volume)
-                self.sound_library[sound_name].play()
-                print(f"Playing sound: {sound_name}")
-            else:
-                print(f"Error: Sound '{sound_name}' not found in library")
-            
-        elif action_type == Actions.UNHIDE_OBJECT:
-            tid = params.get("id")
-            if tid: 
-                scene.unhide_object_by_id(tid)
-
-        elif action_type == Actions.HIDE_OBJECT:
-            tid = params.get("id")
-            if tid:
-                scene.hide_object_by_id(tid)
-
-        elif action_type == Actions.MODIFY_LIGHT:
-            enable = params.get("enable", False)
-            scene.has_darkness = enable
-
-        elif action_type == Actions.RANDOM_ACTION:
-            chance = int(params.get("chance", 50))
-            roll = random.randint(1, 100)
-
-            if roll <= chance:
-                print(f"[RandomAction] Success ({roll} <= {chance}). Executing sub-action")
-                sub_action = params.get("action")
-                return self.execute(sub_action, param_string, player, scene)
-
-        elif action_type == Actions.CHANGE_LEVEL:
-            level_name = params.get("level")
-            json_file = params.get("json")
-            zone_str = str(params.get("zone"))
-            x = params.get("x")
-            y = params.get("y")
-            
-            if level_name in MAPS and json_file:
-                clean = zone_str.replace("(", "").replace(")", "")
-                parts = clean.split(",")
-                new_zone = (int(parts[0]), int(parts[1]))
-                
-                music = LEVEL_MUSIC.get(level_name)
-                is_dark = LEVEL_DARKNESS.get(level_name, False)
-                
-                game_state.request_level_change(
-                    json_path=resource_path(json_file),
-                    map_matrix=MAPS[level_name],
-                    entry_zone=new_zone,
-                    player_pos=(x, y),
-                    music_path=music,
-                    darkness=is_dark
-                )
-
-        elif action_type == Actions.SHOW_NOTE:
-            text_content = params.get("text", "")
-            return {
-                "type": "Note",
-                "data": text_content,
-                "sound": params.get("sound")
-            }
-        
-        elif action_type == Actions.SHOW_DIALOGUE:
-            text = params.get("text", "...")
-            
-            color_str = str(params.get("color", "255,255,255"))
-            
-            try:
-                text_color = tuple(map(int, color_str.split(',')))
-            except:
-                print(f"Error parsing color: {color_str}, using white.")
-                text_color = (255, 255, 255)
-
-            return {
-                "type": "Dialogue",
-                "data": {
-                    "text": text,
-                    "color": text_color
-                },
-                "sound": params.get("sound"),
-                "pause_music": params.get("pause_music", False)
-            }
-        
-        elif action_type == Actions.SHOW_IMAGE:
-            path = params.get("image") or params.get("path")
-            return {
-                "type": "Image",
-                "data": path,
-                "sound": params.get("sound"),
-                "pause_music": params.get("pause_music", False)
-            }
-        
-        elif action_type == Actions.CLOSE_IMAGE:
-            pass
-
-        elif action_type == Actions.SHOW_ANIMATION:
-            base_path = params.get("path")
-            frames = int(params.get("frames", 1))
-            speed = float(params.get("speed", 0.1))
-            loop = params.get("loop", True)
-
-            image_list = []
-            if base_path:
-                clean_base = base_path.replace(".png", "")
-                for i in range(frames):
-                    image_list.append(f"{clean_base}_{i}.png")
-                
-            return {
-                "type": "Animation",
-                "data": image_list,
-                "speed": speed,
-                "loop": loop,
-                "sound": params.get("sound"),
-                "pause_music": params.get("pause_music", False)
-            }
-        
-        elif action_type == Actions.CHANGE_MUSIC:
-            # This action needs the path and not the key because of the way pygame manages music and sounds
-            music_path = params.get("path") or params.get("music")
-            fade_ms = int(params.get("fade", 500))
-            volume = float(params.get("volume", 0.6))
-            loop_count = int(params.get("loop", -1))
-
-            if music_path:
-                ResourceManager.play_music(music_path, volume, loop_count, fade_ms)
-        
-        return None
\ No newline at end of file
+        return handler.run(self, params, player, scene)
+
+    # --- Built-in actions ---
+
+    def _wait(self, params, player, scene):
+        # Waits are handled by the EventManager, as a single action it does nothing
+        return None
+
+    def _set_flag(self, params, player, scene):
+        key = params.get("flag")
+        val = params.get("value")
+        if key: game_state.set_flag(key, val)
+
+    def _increment_flag(self, params, player, scene):
+        key = params.get("flag")
+        amount = params.get("value", 1)
+        if key: game_state.increment_flag(key, amount)
+
+    def _teleport(self, params, player, scene):
+        zone = params.get("zone")
+        x = params.get("x")
+        y = params.get("y")
+
+        if x is not None and y is not None:
+            game_state.request_teleport(zone, x, y)
+            log.debug("Teleport requested to %s at (%s, %s)", zone, x, y)
+
+    def _play_sound(self, params, player, scene):
+        sound_name = params.get("sound")
+        sound_volume = params.get("volume", 1.0)
+        if sound_name in self.sound_library:
+            audio_manager.play(self.sound_library[sound_name], SoundCategories.STINGER, volume=sound_volume)
+            log.debug("Playing sound: %s", sound_name)
+        else:
+            log.warning("Sound '%s' not found in library", sound_name)
+
+    def _unhide_object(self, params, player, scene):
+        tid = params.get("id")
+        if tid:
+            scene.unhide_object_by_id(tid)
+
+    def _hide_object(self, params, player, scene):
+        tid = params.get("id")
+        if tid:
+            scene.hide_object_by_id(tid)
+
+    def _modify_light(self, params, player, scene):
+        enable = params.get("enable", False)
+        scene.has_darkness = enable
+
+    def _random_action(self, params, player, scene):
+        chance = params.get("chance", 50)
+        roll = random.randint(1, 100)
+
+        if roll <= chance:
+            log.debug("RandomAction success (%s <= %s). Executing sub-action", roll, chance)
+            # The params were parsed with the sub-action schema too (see ActionParams), they are reused as they are
+            sub_action = params.get("action")
+            if sub_action and sub_action != Actions.RANDOM_ACTION:
+                return ActionRegistry.resolve(sub_action).run(self, params, player, scene)
+
+    def _change_level(self, params, player, scene):
+        level_name = params.get("level")
+        json_file = params.get("json")
+        new_zone = params.get("zone")
+        x = params.get("x")
+        y = params.get("y")
+
+        if level_name in MAPS and json_file and new_zone:
+            music = LEVEL_MUSIC.get(level_name)
+            is_dark = LEVEL_DARKNESS.get(level_name, False)
+
+            game_state.request_level_change(
+                json_path=resource_path(json_file),
+                map_matrix=MAPS[level_name],
+                entry_zone=new_zone,
+                player_pos=(x, y),
+                music_path=music,
+                darkness=is_dark
+            )
+
+    def _show_note(self, params, player, scene):
+        text_content = params.get("text", "")
+        return {
+            "type": "Note",
+            "data": text_content,
+            "sound": params.get("sound")
+        }
+
+    def _show_dialogue(self, params, player, scene):
+        text = params.get("text", "...")
+        text_color = params.get("color", (255, 255, 255))
+
+        return {
+            "type": "Dialogue",
+            "data": {
+                "text": text,
+                "color": text_color
+            },
+            "sound": params.get("sound"),
+            "pause_music": params.get("pause_music", False)
+        }
+
+    def _show_image(self, params, player, scene):
+        path = params.get("image") or params.get("path")
+        return {
+            "type": "Image",
+            "data": path,
+            "sound": params.get("sound"),
+            "pause_music": params.get("pause_music", False)
+        }
+
+    def _close_image(self, params, player, scene):
+        pass
+
+    def _show_animation(self, params, player, scene):
+        base_path = params.get("path")
+        frames = params.get("frames", 1)
+        speed = params.get("speed", 0.1)
+        loop = params.get("loop", True)
+
+        image_list = []
+        if base_path:
+            clean_base = base_path.replace(".png", "")
+            for i in range(frames):
+                image_list.append(f"{clean_base}_{i}.png")
+
+        return {
+            "type": "Animation",
+            "data": image_list,
+            "speed": speed,
+            "loop": loop,
+            "sound": params.get("sound"),
+            "pause_music": params.get("pause_music", False)
+        }
+
+    def _change_music(self, params, player, scene):
+        # This action needs the path and not the key because of the way pygame manages music and sounds
+        music_path = params.get("path") or params.get("music")
+        fade_ms = params.get("fade", 500)
+        volume = params.get("volume", 0.6)
+        loop_count = params.get("loop", -1)
+
+        if music_path:
+            ResourceManager.play_music(music_path, volume, loop_count, fade_ms)
+
+
+ActionRegistry.register(Actions.WAIT, ActionManager._wait)
+ActionRegistry.register(Actions.SET_FLAG, ActionManager._set_flag)
+ActionRegistry.register(Actions.INCREMENT_FLAG, ActionManager._increment_flag)
+ActionRegistry.register(Actions.TELEPORT, ActionManager._teleport)
+ActionRegistry.register(Actions.PLAY_SOUND, ActionManager._play_sound)
+ActionRegistry.register(Actions.UNHIDE_OBJECT, ActionManager._unhide_object)
+ActionRegistry.register(Actions.HIDE_OBJECT, ActionManager._hide_object)
+ActionRegistry.register(Actions.MODIFY_LIGHT, ActionManager._modify_light)
+ActionRegistry.register(Actions.RANDOM_ACTION, ActionManager._random_action)
+ActionRegistry.register(Actions.CHANGE_LEVEL, ActionManager._change_level)
+ActionRegistry.register(Actions.SHOW_NOTE, ActionManager._show_note)
+ActionRegistry.register(Actions.SHOW_DIALOGUE, ActionManager._show_dialogue)
+ActionRegistry.register(Actions.SHOW_IMAGE, ActionManager._show_image)
+ActionRegistry.register(Actions.CLOSE_IMAGE, ActionManager._close_image)
+ActionRegistry.register(Actions.SHOW_ANIMATION, ActionManager._show_animation)
+ActionRegistry.register(Actions.CHANGE_MUSIC, ActionManager._change_music)
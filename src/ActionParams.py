@@ -0,0 +1,220 @@
+from collections import namedtuple
+from collections.abc import Mapping
+from functools import lru_cache
+from .Game_Enums import Actions, Conditions
+from .ActionRegistry import ActionRegistry
+from .Logger import get_logger
+
+log = get_logger("ActionParams")
+
+
+# --- Value converters ---
+# They receive the raw string written in the editor and raise ValueError if it can't be used
+
+def _to_text(raw):
+    return raw.replace('\\n', '\n')
+
+def _to_upper(raw):
+    return raw.upper()
+
+def _to_bool(raw):
+    lowered = raw.lower()
+    if lowered == 'true': return True
+    if lowered == 'false': return False
+    raise ValueError(f"expected true/false, got '{raw}'")
+
+def _to_int(raw):
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"expected an integer, got '{raw}'")
+
+def _to_float(raw):
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"expected a number, got '{raw}'")
+
+def _to_number(raw):
+    try:
+        return int(raw)
+    except ValueError:
+        return _to_float(raw)
+
+def _to_zone(raw):
+    """
+    '(4, 2)' -> (4, 2)
+    """
+    clean = raw.replace("(", "").replace(")", "")
+    parts = clean.split(",")
+    if len(parts) != 2:
+        raise ValueError(f"expected a zone like (y, x), got '{raw}'")
+    try:
+        return (int(parts[0]), int(parts[1]))
+    except ValueError:
+        raise ValueError(f"expected a zone like (y, x), got '{raw}'")
+
+def _to_color(raw):
+    """
+    '170,30,30' -> (170, 30, 30)
+    """
+    try:
+        return tuple(map(int, raw.split(',')))
+    except ValueError:
+        raise ValueError(f"expected a color like 255,255,255, got '{raw}'")
+
+def _to_any(raw):
+    """
+    Untyped values: booleans, integers or strings (same rules the editor docs describe)
+    """
+    value = _to_text(raw)
+    if value.lower() == 'true': return True
+    if value.lower() == 'false': return False
+    try: return int(value)
+    except ValueError: return value
+
+
+# Parameters every action accepts (see Actions.md, Global Parameters)
+GLOBAL_SCHEMA = {
+    "blocking": _to_bool,
+    "kill": _to_bool,
+    "pause_music": _to_bool,
+    "sound": str,
+}
+
+ACTION_SCHEMAS = {
+    Actions.WAIT: {"time": _to_float},
+    Actions.SET_FLAG: {"flag": str},
+    Actions.INCREMENT_FLAG: {"flag": str, "value": _to_number},
+    Actions.TELEPORT: {"zone": _to_zone, "x": _to_number, "y": _to_number},
+    Actions.PLAY_SOUND: {"volume": _to_float},
+    Actions.UNHIDE_OBJECT: {"id": str},
+    Actions.HIDE_OBJECT: {"id": str},
+    Actions.MODIFY_LIGHT: {"enable": _to_bool},
+    Actions.RANDOM_ACTION: {"chance": _to_int, "action": str},
+    Actions.CHANGE_LEVEL: {"level": str, "json": str, "zone": _to_zone, "x": _to_number, "y": _to_number},
+    Actions.SHOW_NOTE: {"text": _to_text},
+    Actions.SHOW_DIALOGUE: {"text": _to_text, "color": _to_color},
+    Actions.SHOW_IMAGE: {"image": str, "path": str},
+    Actions.CLOSE_IMAGE: {},
+    Actions.SHOW_ANIMATION: {"path": str, "frames": _to_int, "speed": _to_float, "loop": _to_bool},
+    Actions.CHANGE_MUSIC: {"path": str, "music": str, "fade": _to_int, "volume": _to_float, "loop": _to_int},
+}
+
+FLAG_CONDITION_SCHEMA = {"flag": str, "flag_a": str, "flag_b": str, "condition": _to_upper, "expr": str}
+
+CONDITION_SCHEMAS = {
+    Conditions.IF_FLAG: FLAG_CONDITION_SCHEMA,
+    Conditions.AUTO_START: FLAG_CONDITION_SCHEMA,
+}
+
+
+class ActionParams(Mapping):
+    """
+    Read-only, already typed parameters of an action
+    Built once when the level is loaded, so executing an action never touches the original string
+    Behaves like a dict for reading (get, in, [], keys...)
+    """
+    __slots__ = ("_values", "raw", "errors")
+
+    def __init__(self, values, raw="", errors=()):
+        self._values = values
+        self.raw = raw
+        self.errors = errors
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"ActionParams({self._values})"
+
+
+EMPTY_PARAMS = ActionParams({})
+
+# A scripted event step: action name, its parsed parameters and its ActionHandler (resolved at load)
+ScriptStep = namedtuple("ScriptStep", ["action", "params", "handler"])
+
+
+def _schema_for(action, condition):
+    schema = dict(GLOBAL_SCHEMA)
+    schema.update(ACTION_SCHEMAS.get(action, {}))
+    if condition:
+        schema.update(CONDITION_SCHEMAS.get(condition, {}))
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _parse(param_string, action, condition):
+    if not param_string:
+        return EMPTY_PARAMS
+
+    values = {}
+    errors = []
+    pairs = param_string.replace('\n', ';').replace('\r', '').split(';')
+
+    raw_pairs = []
+    for pair in pairs:
+        if '=' in pair:
+            key, value = pair.split('=', 1)
+            raw_pairs.append((key.strip(), value.strip()))
+
+    schema = _schema_for(action, condition)
+
+    # RandomAction carries the parameters of its sub-action
+    if action == Actions.RANDOM_ACTION:
+        sub_action = next((value for key, value in raw_pairs if key == "action"), None)
+        if sub_action == Actions.RANDOM_ACTION:
+            errors.append("RandomAction can't run another RandomAction")
+        elif sub_action:
+            schema.update(ACTION_SCHEMAS.get(sub_action, {}))
+            schema.update(ACTION_SCHEMAS[Actions.RANDOM_ACTION])
+
+    for key, raw in raw_pairs:
+        converter = schema.get(key, _to_any)
+        try:
+            values[key] = converter(raw)
+        except ValueError as e:
+            errors.append(f"'{key}': {e}")
+
+    return ActionParams(values, param_string, tuple(errors))
+
+
+def parse_action_params(param_string, action=None, condition=None, source=None):
+    """
+    Parses a 'key=value;key2=value' string into ActionParams
+    Parameters:
+        param_string: The raw string written in the editor
+        action (optional): The action that will receive the parameters, used to type them
+        condition (optional): The trigger condition, IfFlag/AutoStart add their own parameters
+        source (optional): Id of the object that owns the parameters, used when reporting errors
+    Invalid values are reported here (at load) and left out, so the action uses its default
+    """
+    if action is not None and action != "None" and action not in ACTION_SCHEMAS:
+        log.warning("%s: unknown action '%s'", source, action)
+
+    params = _parse(param_string or "", action, condition)
+    for error in params.errors:
+        log.warning("%s (%s): %s", source, action, error)
+    return params
+
+
+def compile_script(steps, source=None):
+    """
+    Turns the 'scripted_events' list of the JSON into a tuple of ScriptStep with parsed parameters and resolved handlers
+    """
+    if not steps:
+        return ()
+    return tuple(
+        ScriptStep(
+            step.get("action"),
+            parse_action_params(step.get("params", ""), step.get("action"), source=source),
+            ActionRegistry.resolve(step.get("action"))
+        )
+        for step in steps
+    )
@@ -0,0 +1,107 @@
+import time
+
+
+class ActionHandler:
+    """
+    A registered action: the function that runs it plus its execution counters
+    Triggers and script steps keep a reference to their handler (resolved at load),
+    so running an action doesn't need to look at the action name again
+    """
+    __slots__ = ("action", "func", "calls", "total_time", "max_time")
+
+    def __init__(self, action, func=None):
+        self.action = action
+        self.func = func
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def run(self, manager, params, player, scene):
+        """
+        Runs the action and updates its counters
+        Actions that were never registered do nothing (same as an unknown action name)
+        """
+        if self.func is None:
+            return None
+
+        start = time.perf_counter()
+        try:
+            return self.func(manager, params, player, scene)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.calls += 1
+            self.total_time += elapsed
+            if elapsed > self.max_time:
+                self.max_time = elapsed
+
+
+class ActionRegistry:
+    """
+    Table of every action the ActionManager can execute, keyed by the Actions values
+    New actions are added with ActionRegistry.register, no changes to ActionManager needed
+    """
+    _handlers = {}
+
+    @staticmethod
+    def register(action, func=None, schema=None):
+        """
+        Registers the function that executes an action
+        Parameters:
+            action: The action name (e.g. Actions.SET_FLAG or a new one)
+            func: A function (manager, params, player, scene) -> result dict or None
+            schema (optional): {param: converter} used to type its parameters at load (see ActionParams)
+        Can be used as a decorator: @ActionRegistry.register("MyAction")
+        """
+        if func is None:
+            return lambda f: ActionRegistry.register(action, f, schema)
+
+        from .ActionParams import ACTION_SCHEMAS, _parse
+        if schema is not None or action not in ACTION_SCHEMAS:
+            ACTION_SCHEMAS[action] = schema or {}
+            # Parameters already parsed with the old schema are cached
+            _parse.cache_clear()
+
+        handler = ActionRegistry.resolve(action)
+        handler.func = func
+        return func
+
+    @staticmethod
+    def resolve(action):
+        """
+        Returns the ActionHandler of an action
+        The same handler object is always returned, even if the action is registered later
+        """
+        handler = ActionRegistry._handlers.get(action)
+        if handler is None:
+            handler = ActionHandler(action)
+            ActionRegistry._handlers[action] = handler
+        return handler
+
+    @staticmethod
+    def is_registered(action):
+        handler = ActionRegistry._handlers.get(action)
+        return handler is not None and handler.func is not None
+
+    @staticmethod
+    def get_stats():
+        """
+        Returns {action: {"calls", "total_ms", "avg_ms", "max_ms"}} for every action that was executed
+        """
+        stats = {}
+        for action, handler in ActionRegistry._handlers.items():
+            if handler.calls == 0:
+                continue
+            stats[action] = {
+                "calls": handler.calls,
+                "total_ms": handler.total_time * 1000,
+                "avg_ms": handler.total_time * 1000 / handler.calls,
+                "max_ms": handler.max_time * 1000
+            }
+        return stats
+
+    @staticmethod
+    def reset_stats():
+        for handler in ActionRegistry._handlers.values():
+            handler.calls = 0
+            handler.total_time = 0.0
+            handler.max_time = 0.0
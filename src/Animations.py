@@ -1,10 +1,26 @@
 import pygame
 from .Game_Constants import RESIZE_FACTOR
+from .ResourceManager import ResourceManager
+
+
+def tint_surface(surface, color):
+    """
+    Returns a tinted copy of surface (multiplies every channel by color)
+    Used to build flash/tint variants once instead of every frame
+    """
+    tinted = surface.copy()
+    tinted.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+    return tinted
+
 
 class Animation:
     """
     Manages a sequence of images to create an animation effect for a given sprite
+    Frames come from the ResourceManager cache, so every animation of the same images shares the surfaces
     """
+    # Variant frames registered with a shared_key, by (shared_key, image paths)
+    _shared_variants = {}
+
     def __init__(self, sprite, images: list, velocity):
         """
         Description: Initializes the animation object
@@ -13,17 +29,67 @@ class Animation:
             images (list): A list of file paths (strings) to the images that make up the animation frames
             velocity: The speed of the animation. A higher value means faster animation.
         Functionality:
-            Loads and scales each image from the provided images list using RESIZE_FACTOR from Game_Constants.py
+            Gets each image from the provided images list scaled by RESIZE_FACTOR from Game_Constants.py (cached)
             Sets the initial animation index to 0
         """
-        self.images = []
         self.sprite = sprite
         self.velocity = velocity
         self.index = 0
-        for image in images:
-            image = pygame.image.load(image).convert_alpha()
-            image = pygame.transform.scale(image, (image.get_width() * RESIZE_FACTOR, image.get_height() * RESIZE_FACTOR))
-            self.images.append(image)
+        self.paths = tuple(images)
+        self.images = [ResourceManager.get_scaled_image(image, RESIZE_FACTOR) for image in images]
+
+        # Variants are alternative versions of every frame (e.g. a flash tint)
+        # They are generated once, the first time they are requested, and then reused
+        self._variant_builders = {}
+        self._variant_keys = {}
+        self._variants = {}
+        self.variant = None
+        self.frames = self.images
+
+    def add_variant(self, name, builder, shared_key=None):
+        """
+        Registers a variant of this animation
+        Parameters:
+            name: Key used to select the variant with use_variant
+            builder: A function that receives a frame (Surface) and returns the variant frame
+            shared_key (optional): If given, the variant frames are shared with every animation of the same images
+                                   that registers the same shared_key (e.g. ("flash", color)), built only once
+        """
+        self._variant_builders[name] = builder
+        self._variant_keys[name] = shared_key
+        self._variants.pop(name, None)
+
+    def get_variant(self, name):
+        """
+        Returns the list of frames for a variant, building it the first time
+        """
+        if name is None:
+            return self.images
+
+        frames = self._variants.get(name)
+        if frames is None:
+            shared_key = self._variant_keys[name]
+            if shared_key is not None:
+                frames = Animation._shared_variants.get((shared_key, self.paths))
+
+            if frames is None:
+                builder = self._variant_builders[name]
+                frames = [builder(image) for image in self.images]
+                if shared_key is not None:
+                    Animation._shared_variants[(shared_key, self.paths)] = frames
+            self._variants[name] = frames
+        return frames
+
+    def use_variant(self, name=None):
+        """
+        Swaps the frames used by the animation, keeping the current index
+        None goes back to the original frames
+        """
+        if name == self.variant:
+            return
+        self.variant = name
+        self.frames = self.get_variant(name)
+        self.sprite.image = self.frames[int(self.index)]
 
     def animate(self):
         """
@@ -34,6 +100,6 @@ class Animation:
             Updates the image attribute of the associated sprite to the current animation frame
         """
         self.index = self.index + self.velocity
-        if self.index >= len(self.images): 
+        if self.index >= len(self.frames):
             self.index = 0
-        self.sprite.image = self.images[int(self.index)]
\ No newline at end of file
+        self.sprite.image = self.frames[int(self.index)]
@@ -0,0 +1,143 @@
+import pygame
+from .Game_Constants import AUDIO_CHANNELS, AUDIO_CATEGORY_PRIORITIES, AUDIO_MAX_INSTANCES
+from .Game_Enums import SoundCategories
+from .Logger import get_logger
+
+log = get_logger("AudioManager")
+
+
+class _Voice:
+    """
+    What a managed channel is playing: the sound, its category (and priority), when it started and if it loops
+    """
+    __slots__ = ("channel", "sound", "category", "priority", "started", "looping")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.sound = None
+        self.category = None
+        self.priority = 0
+        self.started = 0
+        self.looping = False
+
+    def is_playing(self):
+        return self.sound is not None and self.channel.get_busy()
+
+
+class AudioManager:
+    """
+    Plays every sound effect of the game on a fixed pool of mixer channels
+    Each play has a category (see SoundCategories) whose priority decides who keeps a channel:
+        - A sound already playing max_instances times restarts its oldest copy instead of stacking another one
+        - Otherwise it takes a free channel
+        - If every channel is busy it steals the one of the lowest priority (the oldest among equals)
+          as long as that priority is lower than its own, if not the sound is dropped
+    Looping sounds (loops=-1) are never stolen nor restarted, their owner keeps the channel play() returns
+    and stops them with stop_loop() (a loop that was dropped can be played again the next frame)
+    Other sounds are stopped as usual (sound.stop() stops every channel playing it) or with stop()
+    """
+    def __init__(self, channels=AUDIO_CHANNELS):
+        self.channel_count = channels
+        self._voices = []
+        self._plays = 0
+        self.stats = {"played": 0, "restarted": 0, "stolen": 0, "dropped": 0}
+
+    def init(self):
+        """
+        Creates the channel pool, call it after pygame.mixer.init()
+        """
+        if not pygame.mixer.get_init():
+            return False
+        pygame.mixer.set_num_channels(self.channel_count)
+        self._voices = [_Voice(pygame.mixer.Channel(i)) for i in range(self.channel_count)]
+        log.info("Audio channels: %s", self.channel_count)
+        return True
+
+    def play(self, sound, category=SoundCategories.UI, loops=0, volume=None, max_instances=AUDIO_MAX_INSTANCES):
+        """
+        Plays a sound on a channel of the pool
+        Parameters:
+            sound: The pygame.mixer.Sound (None does nothing)
+            category: One of SoundCategories, its priority is used for voice stealing
+            loops: As in Sound.play, -1 loops forever
+            volume (optional): Volume of this play (multiplies the volume of the sound), 1.0 by default
+            max_instances: Copies of this sound that can play at once
+        Returns the Channel it plays on or None if it was dropped
+        """
+        if sound is None:
+            return None
+        if not self._voices and not self.init():
+            return None
+
+        priority = AUDIO_CATEGORY_PRIORITIES.get(category, 0)
+        voice = self._choose_voice(sound, priority, max_instances)
+        if voice is None:
+            self.stats["dropped"] += 1
+            log.debug("Sound dropped, no channel for priority %s", priority)
+            return None
+
+        self._plays += 1
+        voice.sound = sound
+        voice.category = category
+        voice.priority = priority
+        voice.started = self._plays
+        voice.looping = loops < 0
+        voice.channel.set_volume(1.0 if volume is None else volume)
+        voice.channel.play(sound, loops=loops)
+        self.stats["played"] += 1
+        return voice.channel
+
+    def _choose_voice(self, sound, priority, max_instances):
+        free = None
+        instances = []
+        lowest = None
+
+        for voice in self._voices:
+            if not voice.is_playing():
+                if free is None:
+                    free = voice
+                continue
+            if voice.looping:
+                continue
+            if voice.sound is sound:
+                instances.append(voice)
+            if lowest is None or (voice.priority, voice.started) < (lowest.priority, lowest.started):
+                lowest = voice
+
+        if max_instances and len(instances) >= max_instances:
+            self.stats["restarted"] += 1
+            return min(instances, key=lambda voice: voice.started)
+
+        if free is not None:
+            return free
+
+        if lowest is not None and lowest.priority < priority:
+            lowest.channel.stop()
+            self.stats["stolen"] += 1
+            return lowest
+        return None
+
+    def stop(self, sound):
+        """
+        Stops every channel playing the sound
+        """
+        if sound is not None:
+            sound.stop()
+
+    def stop_loop(self, channel, sound):
+        """
+        Stops a looping sound on the channel play() returned for it, other copies of the sound keep playing
+        """
+        if channel is not None and channel.get_sound() is sound:
+            channel.stop()
+
+    def stop_category(self, category):
+        for voice in self._voices:
+            if voice.is_playing() and voice.category == category:
+                voice.channel.stop()
+
+    def active_voices(self):
+        return sum(1 for voice in self._voices if voice.is_playing())
+
+
+audio_manager = AudioManager()
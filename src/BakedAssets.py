@@ -0,0 +1,209 @@
+import os
+import json
+import hashlib
+import pygame
+from utils import resource_path
+from .Game_Constants import BAKED_ASSETS_DIR
+from .Logger import get_logger
+
+log = get_logger("BakedAssets")
+
+MANIFEST_FILE = "manifest.json"
+VERSION = 1
+PIXEL_FORMAT = "BGRA" # Layout of the baked pixels, the one convert_alpha() surfaces use
+
+
+def scaled_size(size, factor):
+    """
+    Size of an image of size scaled by factor, factor can also be the (width, height) to scale it to
+    """
+    if isinstance(factor, tuple):
+        return factor
+    return int(size[0] * factor), int(size[1] * factor)
+
+
+def asset_key(path, factor):
+    """
+    Manifest key of an image at a factor: its path relative to the game folder and the factor (4 and 4.0 are the same)
+    """
+    relative = os.path.relpath(os.path.abspath(path), resource_path("")).replace(os.sep, "/")
+    if isinstance(factor, tuple):
+        return f"{relative}@{factor[0]}x{factor[1]}"
+    return f"{relative}@{float(factor)!r}"
+
+
+def _hash_file(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BakedAssets:
+    """
+    Images already scaled and converted to raw pixels in the layout of the display (PIXEL_FORMAT)
+    by bake_assets.py, listed in a manifest
+    Loading one is reading its file and pygame.image.frombuffer, there's no PNG decoding, no transform and no convert
+    An entry is used only while its source keeps the size and mtime it had when it was baked, otherwise the PNG
+    is loaded as usual (and a warning tells to run bake_assets.py again)
+    """
+    def __init__(self, directory=BAKED_ASSETS_DIR):
+        self.directory = directory
+        self.stats = {"hits": 0, "misses": 0}
+        self._entries = None
+
+    def _manifest(self):
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        try:
+            with open(resource_path(os.path.join(self.directory, MANIFEST_FILE)), "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == VERSION:
+                self._entries = manifest.get("images", {})
+                log.info("Baked images: %s", len(self._entries))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log.warning("Baked assets manifest unreadable: %s", e)
+        return self._entries
+
+    def lookup(self, path, factor=1):
+        """
+        Returns (baked file, size) of an image at a factor, None if it isn't baked or its source changed
+        """
+        entries = self._manifest()
+        if not entries:
+            return None
+
+        key = asset_key(path, factor)
+        entry = entries.get(key)
+        if entry is not None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stat = None
+            if stat is not None and stat.st_size == entry["source_size"] and stat.st_mtime_ns == entry["source_mtime"]:
+                self.stats["hits"] += 1
+                return resource_path(os.path.join(self.directory, entry["file"])), tuple(entry["size"])
+            log.warning("Baked image %s is out of date, loading the source (run bake_assets.py)", key)
+
+        self.stats["misses"] += 1
+        return None
+
+    def reload(self):
+        self._entries = None
+
+
+def read_baked(baked):
+    """
+    Reads a baked image found with lookup(), returns (size, pixels, format) like ImageLoader decodes them
+    """
+    file_path, size = baked
+    try:
+        with open(file_path, "rb") as f:
+            return size, f.read(), PIXEL_FORMAT
+    except OSError as e:
+        return None, str(e), None
+
+
+# --- Baking (see bake_assets.py) ---
+
+def bake(requests, directory=BAKED_ASSETS_DIR, force=False):
+    """
+    Bakes a list of (path, factor): every image is scaled and written as raw PIXEL_FORMAT pixels to directory
+    Incremental: an image is baked again only if its factor is new or its source changed (size and mtime,
+    then the content hash to ignore files only touched). Every other file of directory is deleted
+    Returns the stats {"baked", "kept", "removed", "missing", "failed"}
+    """
+    out_dir = resource_path(directory)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    os.makedirs(out_dir, exist_ok=True)
+
+    old_entries = {}
+    if not force:
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == VERSION:
+                old_entries = manifest.get("images", {})
+        except (OSError, ValueError):
+            pass
+
+    stats = {"baked": 0, "kept": 0, "removed": 0, "missing": 0, "failed": 0}
+    entries = {}
+
+    for path, factor in dict.fromkeys(requests):
+        key = asset_key(path, factor)
+        if key in entries:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            log.warning("Image to bake not found: %s", path)
+            stats["missing"] += 1
+            continue
+
+        entry = old_entries.get(key)
+        if entry is not None and os.path.exists(os.path.join(out_dir, entry["file"])):
+            if entry["source_size"] == stat.st_size and entry["source_mtime"] == stat.st_mtime_ns:
+                entries[key] = entry
+                stats["kept"] += 1
+                continue
+            source_hash = _hash_file(path)
+            if entry["source_size"] == stat.st_size and entry["source_hash"] == source_hash:
+                entry["source_mtime"] = stat.st_mtime_ns
+                entries[key] = entry
+                stats["kept"] += 1
+                continue
+
+        try:
+            entries[key] = _bake_image(path, factor, key, stat, out_dir)
+            stats["baked"] += 1
+        except (pygame.error, OSError) as e:
+            log.error("Can't bake %s: %s", path, e)
+            stats["failed"] += 1
+
+    # Files of images that aren't requested anymore (or from an older bake)
+    used_files = {entry["file"] for entry in entries.values()}
+    used_files.add(MANIFEST_FILE)
+    for file_name in os.listdir(out_dir):
+        if file_name not in used_files:
+            try:
+                os.remove(os.path.join(out_dir, file_name))
+                stats["removed"] += 1
+            except OSError:
+                pass
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": VERSION, "images": entries}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return stats
+
+
+def _bake_image(path, factor, key, stat, out_dir):
+    image = pygame.image.load(path)
+    if factor != 1:
+        # Same size computation as ResourceManager.get_scaled_image
+        image = pygame.transform.scale(image, scaled_size(image.get_size(), factor))
+
+    file_name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".raw"
+    tmp_path = os.path.join(out_dir, file_name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(pygame.image.tobytes(image, PIXEL_FORMAT))
+    os.replace(tmp_path, os.path.join(out_dir, file_name))
+
+    log.debug("Baked %s", key)
+    return {
+        "file": file_name,
+        "size": list(image.get_size()),
+        "source_size": stat.st_size,
+        "source_mtime": stat.st_mtime_ns,
+        "source_hash": _hash_file(path),
+    }
+
+
+baked_assets = BakedAssets()
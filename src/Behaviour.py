@@ -3,6 +3,11 @@ import pygame
 import math
 from src.Game_Constants import SCREEN_HEIGHT, SCREEN_WIDTH, TRANSITION_BIAS
 from abc import ABC, abstractmethod
+from src.AudioManager import audio_manager
+from src.Game_Enums import SoundCategories
+from src.Logger import get_logger
+
+log = get_logger("Behaviour")
 
 class _Behaviour(ABC):
     """
@@ -21,11 +26,22 @@ class _Behaviour(ABC):
         """
         pass
 
+    # Behaviours that move a fixed amount per call (not scaled by delta_time) must be applied every frame
+    frame_based = False
+
+    def sleep_time(self):
+        """
+        Seconds the enemy can go without being updated (used by the AIScheduler), 0 if it needs every frame
+        """
+        return 0.0
+
 
 class Sine_Wave_Movement(_Behaviour):
     """
     A behaviour that makes the enemy move in a sine wave pattern vertically
     """
+    frame_based = True # x_velocity is added every frame
+
     def __init__(self, amplitude=70, frequency=0.5, x_velocity = 1, direction = True):
         self.amplitude = amplitude
         self.frequency = frequency
@@ -33,6 +49,10 @@ class Sine_Wave_Movement(_Behaviour):
         self.direction = direction
         self.time_ellapsed = 0.0
 
+        # Set while an EnemyBatch steps this behaviour (its state lives in the batch arrays then)
+        self.batch_group = None
+        self.batch_slot = None
+
     def apply(self, enemy, delta_time):
         self.time_ellapsed += delta_time / 1000.0
 
@@ -46,6 +66,9 @@ class Sine_Wave_Movement(_Behaviour):
         """
         Reverses the horizontal movement direction
         """
+        if self.batch_group is not None:
+            self.batch_group.reverse(self.batch_slot)
+            return
         self.direction = not self.direction
 
 
@@ -69,6 +92,7 @@ class StalkerBehaviour(_Behaviour):
 
         self.chase_sound = chase_sound
         self.is_chase_sound_playing = False
+        self.chase_channel = None
         self.flee_sound = flee_sound
 
     def _start_waiting_offscreen(self, enemy):
@@ -94,12 +118,21 @@ class StalkerBehaviour(_Behaviour):
             enemy.x = -300 - TRANSITION_BIAS # offscreen
             enemy.y = random.randint(0, SCREEN_HEIGHT)
 
+    def sleep_time(self):
+        """
+        While waiting nothing happens until the wait time is over
+        """
+        if self.state == "WAITING":
+            return max(0.0, self.current_wait_time - self.timer)
+        return 0.0
+
     def _stop_chase_sound(self):
         """
         Stops chase sound
         """
         if self.chase_sound and self.is_chase_sound_playing:
-            self.chase_sound.stop()
+            audio_manager.stop_loop(self.chase_channel, self.chase_sound)
+            self.chase_channel = None
             self.is_chase_sound_playing = False
 
     def apply(self, enemy, delta_time):
@@ -119,8 +152,8 @@ class StalkerBehaviour(_Behaviour):
             # Pursuing state
 
             if self.chase_sound and not self.is_chase_sound_playing:
-                self.chase_sound.play(loops=-1)
-                self.is_chase_sound_playing = True
+                self.chase_channel = audio_manager.play(self.chase_sound, SoundCategories.CHASE, loops=-1)
+                self.is_chase_sound_playing = self.chase_channel is not None
             direction = pygame.Vector2(self.target.rect.centerx - enemy.x, self.target.rect.centery - enemy.y)
             distance = direction.length()
 
@@ -157,7 +190,7 @@ class StalkerBehaviour(_Behaviour):
         self.state = "FLEEING"
         self._stop_chase_sound()
         if self.flee_sound:
-            self.flee_sound.play()
+            audio_manager.play(self.flee_sound, SoundCategories.CHASE)
 
         player_pos = pygame.math.Vector2(self.target.rect.centerx, self.target.rect.centery)
         enemy_pos = pygame.math.Vector2(enemy.x, enemy.y)
@@ -178,7 +211,73 @@ class StalkerBehaviour(_Behaviour):
     def reset(self):
         self.state = "WAITING"
         self._stop_chase_sound()
-        print("Stalker reset")
+        log.debug("Stalker reset")
+
+
+class SeekBehaviour(_Behaviour):
+    """
+    A behaviour that moves the enemy straight towards the target at a constant speed
+    Simpler than StalkerBehaviour (no states or sounds), meant for swarms: EnemyBatch steps many of them at once
+    """
+    def __init__(self, target, speed, stop_distance=0):
+        self.target = target
+        self.speed = speed
+        self.stop_distance = stop_distance
+
+        self.batch_group = None
+        self.batch_slot = None
+
+    def apply(self, enemy, delta_time):
+        dx = self.target.rect.centerx - enemy.x
+        dy = self.target.rect.centery - enemy.y
+        distance = math.hypot(dx, dy)
+
+        if distance > self.stop_distance:
+            step = self.speed * delta_time / 1000.0
+            enemy.x += dx / distance * step
+            enemy.y += dy / distance * step
+
+        enemy.x_offset = 0
+        enemy.y_offset = 0
+
+
+class PathfindingBehaviour(_Behaviour):
+    """
+    A behaviour for ground-bound enemies that walks around obstacles to reach the player
+    It follows the flow field of the scene Navigation (shared by every enemy of the zone)
+    The Scene sets self.navigation when the enemy is added to it
+    """
+    def __init__(self, target, speed, stop_distance=40, navigation=None):
+        self.target = target
+        self.speed = speed
+        self.stop_distance = stop_distance
+        self.navigation = navigation
+
+    def apply(self, enemy, delta_time):
+        if self.navigation is None or self.target.is_defeated:
+            return
+
+        target_x, target_y = self.target.rect.center
+        direction = pygame.Vector2(target_x - enemy.x, target_y - enemy.y)
+        if direction.length() <= self.stop_distance:
+            return
+
+        field = self.navigation.flow_field(target_x, target_y)
+        if field is not None and not field.in_target_cell(enemy.x, enemy.y):
+            waypoint = field.waypoint(enemy.x, enemy.y)
+            if waypoint is not None:
+                direction = pygame.Vector2(waypoint[0] - enemy.x, waypoint[1] - enemy.y)
+            # Without a waypoint (offscreen or stuck in an obstacle) it walks straight to the player
+
+        if direction.length_squared() == 0:
+            return
+
+        direction.scale_to_length(self.speed * delta_time / 1000.0)
+        enemy.x += direction.x
+        enemy.y += direction.y
+
+    def reset(self):
+        pass
 
 
 class Do_Nothing_Behaviour(_Behaviour):
@@ -0,0 +1,244 @@
+from .Game_Constants import BROADPHASE_CELL_SIZE
+from .Game_Enums import Conditions
+
+# Interactables touched with the body vs. the ones that need the player's attack
+BODY_CONTACT_CONDITIONS = (Conditions.ON_STAY, Conditions.ON_ENTER)
+ATTACK_CONTACT_CONDITIONS = (Conditions.ON_INTERACT, "None")
+
+
+class SpatialHash:
+    """
+    Uniform grid that buckets objects by the cells their rect covers
+    Queries only look at the cells under the query rect, so their cost depends on
+    what is around that rect and not on how many objects are stored
+    """
+    def __init__(self, cell_size=BROADPHASE_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._spans = {}
+
+    def _span(self, rect):
+        """
+        Returns the (first_x, first_y, last_x, last_y) cells covered by rect or None for empty rects
+        """
+        if rect.width <= 0 or rect.height <= 0:
+            return None
+        size = self.cell_size
+        return (int(rect.left // size), int(rect.top // size), int((rect.right - 1) // size), int((rect.bottom - 1) // size))
+
+    def insert(self, obj, rect):
+        span = self._span(rect)
+        self._spans[obj] = span
+        if span is None:
+            return
+
+        first_x, first_y, last_x, last_y = span
+        for cx in range(first_x, last_x + 1):
+            for cy in range(first_y, last_y + 1):
+                self._cells.setdefault((cx, cy), []).append(obj)
+
+    def remove(self, obj):
+        span = self._spans.pop(obj, None)
+        if span is None:
+            return
+
+        first_x, first_y, last_x, last_y = span
+        for cx in range(first_x, last_x + 1):
+            for cy in range(first_y, last_y + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket:
+                    bucket.remove(obj)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def move(self, obj, rect):
+        """
+        Updates the cells of a moving object
+        Does nothing unless the object crossed a cell border
+        """
+        if obj in self._spans and self._spans[obj] == self._span(rect):
+            return
+        self.remove(obj)
+        self.insert(obj, rect)
+
+    def clear(self):
+        self._cells.clear()
+        self._spans.clear()
+
+    def query(self, rect):
+        """
+        Returns the set of objects stored in the cells touched by rect
+        The caller still has to do the exact rect test
+        """
+        found = set()
+        span = self._span(rect)
+        if span is None:
+            return found
+
+        first_x, first_y, last_x, last_y = span
+        for cx in range(first_x, last_x + 1):
+            for cy in range(first_y, last_y + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+
+
+class ContactTracker:
+    """
+    Remembers which objects were touched in the previous frame
+    update() returns what started and what stopped touching since then
+    """
+    def __init__(self):
+        self.current = set()
+
+    def update(self, touching):
+        touching = set(touching)
+        entered = touching - self.current
+        exited = self.current - touching
+        self.current = touching
+        return entered, exited
+
+    def clear(self):
+        self.current = set()
+
+
+class Contacts:
+    """
+    Result of a Broadphase query for one frame
+    Lists keep the load order of the scene so results are deterministic
+    """
+    __slots__ = (
+        "triggers", "entered_triggers",
+        "interactables", "ended_interactables",
+        "attacked_enemies", "touching_enemies"
+    )
+
+    def __init__(self):
+        self.triggers = []
+        self.entered_triggers = set()
+        self.interactables = []
+        self.ended_interactables = set()
+        self.attacked_enemies = []
+        self.touching_enemies = []
+
+
+class Broadphase:
+    """
+    Per-frame collision query service of a Scene
+    Finds the triggers, interactables and enemies that overlap the player's collision_rect and attack_rect
+    Interactables are in contact when the rect their trigger_condition cares about touches them
+    (body for OnStay/OnEnter, attack for OnInteract), the query reports the contacts that ended
+    Triggers and interactables are indexed once per zone (hidden ones too, the scene groups
+    decide if they are active), enemies are re-bucketed by move_enemy when they move (see _Enemy.on_moved),
+    so a query only looks up the cells around the player
+    """
+    def __init__(self, scene, cell_size=BROADPHASE_CELL_SIZE):
+        self.scene = scene
+        self.cell_size = cell_size
+
+        self._trigger_grids = {}
+        self._interactable_grids = {}
+        self._order = {}
+        self._enemy_grid = SpatialHash(cell_size)
+
+        self.trigger_contacts = ContactTracker()
+        self.interactable_contacts = ContactTracker()
+
+    def _build_grid(self, objects):
+        grid = SpatialHash(self.cell_size)
+        for obj in objects:
+            self._order.setdefault(obj, len(self._order))
+            grid.insert(obj, obj.rect)
+        return grid
+
+    def _grids_for(self, zone):
+        """
+        Returns the (triggers, interactables) grids of a zone, building them the first time
+        """
+        if zone not in self._trigger_grids:
+            self._trigger_grids[zone] = self._build_grid(self.scene._triggers_dict.get(zone, []))
+            self._interactable_grids[zone] = self._build_grid(self.scene._interactables_dict.get(zone, []))
+        return self._trigger_grids[zone], self._interactable_grids[zone]
+
+    def invalidate_zone(self, zone):
+        """
+        Forces the zone to be indexed again (e.g. if its objects were moved)
+        """
+        self._trigger_grids.pop(zone, None)
+        self._interactable_grids.pop(zone, None)
+
+    def reset_enemies(self):
+        """
+        Called when the enemies of the scene change (zone change)
+        """
+        self._enemy_grid.clear()
+        for enemy in self.scene.enemies:
+            self._enemy_grid.insert(enemy, enemy.collision_rect)
+
+    def move_enemy(self, enemy):
+        """
+        Called when an enemy moved, its cells only change if it crossed a cell border
+        """
+        self._enemy_grid.move(enemy, enemy.collision_rect)
+
+    def end_contacts(self):
+        """
+        Ends every active interactable contact (used when the scene is left)
+        """
+        for obj in self.interactable_contacts.current:
+            obj.on_contact_end()
+        self.interactable_contacts.clear()
+        self.trigger_contacts.clear()
+
+    def _sorted(self, objects):
+        return sorted(objects, key=lambda obj: self._order.get(obj, 0))
+
+    def query(self, player):
+        """
+        Returns a Contacts object with everything touching the player this frame
+        """
+        scene = self.scene
+        contacts = Contacts()
+
+        body_rect = player.collision_rect
+        attack_rect = player.attack_rect if player.is_attacking else None
+
+        trigger_grid, interactable_grid = self._grids_for(scene.location)
+
+        for trig in self._sorted(trigger_grid.query(body_rect)):
+            if scene._triggers.has(trig) and body_rect.colliderect(trig.rect):
+                contacts.triggers.append(trig)
+        contacts.entered_triggers, _ = self.trigger_contacts.update(contacts.triggers)
+
+        candidates = interactable_grid.query(body_rect)
+        if attack_rect:
+            candidates |= interactable_grid.query(attack_rect)
+
+        for obj in self._sorted(candidates):
+            if not scene._interactables.has(obj):
+                continue
+
+            condition = obj.trigger_condition
+            if condition in BODY_CONTACT_CONDITIONS:
+                touching = body_rect.colliderect(obj.rect)
+            elif condition in ATTACK_CONTACT_CONDITIONS:
+                touching = attack_rect is not None and attack_rect.colliderect(obj.rect)
+            else:
+                touching = False
+
+            if touching:
+                contacts.interactables.append(obj)
+        _, contacts.ended_interactables = self.interactable_contacts.update(contacts.interactables)
+
+        enemy_grid = self._enemy_grid
+        for enemy in enemy_grid.query(body_rect):
+            if scene.enemies.has(enemy) and enemy.collision_rect.colliderect(body_rect):
+                contacts.touching_enemies.append(enemy)
+
+        if attack_rect:
+            for enemy in enemy_grid.query(attack_rect):
+                if scene.enemies.has(enemy) and enemy.collision_rect.colliderect(attack_rect):
+                    contacts.attacked_enemies.append(enemy)
+
+        return contacts
@@ -1,7 +1,8 @@
 import pygame
 from src.Game_Constants import RESIZE_FACTOR, SCREEN_WIDTH, SCREEN_HEIGHT, TRANSITION_BIAS
 from src.Behaviour import *
-from src.Animations import Animation
+from src.Animations import Animation, tint_surface
+from src.ResourceManager import ResourceManager
 from utils import resource_path
 
 class _Enemy(pygame.sprite.Sprite):
@@ -30,8 +31,8 @@ class _Enemy(pygame.sprite.Sprite):
         
         self.behaviours = behaviours
 
-        self.image = pygame.image.load(image).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (self.image.get_width() * self.resize_factor, self.image.get_height() * self.resize_factor))
+        # The scaled image is shared by every enemy of the same type (see ResourceManager.get_scaled_image)
+        self.image = ResourceManager.get_scaled_image(image, self.resize_factor)
         self.original_image_path = image
         self.original_image = self.image.copy()
         self.rect = self.image.get_rect(center=(start_x, start_y))
@@ -42,7 +43,16 @@ class _Enemy(pygame.sprite.Sprite):
         self.flash_duration = 500
         self.flash_timer = 0
         self.flash_color = (255, 255, 255)
+        self.flash_image = None # Built the first time the enemy flashes
 
+        # Subclasses with animations set this and register the "flash" variant with add_flash_variant
+        self.animation = None
+
+        # True while an EnemyBatch moves this enemy (update then skips the behaviour and the rect sync)
+        self.batched = False
+
+        # Called with the enemy every time its rects move, the scene uses it to keep its Broadphase up to date
+        self.on_moved = None
 
 
     @property
@@ -67,16 +77,62 @@ class _Enemy(pygame.sprite.Sprite):
         self.is_flashing = True
         self.flash_timer = self.flash_duration
 
+    def add_flash_variant(self):
+        """
+        Registers the flash tint as a variant of self.animation
+        The tinted frames are built once, the first time an enemy of this type flashes, and shared by all of them
+        """
+        self.animation.add_variant("flash", lambda frame: tint_surface(frame, self.flash_color), shared_key=("flash", self.flash_color))
+
+    def _show_flash(self, show):
+        """
+        Swaps between the normal and the flash frames
+        No surfaces are created here, only cached frames are swapped
+        """
+        if self.animation:
+            self.animation.use_variant("flash" if show else None)
+            return
+
+        if show:
+            if self.flash_image is None:
+                self.flash_image = tint_surface(self.original_image, self.flash_color)
+            self.image = self.flash_image
+        else:
+            self.image = self.original_image
+
     def while_attacked(self):
         pass
 
     def reset_state(self):
+        """
+        Stops whatever the enemy was doing (sounds, flashing, batching) so it can be reused (see EnemyPool)
+        """
         if hasattr(self.behaviours, "reset"):
             self.behaviours.reset()
 
-        # We don't need this now, we may need it later
-        # self.is_flashing = False
-        # self.image = self.original_image
+        self.is_flashing = False
+        self.flash_timer = 0
+        self._show_flash(False)
+        self.batched = False
+        self.on_moved = None
+
+    def respawn(self, start_x, start_y, health, behaviours):
+        """
+        Puts a reused enemy back at its starting point with new health and behaviours, as if it was just created
+        """
+        self.reset_state()
+        self.x = start_x
+        self.y = start_y
+        self.x_offset = 0
+        self.y_offset = 0
+        self.health = health
+        self.behaviours = behaviours
+
+        if self.animation:
+            self.animation.index = 0
+            self.image = self.animation.frames[0]
+        self.rect.center = (start_x, start_y)
+        self._collision_rect.center = (start_x, start_y)
 
     def update_behaviour(self, behaviour):
         self.behaviours.append(behaviour)
@@ -87,32 +143,33 @@ class _Enemy(pygame.sprite.Sprite):
         This method will tipically be called once per frame
         """
         # for behaviour in self.behaviours:
-        self.behaviours.apply(self, delta_time)
-        self.rect.centerx = self.x + self.x_offset
-        self.rect.centery = self.y + self.y_offset
-        self._collision_rect.centerx = self.x + self.x_offset
-        self._collision_rect.centery = self.y + self.y_offset
+        if not self.batched:
+            self.behaviours.apply(self, delta_time)
+            self.rect.centerx = self.x + self.x_offset
+            self.rect.centery = self.y + self.y_offset
+            self._collision_rect.centerx = self.x + self.x_offset
+            self._collision_rect.centery = self.y + self.y_offset
+            if self.on_moved:
+                self.on_moved(self)
 
         if self.is_flashing:
             self.flash_timer -= delta_time
             if self.flash_timer > 0:
-                if (self.flash_timer // 50) % 2 == 0:
-                    flash_surface = self.original_image.copy()
-                    flash_surface.fill(self.flash_color, special_flags=pygame.BLEND_RGBA_MULT)
-                    self.image = flash_surface
-                else:
-                    self.image = self.original_image
+                self._show_flash((self.flash_timer // 50) % 2 == 0)
             else:
                 self.is_flashing = False
-                self.image = self.original_image
+                self._show_flash(False)
 
         if self.health < 0:
             self.kill()
 
 class Red_Ghost(_Enemy):
-    
+    # Image and scale of the enemy (read by bake_assets.py too)
+    IMAGE_PATH = "assets/images/enemy.png"
+    IMAGE_FACTOR = 5
+
     def __init__(self, start_x, start_y, health, behaviours):
-        super().__init__(start_x, start_y, resource_path("assets/images/enemy.png"), health, behaviours, 5)
+        super().__init__(start_x, start_y, resource_path(self.IMAGE_PATH), health, behaviours, self.IMAGE_FACTOR)
 
         # --- Modify the self._collision_rect to get a better collision system ---
         self._collision_rect = pygame.Rect(
@@ -122,6 +179,7 @@ class Red_Ghost(_Enemy):
             self.rect.height - 50
         )
         self.animation = Animation(self, [resource_path(f"assets/animations/Red_Ghost/red_ghost_{i}.png") for i in range (1, 5)], 0.07)
+        self.add_flash_variant()
 
     def while_attacked(self, amount):
         self.health -= amount
@@ -141,10 +199,14 @@ class Red_Ghost(_Enemy):
         super().update(delta_time)
 
 class Stalker_Ghost(_Enemy):
+    # Image and scale of the enemy (read by bake_assets.py too)
+    IMAGE_PATH = "assets/animations/Stalker/stalker_0.png"
+    IMAGE_FACTOR = 3
+
     def __init__(self, start_x, start_y, health, behaviours):
         # We changed the sprite for another one
         # super().__init__(start_x, start_y, resource_path("assets/images/ghost.png"), health, behaviours, 5)
-        super().__init__(start_x, start_y, resource_path("assets/animations/Stalker/stalker_0.png"), health, behaviours, 3)
+        super().__init__(start_x, start_y, resource_path(self.IMAGE_PATH), health, behaviours, self.IMAGE_FACTOR)
         # --- Modify the self._collision_rect to get a better collision system ---
         self._collision_rect = pygame.Rect(
             self.rect.left,
@@ -154,6 +216,7 @@ class Stalker_Ghost(_Enemy):
         )
 
         self.animation = Animation(self, [resource_path(f"assets/animations/Stalker/stalker_{i}.png") for i in range (0, 4)], 0.10)
+        self.add_flash_variant()
 
     def while_attacked(self):
         if self.is_flashing:
@@ -0,0 +1,193 @@
+try:
+    import numpy as np
+except ImportError: # NumPy is optional, without it every enemy runs its own behaviour
+    np = None
+
+from .Behaviour import Sine_Wave_Movement, SeekBehaviour
+from .Game_Constants import ENEMY_BATCH_MIN_SIZE
+
+
+class _BatchGroup:
+    """
+    Enemies that share a kind of behaviour, with their state in parallel arrays (one slot per enemy)
+    While an enemy is in a group its behaviour state lives in the arrays, release() writes it back
+    """
+    def __init__(self, enemies):
+        self.enemies = enemies
+        self.behaviours = [enemy.behaviours for enemy in enemies]
+        self.x = np.array([enemy.x for enemy in enemies], dtype=float)
+        self.y = np.array([enemy.y for enemy in enemies], dtype=float)
+        self.x_offset = np.array([enemy.x_offset for enemy in enemies], dtype=float)
+        self.y_offset = np.array([enemy.y_offset for enemy in enemies], dtype=float)
+
+        for slot, enemy in enumerate(enemies):
+            enemy.batched = True
+            enemy.behaviours.batch_group = self
+            enemy.behaviours.batch_slot = slot
+
+    def step(self, delta_time):
+        pass
+
+    def _sync_rects(self):
+        """
+        Moves every rect and collision_rect to x + x_offset, y + y_offset
+        """
+        centers_x = (self.x + self.x_offset).tolist()
+        centers_y = (self.y + self.y_offset).tolist()
+        for enemy, center_x, center_y in zip(self.enemies, centers_x, centers_y):
+            enemy.rect.centerx = center_x
+            enemy.rect.centery = center_y
+            enemy._collision_rect.centerx = center_x
+            enemy._collision_rect.centery = center_y
+            if enemy.on_moved:
+                enemy.on_moved(enemy)
+
+    def sync(self):
+        pass
+
+    def release(self):
+        for enemy in self.enemies:
+            enemy.batched = False
+            enemy.behaviours.batch_group = None
+            enemy.behaviours.batch_slot = None
+
+
+class _SineWaveGroup(_BatchGroup):
+    """
+    Sine_Wave_Movement: only the offsets move, x and y stay where they are
+    """
+    def __init__(self, enemies):
+        super().__init__(enemies)
+        behaviours = self.behaviours
+        self.time = np.array([b.time_ellapsed for b in behaviours], dtype=float)
+        self.amplitude = np.array([b.amplitude for b in behaviours], dtype=float)
+        self.frequency = np.array([b.frequency for b in behaviours], dtype=float)
+        self.x_velocity = np.array([b.x_velocity for b in behaviours], dtype=float)
+        self.direction = np.array([bool(b.direction) for b in behaviours], dtype=bool)
+
+    def reverse(self, slot):
+        self.direction[slot] = not self.direction[slot]
+
+    def step(self, delta_time):
+        self.time += delta_time / 1000.0
+        self.y_offset = self.amplitude * np.sin(self.time * self.frequency * 2 * np.pi)
+        self.x_offset += np.where(self.direction, self.x_velocity, -self.x_velocity)
+
+    def sync(self):
+        for enemy, x_offset, y_offset in zip(self.enemies, self.x_offset.tolist(), self.y_offset.tolist()):
+            enemy.x_offset = x_offset
+            enemy.y_offset = y_offset
+        self._sync_rects()
+
+    def release(self):
+        for behaviour, time, direction in zip(self.behaviours, self.time.tolist(), self.direction.tolist()):
+            behaviour.time_ellapsed = time
+            behaviour.direction = direction
+        super().release()
+
+
+class _SeekGroup(_BatchGroup):
+    """
+    SeekBehaviour: x and y move towards the target, the offsets stay at 0
+    """
+    def __init__(self, enemies):
+        super().__init__(enemies)
+        behaviours = self.behaviours
+        self.speed = np.array([b.speed for b in behaviours], dtype=float)
+        self.stop_distance = np.array([b.stop_distance for b in behaviours], dtype=float)
+        self.x_offset[:] = 0
+        self.y_offset[:] = 0
+
+        # Most of the time every enemy chases the same target (the player), it's read once per frame then
+        targets = [b.target for b in behaviours]
+        self.shared_target = targets[0] if all(target is targets[0] for target in targets) else None
+
+    def _target_positions(self):
+        if self.shared_target is not None:
+            return self.shared_target.rect.centerx, self.shared_target.rect.centery
+        target_x = np.array([b.target.rect.centerx for b in self.behaviours], dtype=float)
+        target_y = np.array([b.target.rect.centery for b in self.behaviours], dtype=float)
+        return target_x, target_y
+
+    def step(self, delta_time):
+        target_x, target_y = self._target_positions()
+        dx = target_x - self.x
+        dy = target_y - self.y
+        distance = np.hypot(dx, dy)
+
+        moving = distance > self.stop_distance
+        scale = np.where(moving, self.speed * delta_time / 1000.0 / np.where(distance > 0, distance, 1.0), 0.0)
+        self.x += dx * scale
+        self.y += dy * scale
+
+    def sync(self):
+        for enemy, x, y in zip(self.enemies, self.x.tolist(), self.y.tolist()):
+            enemy.x = x
+            enemy.y = y
+            enemy.x_offset = 0
+            enemy.y_offset = 0
+        self._sync_rects()
+
+
+_GROUP_CLASSES = {
+    Sine_Wave_Movement: _SineWaveGroup,
+    SeekBehaviour: _SeekGroup,
+}
+
+
+class EnemyBatch:
+    """
+    Moves the enemies of a scene in a few vectorized NumPy steps instead of one behaviour call per enemy
+    Enemies whose behaviour is exactly Sine_Wave_Movement or SeekBehaviour are grouped (when there are at
+    least ENEMY_BATCH_MIN_SIZE of a kind, below that NumPy isn't faster), the rest keep updating themselves
+    Without NumPy it does nothing and every enemy updates itself
+    Batched enemies shouldn't be moved from outside (their position is written from the arrays every frame)
+    """
+    def __init__(self, min_size=ENEMY_BATCH_MIN_SIZE):
+        self.enabled = np is not None
+        self.min_size = min_size
+        self.groups = []
+        self._count = 0
+
+    def rebuild(self, enemies):
+        """
+        Groups the enemies again (called when the enemies of the scene change)
+        """
+        self.release()
+        self._count = len(enemies)
+        if not self.enabled:
+            return
+
+        # A behaviour shared by several enemies keeps the per-enemy update (its state can't be split)
+        uses = {}
+        for enemy in enemies:
+            uses[id(enemy.behaviours)] = uses.get(id(enemy.behaviours), 0) + 1
+
+        members = {behaviour_class: [] for behaviour_class in _GROUP_CLASSES}
+        for enemy in enemies:
+            behaviour = enemy.behaviours
+            if type(behaviour) in members and uses[id(behaviour)] == 1:
+                members[type(behaviour)].append(enemy)
+
+        for behaviour_class, group_enemies in members.items():
+            if len(group_enemies) >= self.min_size:
+                self.groups.append(_GROUP_CLASSES[behaviour_class](group_enemies))
+
+    def release(self):
+        """
+        Writes the state back to the behaviours and lets every enemy update itself again
+        """
+        for group in self.groups:
+            group.release()
+        self.groups = []
+
+    def update(self, delta_time, enemies):
+        """
+        Steps every group and syncs the rects, call it before enemies.update
+        """
+        if len(enemies) != self._count:
+            self.rebuild(enemies)
+
+        for group in self.groups:
+            group.step(delta_time)
+            group.sync()
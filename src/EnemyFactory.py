@@ -0,0 +1,137 @@
+import inspect
+from .Enemies import Red_Ghost, Stalker_Ghost
+from .Behaviour import Sine_Wave_Movement, StalkerBehaviour, SeekBehaviour, PathfindingBehaviour, Do_Nothing_Behaviour
+from .Logger import get_logger
+
+log = get_logger("EnemyFactory")
+
+# Names used in the "type" of the level JSON enemy entries and their behaviours
+ENEMY_TYPES = {
+    "Red_Ghost": Red_Ghost,
+    "Stalker_Ghost": Stalker_Ghost,
+}
+
+BEHAVIOUR_TYPES = {
+    "Sine_Wave_Movement": Sine_Wave_Movement,
+    "StalkerBehaviour": StalkerBehaviour,
+    "SeekBehaviour": SeekBehaviour,
+    "PathfindingBehaviour": PathfindingBehaviour,
+    "Do_Nothing_Behaviour": Do_Nothing_Behaviour,
+}
+
+
+class EnemyPool:
+    """
+    Enemies that left a scene, by type, waiting to be respawned
+    Their surfaces and animation frames are already the shared ones, reusing them only resets positions and timers
+    """
+    def __init__(self):
+        self._free = {}
+
+    def acquire(self, enemy_type):
+        """
+        Returns a free enemy of that type or None if there is none
+        """
+        free = self._free.get(enemy_type)
+        return free.pop() if free else None
+
+    def release(self, enemy):
+        enemy.kill()
+        enemy.reset_state()
+        free = self._free.setdefault(type(enemy), [])
+        if enemy not in free:
+            free.append(enemy)
+
+    def clear(self):
+        self._free.clear()
+
+    def __len__(self):
+        return sum(len(free) for free in self._free.values())
+
+
+class EnemyFactory:
+    """
+    Builds enemies from the specs of the level JSON, e.g.
+        {"type": "Stalker_Ghost", "x": -200, "y": -200, "health": 100,
+         "behaviour": {"type": "StalkerBehaviour", "speed": 300, "min_wait": 20.0}}
+    Every type is a prototype: its image and animation frames are loaded once (ResourceManager cache)
+    and shared by all its instances. Released enemies go back to the pool and are respawned before building new ones
+    The context gives the runtime arguments a spec can't hold: the target (player), chase_sound and flee_sound,
+    they are passed to the behaviours that take them
+    """
+    def __init__(self):
+        self.pool = EnemyPool()
+        self.stats = {"created": 0, "reused": 0}
+        self._behaviour_params = {}
+
+    def _accepted_params(self, behaviour_class):
+        params = self._behaviour_params.get(behaviour_class)
+        if params is None:
+            params = set(inspect.signature(behaviour_class.__init__).parameters) - {"self"}
+            self._behaviour_params[behaviour_class] = params
+        return params
+
+    def build_behaviour(self, spec, context):
+        """
+        Returns a new behaviour for a behaviour spec (a dict with its 'type' and parameters) or None if it's not valid
+        """
+        spec = dict(spec or {"type": "Do_Nothing_Behaviour"})
+        behaviour_type = spec.pop("type", None)
+        behaviour_class = BEHAVIOUR_TYPES.get(behaviour_type)
+        if behaviour_class is None:
+            log.error("Unknown behaviour type '%s'", behaviour_type)
+            return None
+
+        accepted = self._accepted_params(behaviour_class)
+        for key, value in context.items():
+            if key in accepted and key not in spec:
+                spec[key] = value
+
+        try:
+            return behaviour_class(**spec)
+        except TypeError as e:
+            log.error("Invalid parameters for %s: %s", behaviour_type, e)
+            return None
+
+    def spawn(self, spec, context):
+        """
+        Returns an enemy for the spec, reused from the pool when possible, or None if the spec is not valid
+        """
+        enemy_type = spec.get("type")
+        enemy_class = ENEMY_TYPES.get(enemy_type)
+        if enemy_class is None:
+            log.error("Unknown enemy type '%s'", enemy_type)
+            return None
+
+        behaviours = self.build_behaviour(spec.get("behaviour"), context)
+        if behaviours is None:
+            return None
+
+        x, y, health = spec.get("x", 0), spec.get("y", 0), spec.get("health", 1)
+
+        enemy = self.pool.acquire(enemy_class)
+        if enemy is not None:
+            enemy.respawn(x, y, health, behaviours)
+            self.stats["reused"] += 1
+        else:
+            enemy = enemy_class(x, y, health, behaviours)
+            self.stats["created"] += 1
+        return enemy
+
+    def spawn_all(self, specs, context):
+        enemies = []
+        for spec in specs:
+            enemy = self.spawn(spec, context)
+            if enemy is not None:
+                enemies.append(enemy)
+        return enemies
+
+    def release(self, enemies):
+        """
+        Sends the enemies back to the pool (a zone or a level was left)
+        """
+        for enemy in enemies:
+            self.pool.release(enemy)
+
+
+enemy_factory = EnemyFactory()
@@ -1,121 +1,169 @@
 from src.GameState import game_state
 from src.Game_Enums import Conditions, Actions
+import heapq
+import itertools
+
+class ScriptRoutine:
+    """
+    A running scripted sequence
+    Keeps the compiled steps (tuple of ScriptStep) and the index of the next one instead of consuming a list,
+    so many routines can run the same script at the same time
+    """
+    __slots__ = ("steps", "pc", "blocking", "owner", "resume_at")
+
+    def __init__(self, steps, blocking=False, owner=None):
+        self.steps = steps
+        self.pc = 0
+        self.blocking = blocking
+        self.owner = owner
+        self.resume_at = 0.0
+
+    @property
+    def current_step(self):
+        return self.steps[self.pc] if self.pc < len(self.steps) else None
+
 
 class EventManager:
+    """
+    Runs scripted sequences as coroutines
+    Every sequence is a ScriptRoutine with its own wait timer and blocking scope, they run concurrently
+    Sleeping routines are kept in a heap ordered by the time they resume, so each frame only
+    looks at the routines that are due (one step per routine and frame, like a single sequence did)
+    """
     def __init__(self, action_manager):
         self.action_manager = action_manager
-        
-        self.is_active = False
-        self.is_blocking = False
-        self.sequence_queue = []
-        self.current_step = None
-        self.wait_timer = 0
-        self.current_image = None
 
-    def start_sequence(self, sequence_list, blocking=False):
-        if not sequence_list: return
-        if self.is_active: return
-        self.sequence_queue = sequence_list.copy()
-        self.is_active = True
-        self.is_blocking = blocking
+        self.clock = 0.0
+        self._heap = []
+        self._order = itertools.count()
+        self._routines = set()
+        self._owners = {}
+        self._blocking_count = 0
         self.current_image = None
-        self._next_step()
 
-    def _next_step(self):
-        if not self.sequence_queue:
-            self.end_sequence()
+    @property
+    def is_active(self):
+        return bool(self._routines)
+
+    @property
+    def is_blocking(self):
+        return self._blocking_count > 0
+
+    def start_sequence(self, sequence_list, blocking=False, owner=None):
+        """
+        Starts a scripted sequence
+        Parameters:
+            sequence_list: The compiled steps (see compile_script)
+            blocking: If True the player can't move while the sequence runs
+            owner (optional): The object that started it. An owner can only run one sequence at a time
+        Returns the ScriptRoutine or None if nothing was started
+        """
+        if not sequence_list: return None
+        if owner is not None and owner in self._owners: return None
+
+        routine = ScriptRoutine(tuple(sequence_list), blocking, owner)
+        self._routines.add(routine)
+        if owner is not None:
+            self._owners[owner] = routine
+        if blocking:
+            self._blocking_count += 1
+
+        self._enter_step(routine)
+        return routine
+
+    def _enter_step(self, routine):
+        """
+        Schedules the step at routine.pc: waits sleep for their time, any other action runs in the next update
+        """
+        step = routine.current_step
+        if step is None:
+            self._finish(routine)
             return
-        self.current_step = self.sequence_queue.pop(0)
-        self._process_current_step()
 
-    def _process_current_step(self):
-        step = self.current_step
-        action = step.get("action")
-        params = step.get("params", "")
-
-        if action == "Wait":
-            p = self.action_manager.parse_params(params)
-            self.wait_timer = float(p.get("time", 1.0)) * 1000
+        if step.action == Actions.WAIT:
+            routine.resume_at = self.clock + step.params.get("time", 1.0) * 1000
         else:
-            pass 
-
-    def update(self, delta_time, player, scene):
-        if not self.is_active: return None
+            routine.resume_at = self.clock
+        heapq.heappush(self._heap, (routine.resume_at, next(self._order), routine))
 
-        if self.current_step and self.current_step.get("action") == Actions.WAIT:
-            p = self.action_manager.parse_params(self.current_step.get("params", ""))
-            if self.wait_timer <= 0 and p:
-                 self.wait_timer = float(p.get("time", 1.0)) * 1000
+    def _finish(self, routine):
+        if routine not in self._routines:
+            return
+        self._routines.discard(routine)
+        if routine.owner is not None and self._owners.get(routine.owner) is routine:
+            del self._owners[routine.owner]
+        if routine.blocking:
+            self._blocking_count -= 1
 
-            self.wait_timer -= delta_time
-            if self.wait_timer <= 0:
-                self._next_step()
-            return None
-        
-        elif self.current_step:
-            action = self.current_step.get("action")
-            params = self.current_step.get("params", "")
-            
+    def update(self, delta_time, player, scene):
+        """
+        Advances the clock and resumes the routines that are due
+        Returns the list of results (dicts) produced by their actions this frame
+        """
+        self.clock += delta_time
+        results = []
+        if not self._heap: return results
+
+        # Routines are collected first so a step scheduled during this update runs in the next one
+        due = []
+        while self._heap and self._heap[0][0] <= self.clock:
+            due.append(heapq.heappop(self._heap)[2])
+
+        for routine in due:
+            if routine not in self._routines:
+                continue
+
+            step = routine.current_step
+            if step.action == Actions.WAIT:
+                routine.pc += 1
+                self._enter_step(routine)
+                continue
+
+            result = self.action_manager.execute(step.handler, step.params, player, scene)
+            routine.pc += 1
+            self._enter_step(routine)
 
-            was_blocking = self.is_blocking
-            
-            result = self.action_manager.execute(action, params, player, scene)
-            
-            self._next_step()
-            
             if result:
-                result["blocking"] = was_blocking
-                
-            return result 
-            
-        return None
-    
-    def end_sequence(self):
-        self.is_active = False
-        self.is_blocking = False
-        self.current_step = None
-        self.current_image = None
+                result["blocking"] = routine.blocking
+                results.append(result)
+
+        return results
+
+    def end_sequence(self, owner=None):
+        """
+        Stops the sequence started by owner, or every sequence if owner is None
+        """
+        if owner is None:
+            self._routines.clear()
+            self._owners.clear()
+            self._heap.clear()
+            self._blocking_count = 0
+            self.current_image = None
+            return
+
+        routine = self._owners.get(owner)
+        if routine:
+            self._finish(routine)
 
     def process_trigger(self, obj, player, scene):
-        raw_params = getattr(obj, "trigger_params", getattr(obj, "params", ""))
-        params = self.action_manager.parse_params(raw_params)
+        params = getattr(obj, "parsed_params", None)
+        if params is None:
+            params = self.action_manager.parse_params(getattr(obj, "trigger_params", getattr(obj, "params", "")))
         
-        if hasattr(obj, "condition") and obj.condition == Conditions.IF_FLAG:
-            flag_a = params.get("flag_a") or params.get("flag")
-            flag_b = params.get("flag_b")
-            expected_val = params.get("value")
-            operator = str(params.get("condition", "")).upper()
-
-            if not flag_b:
-                if not game_state.check_flag(flag_a, expected_val):
-                    return None
-                
-            else:
-                val_a = game_state.get_flag(flag_a)
-                val_b = game_state.get_flag(flag_b)
-                condition_met = False
-
-                if operator == "AND":
-                    condition_met = (val_a == expected_val) and (val_b == expected_val)
-                elif operator == "OR":
-                    condition_met = (val_a == expected_val) or (val_b == expected_val)
-                elif operator == "EQUAL":
-                    condition_met = (val_a == val_b)
-                elif operator == "NOT_EQUAL":
-                    condition_met = (val_a != val_b)
-
-                if not condition_met:
-                    return None
+        # IfFlag/AutoStart conditions are cached, they are only evaluated again when one of their flags changes
+        flag_condition = getattr(obj, "flag_condition", None)
+        if flag_condition is not None and not flag_condition.value:
+            return None
 
         should_kill = False
-        if hasattr(obj, "condition") and obj.condition in [Conditions.ON_STAY, Conditions.IF_FLAG, Conditions.ON_ENTER] and not hasattr(obj, "interaction_type"):
+        if hasattr(obj, "condition") and obj.condition in [Conditions.ON_STAY, Conditions.IF_FLAG, Conditions.ON_ENTER, Conditions.AUTO_START] and not hasattr(obj, "interaction_type"):
              should_kill = params.get("kill", True)
 
-        if hasattr(obj, "data") and obj.data.get("scripted_events"):
-            sequence = obj.data.get("scripted_events")
+        if getattr(obj, "scripted_events", None):
+            sequence = obj.scripted_events
             blocking = params.get("blocking", False)
             
-            self.start_sequence(sequence, blocking)
+            self.start_sequence(sequence, blocking, owner=obj)
             
             if should_kill:
                 obj.kill()
@@ -123,7 +171,7 @@ class EventManager:
 
         act = getattr(obj, "trigger_action", getattr(obj, "action", "None"))
         if act and act != "None":
-            result = self.action_manager.execute(act, raw_params, player, scene)
+            result = self.action_manager.execute(getattr(obj, "action_handler", None) or act, params, player, scene)
             
             if result:
                 blocking_param = params.get("blocking", None)
@@ -0,0 +1,248 @@
+import re
+import operator
+from .GameState import game_state
+from .Logger import get_logger
+
+log = get_logger("FlagConditions")
+
+
+class FlagCondition:
+    """
+    A condition over game_state flags with a cached result
+    It is registered in game_state for every flag it reads, so it is evaluated again only after one of
+    those flags changes. Reading value between changes just returns the cached result
+    """
+    __slots__ = ("flags", "_evaluate", "_value", "_dirty", "listeners", "__weakref__")
+
+    def __init__(self, flags, evaluate):
+        """
+        Parameters:
+            flags: Names of the flags the condition reads
+            evaluate: A function () -> bool that computes the condition from game_state
+        """
+        self.flags = frozenset(flag for flag in flags if flag)
+        self._evaluate = evaluate
+        self._value = False
+        self._dirty = True
+        # Functions called when the condition goes from False to True (e.g. AutoStart triggers)
+        self.listeners = []
+        game_state.watch(self)
+
+    @property
+    def value(self):
+        if self._dirty:
+            self._value = bool(self._evaluate())
+            self._dirty = False
+        return self._value
+
+    def invalidate(self):
+        """
+        Called by game_state when one of the flags changed
+        Conditions without listeners wait until they are read, the others are evaluated now to notify them
+        """
+        if not self.listeners:
+            self._dirty = True
+            return
+
+        was_true = self._value and not self._dirty
+        self._dirty = True
+        if self.value and not was_true:
+            for listener in list(self.listeners):
+                listener()
+
+
+# --- Condition expressions ---
+# e.g. 'notes_read >= 3 and not door_open'
+# Compiled once at load into nested closures that read game_state.flags directly
+
+_TOKEN_RE = re.compile(r"""\s*(?:
+    (?P<number>-?\d+\.\d*|-?\.\d+|-?\d+)
+    |(?P<string>"[^"]*"|'[^']*')
+    |(?P<op>==|!=|<=|>=|<|>|\(|\))
+    |(?P<name>[A-Za-z_][A-Za-z0-9_.]*)
+    )""", re.VERBOSE)
+
+_KEYWORDS = ("and", "or", "not", "true", "false", "none")
+
+_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"unexpected character '{text[pos:].strip()[:1]}' at {pos}")
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name" and value.lower() in _KEYWORDS:
+            kind, value = "keyword", value.lower()
+        tokens.append((kind, value))
+    return tokens
+
+
+class _ExpressionParser:
+    """
+    Recursive descent parser, every rule returns a closure () -> value
+        expr       := and_expr ('or' and_expr)*
+        and_expr   := not_expr ('and' not_expr)*
+        not_expr   := 'not' not_expr | comparison
+        comparison := operand (('=='|'!='|'<'|'<='|'>'|'>=') operand)?
+        operand    := number | string | true | false | none | flag | '(' expr ')'
+    """
+    def __init__(self, text, flags):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.flags = flags
+        self.names = set()
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def _accept(self, kind, value):
+        if self._peek() == (kind, value):
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("empty expression")
+        node = self._or()
+        if self.pos < len(self.tokens):
+            raise ValueError(f"unexpected '{self._peek()[1]}'")
+        return node
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._accept("keyword", "or"):
+            nodes.append(self._and())
+        if len(nodes) == 1:
+            return nodes[0]
+        return lambda: any(node() for node in nodes)
+
+    def _and(self):
+        nodes = [self._not()]
+        while self._accept("keyword", "and"):
+            nodes.append(self._not())
+        if len(nodes) == 1:
+            return nodes[0]
+        return lambda: all(node() for node in nodes)
+
+    def _not(self):
+        if self._accept("keyword", "not"):
+            node = self._not()
+            return lambda: not node()
+        return self._comparison()
+
+    def _comparison(self):
+        left = self._operand()
+        kind, value = self._peek()
+        if kind != "op" or value not in _COMPARISONS:
+            return left
+
+        self.pos += 1
+        compare = _COMPARISONS[value]
+        right = self._operand()
+
+        def node():
+            try:
+                return compare(left(), right())
+            except TypeError:
+                # Ordering a missing flag (None) or mixed types is just false
+                return False
+        return node
+
+    def _operand(self):
+        kind, value = self._take()
+
+        if kind == "number":
+            number = float(value) if "." in value else int(value)
+            return lambda: number
+        if kind == "string":
+            text = value[1:-1]
+            return lambda: text
+        if kind == "keyword" and value in ("true", "false", "none"):
+            constant = {"true": True, "false": False, "none": None}[value]
+            return lambda: constant
+        if kind == "name":
+            self.names.add(value)
+            get = self.flags.get
+            return lambda: get(value)
+        if (kind, value) == ("op", "("):
+            node = self._or()
+            if not self._accept("op", ")"):
+                raise ValueError("missing ')'")
+            return node
+
+        raise ValueError(f"expected a flag or a value, got '{value}'" if value else "expression ended too soon")
+
+
+def compile_expression(text):
+    """
+    Compiles a condition expression into (flags, evaluate)
+    flags is the set of flag names it reads and evaluate a function () -> bool
+    Raises ValueError if the expression is not valid
+    """
+    parser = _ExpressionParser(text, game_state.flags)
+    node = parser.parse()
+    return parser.names, lambda: bool(node())
+
+
+def build_flag_condition(params, source=None):
+    """
+    Builds the FlagCondition of an IfFlag/AutoStart trigger from its parsed params
+    Uses 'expr' if present (see compile_expression), otherwise the flag/flag_a, flag_b, value and condition params
+    """
+    expression = params.get("expr")
+    if expression:
+        try:
+            flags, evaluate = compile_expression(expression)
+        except ValueError as e:
+            log.warning("%s: invalid expression '%s': %s", source, expression, e)
+            return FlagCondition((), lambda: False)
+        return FlagCondition(flags, evaluate)
+
+    return _build_legacy_condition(params)
+
+
+def _build_legacy_condition(params):
+    """
+    flag/flag_a (== value), optional flag_b joined with AND/OR/EQUAL/NOT_EQUAL
+    """
+    flag_a = params.get("flag_a") or params.get("flag")
+    flag_b = params.get("flag_b")
+    expected_val = params.get("value")
+    join = params.get("condition", "")
+    get_flag = game_state.flags.get
+
+    if not flag_b:
+        return FlagCondition((flag_a,), lambda: get_flag(flag_a) == expected_val)
+
+    if join == "AND":
+        evaluate = lambda: get_flag(flag_a) == expected_val and get_flag(flag_b) == expected_val
+    elif join == "OR":
+        evaluate = lambda: get_flag(flag_a) == expected_val or get_flag(flag_b) == expected_val
+    elif join == "EQUAL":
+        evaluate = lambda: get_flag(flag_a) == get_flag(flag_b)
+    elif join == "NOT_EQUAL":
+        evaluate = lambda: get_flag(flag_a) != get_flag(flag_b)
+    else:
+        evaluate = lambda: False
+
+    return FlagCondition((flag_a, flag_b), evaluate)
@@ -3,19 +3,27 @@ import sys
 from src.Game_Constants import *
 from src.Player import Player
 from src.ResourceManager import ResourceManager
+from src.SoundLibrary import sound_library
+from src.AudioManager import audio_manager
 from src.UIManager import UIManager
 from src.ActionManager import ActionManager
+from src.ActionRegistry import ActionRegistry
 from src.EventManager import EventManager
 from src.LevelManager import LevelManager
 from src.GameState import game_state
-from src.Game_Enums import Actions, Conditions
+from src.SaveSystem import save_system, level_request
+from src.Game_Enums import Actions, Conditions, SoundCategories
 from src.Effects import RetroEffects
 from utils import resource_path
+from src.Logger import get_logger
+
+log = get_logger("Game")
 
 class Game:
     def __init__(self):
         pygame.init()
         pygame.mixer.init()
+        audio_manager.init()
         
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED | pygame.RESIZABLE | pygame.FULLSCREEN | pygame.DOUBLEBUF, vsync=1)
         pygame.display.set_caption('Oakhill')
@@ -37,10 +45,9 @@ class Game:
         self.transition_state = "NONE"
         self.transition_timer = 0
         self.transition_duration = 500
+        self.level_job = None
         self.pending_level_req = None
 
-        self.last_frame_triggers = set()
-        
         self.debug_mode = False
 
         self.player_group = pygame.sprite.GroupSingle()
@@ -53,11 +60,13 @@ class Game:
             pygame.display.set_icon(icon)
         except: pass
 
-        self.sounds = ResourceManager.load_all_sounds("assets/sounds")
+        # Sounds are only indexed here, each one is decoded the first time it's played (see SoundLibrary)
+        self.sounds = sound_library
+        self.sounds.index_folder("assets/sounds")
         self.images = ResourceManager.load_all_images("assets/images")
 
-        if self.sounds.get("chase_loop"): self.sounds["chase_loop"].set_volume(0.5)
-        if self.sounds.get("flee_loop"): self.sounds["flee_loop"].set_volume(0.5)
+        # The Stalker keeps these two for the whole level
+        self.sounds.pin("chase_loop", "flee_loop")
 
     def run(self):
         while self.state != "QUIT":
@@ -66,6 +75,7 @@ class Game:
             elif self.state == "GAMEPLAY":
                 self._game_loop()
         
+        save_system.close()
         pygame.quit()
         sys.exit()
 
@@ -83,8 +93,13 @@ class Game:
         title_surf = title_font.render("OAKHILL", True, (255, 255, 0))
         title_rect = title_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
         
-        play_rect = pygame.Rect(0,0,200,80); play_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50)
-        quit_rect = pygame.Rect(0,0,200,80); quit_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 150)
+        # "Continuar" only appears when there is a saved game, the other buttons move down
+        has_save = save_system.has_save(SAVE_SLOT)
+        offset = 100 if has_save else 0
+
+        continue_rect = pygame.Rect(0,0,300,80); continue_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50)
+        play_rect = pygame.Rect(0,0,200,80); play_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50 + offset)
+        quit_rect = pygame.Rect(0,0,200,80); quit_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 150 + offset)
 
         running = True
         while running:
@@ -99,6 +114,13 @@ class Game:
 
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:
+                        if has_save and continue_rect.collidepoint(event.pos):
+                            pygame.mixer.music.stop()
+                            if self._continue_game():
+                                self.state = "GAMEPLAY"
+                                return
+                            has_save = False
+                            continue
                         if play_rect.collidepoint(event.pos):
                             pygame.mixer.music.stop()
                             self._start_new_game()
@@ -118,14 +140,17 @@ class Game:
             txt_quit = btn_font.render("Salir", True, col_quit)
             
             self.screen.blit(title_surf, title_rect)
+            if has_save:
+                col_continue = (255, 255, 255) if continue_rect.collidepoint(m_pos) else (200, 200, 200)
+                txt_continue = btn_font.render("Continuar", True, col_continue)
+                self.screen.blit(txt_continue, txt_continue.get_rect(center=continue_rect.center))
             self.screen.blit(txt_play, txt_play.get_rect(center=play_rect.center))
             self.screen.blit(txt_quit, txt_quit.get_rect(center=quit_rect.center))
             
             pygame.display.flip()
             self.clock.tick(60)
 
-    def _start_new_game(self):
-        game_state.reset()
+    def _reset_session(self):
         self.game_over_sound_played = False
         self.death_screen_delay = DEATH_DELAY
         self.ui_manager.close()
@@ -138,7 +163,12 @@ class Game:
         self.player.velocity = pygame.math.Vector2(0,0)
         self.player.facing = "down"
         self.player.image = self.player.animations["down"].images[0]
-        
+
+    def _start_new_game(self):
+        game_state.reset()
+        save_system.start_new(SAVE_SLOT)
+        self._reset_session()
+
         start_req = {
             "json_path": resource_path("data/forest.json"),
             "map_matrix": WORLD_MAP_LEVEL,
@@ -149,6 +179,27 @@ class Game:
         }
         self.level_manager.load_level_from_request(start_req, self.player)
 
+    def _continue_game(self):
+        """
+        Loads the saved game (see SaveSystem) and keeps recording it, returns False if it can't be loaded
+        """
+        save_system.close()
+        game_state.reset()
+        state = save_system.resume(SAVE_SLOT)
+        if state is None or state["level"] is None:
+            save_system.close()
+            return False
+
+        game_state.restore(state["flags"], state["interacted"])
+        self._reset_session()
+        try:
+            self.level_manager.load_level_from_request(level_request(state), self.player)
+        except Exception as e:
+            log.error("Can't load the saved game: %s", e)
+            save_system.close()
+            return False
+        return True
+
     def _game_loop(self):
         while self.state == "GAMEPLAY":
             self.screen.fill('black')
@@ -200,19 +251,30 @@ class Game:
             self.pending_teleport = teleport_req
             self.transition_state = "OUT"
             self.transition_timer = 0
-            print("[Game] Starting Teleport Transition")
+            log.debug("Starting Teleport Transition")
             return True 
         
         level_req = game_state.consume_level_change()
         if level_req:
-            self.screen.fill((0, 0, 0)); pygame.display.flip()
-            self.level_manager.load_level_from_request(level_req, self.player)
+            # The level loads over the next frames while the loading screen is drawn (see _update_transition)
+            self.level_job = self.level_manager.start_level_load(level_req, self.player)
+            self.transition_state = "LOADING"
             self.retro_effects.set_transition(0.0)
+            log.debug("Loading level %s", level_req["json_path"])
             return True
             
         return False
 
     def _update_transition(self, delta_time):
+        if self.transition_state == "LOADING":
+            if self.level_job.step():
+                self.level_manager.finish_level_load(self.level_job, self.player)
+                self.level_job = None
+                self.transition_state = "IN"
+                self.transition_timer = 0
+                self.retro_effects.set_transition(1.0)
+            return
+
         self.transition_timer += delta_time
         
         progress = min(1.0, self.transition_timer / self.transition_duration)
@@ -224,11 +286,13 @@ class Game:
                 
                 if hasattr(self, 'pending_teleport') and self.pending_teleport:
                     data = self.pending_teleport
-                    if data["zone"] and data["zone"] != "None":
-                        self.level_manager.current_scene.change_zone_by_string(data["zone"])
+                    if data["zone"]:
+                        self.level_manager.current_scene.change_zone(data["zone"])
                     self.player.teleport(data["x"], data["y"])
+                    if data["zone"]:
+                        game_state.enter_zone(data["zone"], (data["x"], data["y"]))
                     self.pending_teleport = None
-                    print("[Game] Teleport executed mid-transition")
+                    log.debug("Teleport executed mid-transition")
 
                 self.transition_state = "IN"
                 self.transition_timer = 0 
@@ -241,12 +305,12 @@ class Game:
             if progress >= 1.0:
                 self.transition_state = "NONE"
                 self.retro_effects.set_transition(0.0)
-                print("[Game] Transition finished")
+                log.debug("Transition finished")
 
     def _update_gameplay(self, delta_time):
         if not self.ui_manager.active or not self.ui_manager.is_blocking:
-            seq_result = self.event_manager.update(delta_time, self.player, self.level_manager.current_scene)
-            if seq_result: self._handle_event_result(seq_result)
+            for seq_result in self.event_manager.update(delta_time, self.player, self.level_manager.current_scene):
+                self._handle_event_result(seq_result)
 
             if not self.event_manager.is_blocking:
                 self.player_group.update(self.level_manager.current_scene.obstacles)
@@ -254,7 +318,7 @@ class Game:
                 self.player.stop_attack()
 
             
-            self.level_manager.update(delta_time)
+            self.level_manager.update(delta_time, self.player)
             self.level_manager.handle_zone_transition(self.player)
             
             self._handle_collisions_and_triggers() 
@@ -262,12 +326,15 @@ class Game:
             if self.player.is_defeated:
                 self.death_screen_delay -= delta_time
                 if self.death_screen_delay <= 0 and not self.game_over_sound_played:
-                    if self.sounds.get("game_over_sound"): 
-                        self.sounds["game_over_sound"].set_volume(0.6)
-                        self.sounds["game_over_sound"].play()
+                    audio_manager.play(self.sounds.get("game_over_sound"), SoundCategories.STINGER, volume=0.6)
                     self.game_over_sound_played = True
 
     def _draw(self, delta_time):
+        if self.transition_state == "LOADING":
+            UIManager.draw_loading_screen(self.screen, self.level_job.progress)
+            self.retro_effects.update_and_draw(self.screen, delta_time)
+            return
+
         if self.player.is_defeated and self.death_screen_delay <= 0:
             self.level_manager.draw(self.screen, self.player)
             UIManager.draw_game_over(self.screen, self.images.get("death_pic"))
@@ -277,6 +344,7 @@ class Game:
 
             if self.debug_mode:
                 self._debug_draw_collisions()
+                self._debug_draw_action_stats()
 
             self.ui_manager.draw(self.screen)
             if self.event_manager.current_image:
@@ -299,83 +367,68 @@ class Game:
         scene = self.level_manager.current_scene
         if not scene: return
 
-        hits = pygame.sprite.spritecollide(
-            self.player, 
-            scene._triggers, 
-            False, 
-            collided=lambda p, t: p.collision_rect.colliderect(t.rect)
-        )
-        
-        current_triggers_set = set(hits)
+        for trig in scene.consume_autostarts():
+            res = self.event_manager.process_trigger(trig, self.player, scene)
+            self._handle_event_result(res)
+
+        contacts = scene.query_contacts(self.player)
 
-        for trig in current_triggers_set:
+        for trig in contacts.triggers:
             should_execute = False
 
             if trig.condition in [Conditions.ON_STAY, Conditions.IF_FLAG]:
                 should_execute = True
 
             elif trig.condition == Conditions.ON_ENTER:
-                if trig not in self.last_frame_triggers:
+                if trig in contacts.entered_triggers:
                     should_execute = True
 
             if should_execute:
                 res = self.event_manager.process_trigger(trig, self.player, scene)
                 self._handle_event_result(res)
 
-        self.last_frame_triggers = current_triggers_set
-
         # for trig in hits:
         #     if trig.condition in [Conditions.ON_STAY, Conditions.IF_FLAG]:
         #         res = self.event_manager.process_trigger(trig, self.player, scene)
         #         self._handle_event_result(res)
         
+        for obj in contacts.ended_interactables:
+            obj.on_contact_end()
+
+        # Only interactables in active contact are processed, idle ones are not touched
         processed = False
-        for obj in scene.interactables:
-            contact = False
-            
-            if obj.trigger_condition == Conditions.ON_STAY:
-                if self.player.collision_rect.colliderect(obj.rect):
-                    if obj.progress_interaction() != "finished": 
-                        obj.current_progress = obj.interaction_duration
-                    contact = True
-
-            elif obj.trigger_condition == Conditions.ON_ENTER:
-                if self.player.collision_rect.colliderect(obj.rect):
-                    if obj.progress_interaction() != "finished": 
-                        obj.current_progress = obj.interaction_duration
-                    contact = True
-            
-            elif obj.trigger_condition in [Conditions.ON_INTERACT, "None"]:
-                if self.player.is_attacking and self.player.attack_rect.colliderect(obj.rect):
-                    contact = True
+        for obj in contacts.interactables:
+            if obj.trigger_condition in [Conditions.ON_STAY, Conditions.ON_ENTER]:
+                if obj.progress_interaction() != "finished": 
+                    obj.current_progress = obj.interaction_duration
             
-            if contact and not processed:
+            if not processed:
                 status = obj.progress_interaction()
                 if status == "finished":
                     processed = True
                     res = self.event_manager.process_trigger(obj, self.player, scene)
                     self._handle_event_result(res)
-                    obj.read()
+                    scene.consume_interactable(obj)
                     
                     if self.player.is_attacking: 
                         self.player.cancel_attack()
             else:
                 obj.reset_interaction()
 
-        if self.player.is_attacking:
-            for enemy in scene.enemies:
-                if enemy.collision_rect.colliderect(self.player.attack_rect) and hasattr(enemy, 'while_attacked'):
-                    enemy.while_attacked()
+        for enemy in contacts.attacked_enemies:
+            if hasattr(enemy, 'while_attacked'):
+                enemy.while_attacked()
 
-        for enemy in scene.enemies:
-            if enemy.collides_with(self.player) and not self.player.is_defeated:
+        for enemy in contacts.touching_enemies:
+            if not self.player.is_defeated:
                 self.player.defeat()
                 
                 pygame.mixer.music.stop()
-                if self.sounds.get("chase_loop"): self.sounds["chase_loop"].stop()
-                if self.sounds.get("death_sound"): 
-                    self.sounds["death_sound"].set_volume(0.7)
-                    self.sounds["death_sound"].play()
+                # Chasing enemies stop their loop on the channel they hold (and don't start it again)
+                for chaser in scene.enemies:
+                    if hasattr(chaser.behaviours, "reset"):
+                        chaser.behaviours.reset()
+                audio_manager.play(self.sounds.get("death_sound"), SoundCategories.STINGER, volume=0.7)
                 
                 break
 
@@ -414,6 +467,20 @@ class Game:
              pygame.draw.rect(self.screen, COLOR_ATTACK, self.player.attack_rect, 2)
                     
 
+    def _debug_draw_action_stats(self):
+        """
+        Shows how many times every action ran and how long it took (F1 debug mode)
+        """
+        font = ResourceManager.get_font(16)
+        stats = ActionRegistry.get_stats()
+
+        y = 10
+        for action, data in sorted(stats.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+            line = f"{action}: {data['calls']} calls, {data['total_ms']:.2f} ms (max {data['max_ms']:.2f} ms)"
+            txt = font.render(line, True, (255, 255, 0))
+            self.screen.blit(txt, (10, y))
+            y += 20
+
     def _handle_event_result(self, result):
         if not result: return
 
@@ -1,3 +1,8 @@
+import weakref
+from .Logger import get_logger
+
+log = get_logger("GameState")
+
 class GameState:
     """
     Global memory of the game
@@ -11,15 +16,52 @@ class GameState:
             cls._instance.interacted_objects = set()
             cls._instance.pending_level_change = None
             cls._instance.teleport_req = None
+            # Level request and zone the player is in (see enter_level and enter_zone)
+            cls._instance.current_level = None
+            cls._instance.current_zone = None
+            # Function called with every change of the state, e.g. SaveSystem.record (None: nothing is recorded)
+            cls._instance.recorder = None
+            # flag -> conditions that read it (see FlagConditions), they are invalidated when the flag changes
+            cls._instance._watchers = {}
         return cls._instance
     
+    def _record(self, op, *args):
+        if self.recorder is not None:
+            self.recorder(op, *args)
+
     # --- Flag logic ---
     def set_flag(self, key, value):
         """
         Stores a value (True, False, Number, String)
+        The conditions that read the flag are notified if the value changed
         """
+        changed = key not in self.flags or self.flags[key] != value
         self.flags[key] = value
-        print(f"[GameState] Flag '{key}' set to {value}" )
+        log.debug("Flag '%s' set to %s", key, value)
+        if changed:
+            self._publish(key)
+            self._record("flag", key, value)
+
+    def watch(self, condition):
+        """
+        Registers a condition (anything with 'flags' and 'invalidate()') for the flags it reads
+        Conditions are held weakly, they go away with the trigger that owns them
+        """
+        for key in condition.flags:
+            self._watchers.setdefault(key, weakref.WeakSet()).add(condition)
+
+    def _publish(self, key):
+        watchers = self._watchers.get(key)
+        if watchers:
+            for condition in list(watchers):
+                condition.invalidate()
+
+    def _publish_all(self):
+        conditions = set()
+        for watchers in self._watchers.values():
+            conditions.update(watchers)
+        for condition in conditions:
+            condition.invalidate()
 
     def get_flag(self, key, default=None):
         """
@@ -48,7 +90,9 @@ class GameState:
         
         :param obj_id: Object ID
         """
-        self.interacted_objects.add(obj_id)
+        if obj_id not in self.interacted_objects:
+            self.interacted_objects.add(obj_id)
+            self._record("interact", obj_id)
 
     def has_interacted(self, obj_id):
         """
@@ -83,10 +127,29 @@ class GameState:
         return data
     # ----------------------------------
 
+    def enter_level(self, level_req):
+        """
+        Called when a level starts being played (level_req as in request_level_change)
+        """
+        self.current_level = level_req
+        self.current_zone = tuple(level_req["entry_zone"])
+        self._record("level", level_req)
+
+    def enter_zone(self, zone, player_pos):
+        """
+        Called when the player moves to another zone of the level
+        """
+        self.current_zone = tuple(zone)
+        self._record("zone", zone, player_pos)
+    # ----------------------------------
+
     # --- Teleport logic ---
-    def request_teleport(self, zone_str, x, y):
+    def request_teleport(self, zone, x, y):
+        """
+        Requests main_window to teleport the player, zone is a (y, x) tuple or None to stay in the current zone
+        """
         self.teleport_req = {
-            "zone": zone_str,
+            "zone": zone,
             "x": x,
             "y": y
         }
@@ -101,10 +164,24 @@ class GameState:
         """
         Deletes all memory to initiate another game
         """
-        self.flags = {}
+        # Cleared in place, compiled conditions keep a reference to this dict
+        self.flags.clear()
         self.interacted_objects = set()
         self.pending_level_change = None
         self.teleport_req = None
-        print("[GameState] Memory restarted (Reset)")
+        self.current_level = None
+        self.current_zone = None
+        self._publish_all()
+        log.info("Memory restarted (Reset)")
+
+    def restore(self, flags, interacted_objects):
+        """
+        Replaces the memory with a saved one (see SaveSystem), it isn't recorded
+        """
+        self.flags.clear()
+        self.flags.update(flags)
+        self.interacted_objects = set(interacted_objects)
+        self._publish_all()
+        log.info("Memory restored (%s flags, %s interactions)", len(self.flags), len(self.interacted_objects))
     
 game_state = GameState()
\ No newline at end of file
@@ -1,5 +1,6 @@
 # This script stores global constants used throughout the game.
 from utils import resource_path
+from .Game_Enums import SoundCategories
 import pygame
 
 SCREEN_WIDTH = 1280
@@ -11,6 +12,59 @@ FPS = 60
 DEATH_DELAY = 3000
 INITIAL_ZONE = (2, 5)
 Y_CORD, X_CORD = INITIAL_ZONE
+BROADPHASE_CELL_SIZE = 128 # Size in px of the cells used by the collision broadphase
+PATHFINDING_CELL_SIZE = 32 # Size in px of the cells of the walkability grids (see Pathfinding.py)
+PATHFINDING_CLEARANCE = 12 # Obstacles are grown by this many px so walking enemies don't clip their corners
+AI_SCREEN_MARGIN = 64 # Enemies closer than this to the screen count as visible (updated every frame and drawn)
+AI_LOD_LEVELS = ((900, 50), (None, 200)) # (max distance to the player in px or None, ms between updates) for offscreen enemies
+AI_TICK_BUDGET_MS = 2.0 # Time per frame for the reduced rate enemy updates, the rest wait for the next frame
+ENEMY_BATCH_MIN_SIZE = 16 # Enemies of the same kind needed before EnemyBatch moves them with NumPy (see EnemyBatch.py)
+
+# Logging (see Logger.py). Levels: DEBUG, INFO, WARNING, ERROR, OFF
+LOG_LEVEL = "INFO"
+LOG_LEVELS = {
+    # Per module levels, e.g. "GameState": "DEBUG" to see every flag change
+    "ActionManager": "INFO",
+    "GameState": "INFO",
+    "Scene": "INFO",
+}
+LOG_FILE = "logs/oakhill.log"
+LOG_CONSOLE_LEVEL = "WARNING" # Records at this level or above are also written to the console (by the log thread)
+LOG_BUFFER_SIZE = 4096 # Records kept in memory until the log thread writes them, the oldest are dropped when full
+LOG_FLUSH_INTERVAL = 0.25 # Seconds
+
+# Saves (see SaveSystem.py)
+SAVE_DIR = "saves"
+SAVE_SLOT = 1 # Slot the game records in, "Continuar" loads it
+SAVE_COMPACT_RECORDS = 256 # Journal records written before the save state is compacted into a new snapshot
+SAVE_FLUSH_INTERVAL = 0.5 # Seconds between journal writes
+
+# Sounds (see SoundLibrary.py)
+SOUND_MEMORY_BUDGET = 48 * 1024 * 1024 # Bytes of decoded sound kept in memory, the least recently used are evicted past it
+SOUND_DEFAULT_VOLUMES = {
+    # Volume set every time the sound is decoded (it's lost when a sound is evicted)
+    "chase_loop": 0.5,
+    "flee_loop": 0.5,
+}
+PCM_CACHE_DIR = "cache/pcm" # Decoded sounds in the mixer format, reused on the next launch (see PCMCache.py)
+AUDIO_CHANNELS = 16 # Mixer channels managed by the AudioManager, the voices that can sound at once
+AUDIO_CATEGORY_PRIORITIES = {
+    # A sound can steal the channel of a sound with a lower priority when every channel is busy (see SoundCategories)
+    SoundCategories.STINGER: 3,
+    SoundCategories.CHASE: 2,
+    SoundCategories.UI: 1,
+    SoundCategories.AMBIENCE: 0,
+}
+AUDIO_MAX_INSTANCES = 2 # Copies of the same sound playing at once, one more restarts the oldest copy
+
+# Images
+IMAGE_LOADER_WORKERS = 8 # Max workers decoding images at once, capped to the number of cores (see ImageLoader.py)
+IMAGE_LOADER_PROCESSES = False # Decode in processes instead of threads
+BAKED_ASSETS_DIR = "baked" # Pre-scaled raw images written by bake_assets.py, loaded instead of the PNGs when present
+LEVEL_LOAD_STEP_MS = 8 # Main thread time per frame spent loading a level, the rest of the frame draws the loading screen
+LEVEL_LOAD_DECODE_CHUNK = 16 # Images decoded per batch by the loading thread (the main thread uploads each batch as it's ready)
+PREFETCH_DISTANCE = 300 # Px from a ChangeLevel/Teleport object at which its destination starts loading in the background, None for its whole zone (see PortalPrefetcher.py)
+LEVEL_CACHE_BUDGET = 64 * 1024 * 1024 # Bytes of images kept alive by the levels left recently, coming back to one is instant (see SceneCache.py)
 
 WORLD_MAP_LEVEL = [
         [0, 0, 1, 1, 1, 1], 
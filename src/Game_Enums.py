@@ -51,4 +51,17 @@ class ObjectTypes:
         return [
             ObjectTypes.OBSTACLE, ObjectTypes.MIRROR, ObjectTypes.INTERACTABLE,
             ObjectTypes.TRIGGER, ObjectTypes.PRIMITIVE
-        ]
\ No newline at end of file
+        ]
+
+
+class SoundCategories:
+    STINGER = "Stinger"
+    CHASE = "Chase"
+    UI = "UI"
+    AMBIENCE = "Ambience"
+
+    @staticmethod
+    def get_categories():
+        return [
+            SoundCategories.STINGER, SoundCategories.CHASE, SoundCategories.UI, SoundCategories.AMBIENCE
+        ]
@@ -0,0 +1,108 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import pygame
+from .Game_Constants import IMAGE_LOADER_WORKERS, IMAGE_LOADER_PROCESSES
+from .BakedAssets import baked_assets, read_baked, scaled_size
+from .Logger import get_logger
+
+log = get_logger("ImageLoader")
+
+# Masks of convert_alpha() surfaces, baked pixels usually have them already and need no conversion
+_display_masks = None
+
+
+def _decode(path, factor, baked=None):
+    """
+    Decodes and scales one image file into raw RGBA pixels (runs in the workers, no display needed)
+    A baked image (see BakedAssets.lookup) is just read, it's already scaled and in the layout of the display
+    Returns (size, pixels, format) or (None, error message, None)
+    """
+    try:
+        if baked is not None:
+            result = read_baked(baked)
+            if result[0] is not None:
+                return result
+        image = pygame.image.load(path)
+        if factor != 1:
+            image = pygame.transform.scale(image, scaled_size(image.get_size(), factor))
+        return image.get_size(), pygame.image.tobytes(image, "RGBA"), "RGBA"
+    except Exception as e:
+        return None, str(e), None
+
+
+def _decode_batch(batch):
+    return [_decode(path, factor, baked) for path, factor, baked in batch]
+
+
+def default_workers():
+    return max(1, min(IMAGE_LOADER_WORKERS, os.cpu_count() or 1))
+
+
+class ImageLoader:
+    """
+    Decodes and resizes many image files at once in a pool of workers
+    The workers return raw pixels, only pygame.image.frombuffer(...).convert_alpha() runs on the main thread
+    (baked images already have the layout of the display and skip convert_alpha)
+    Threads are used by default (pygame releases the GIL while decoding and scaling), processes can be used
+    instead with use_processes (main.py calls multiprocessing.freeze_support() for the packaged game)
+    With one worker everything is decoded on the calling thread
+    """
+    def __init__(self, workers=None, use_processes=IMAGE_LOADER_PROCESSES):
+        self.workers = workers if workers is not None else default_workers()
+        self.use_processes = use_processes
+
+    def decode(self, requests):
+        """
+        Decodes a list of (path, factor) in the workers, returns their (size, pixels, format) in the same order
+        Doesn't touch the display, it can run in any thread
+        """
+        # The baked images are found here, the workers (maybe processes) only read them
+        jobs = [(path, factor, baked_assets.lookup(path, factor)) for path, factor in requests]
+
+        if self.workers <= 1 or len(jobs) <= 1:
+            return [_decode(*job) for job in jobs]
+
+        if self.use_processes:
+            # Few big batches, every task sent to a process has to be pickled
+            size = -(-len(jobs) // (self.workers * 4))
+            batches = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                return [result for batch in pool.map(_decode_batch, batches) for result in batch]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(lambda job: _decode(*job), jobs))
+
+    @staticmethod
+    def upload(request, result):
+        """
+        Turns a decoded (size, pixels, format) into a Surface (main thread), None if the file couldn't be decoded
+        The Surface uses the pixels as they are when they already have the layout of the display
+        """
+        global _display_masks
+        size, pixels, pixel_format = result
+        if size is None:
+            log.error("Error loading image %s: %s", request[0], pixels)
+            return None
+
+        surface = pygame.image.frombuffer(pixels, size, pixel_format)
+        if _display_masks is None:
+            _display_masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+        if surface.get_masks() != _display_masks:
+            surface = surface.convert_alpha()
+        return surface
+
+    def load(self, requests):
+        """
+        Loads a list of (path, factor) and returns a dict {(path, factor): Surface}
+        Files that can't be loaded are logged and left out
+        """
+        requests = list(dict.fromkeys(requests))
+        surfaces = {}
+
+        for request, result in zip(requests, self.decode(requests)):
+            surface = self.upload(request, result)
+            if surface is not None:
+                surfaces[request] = surface
+
+        log.debug("Loaded %s images with %s workers", len(surfaces), self.workers)
+        return surfaces
@@ -2,7 +2,16 @@ import pygame
 from .Obstacles import Obstacle
 from .Game_Constants import RESIZE_FACTOR
 from .GameState import game_state
+from .ActionParams import parse_action_params, compile_script
+from .ActionRegistry import ActionRegistry
+from .SoundLibrary import sound_library
+from .ResourceManager import ResourceManager
+from .AudioManager import audio_manager
+from .Game_Enums import SoundCategories
 from utils import resource_path
+from .Logger import get_logger
+
+log = get_logger("Interactable")
 
 class Interactable(Obstacle):
     """
@@ -15,6 +24,10 @@ class Interactable(Obstacle):
         Initialices the interactable object 
         """
         super().__init__(data) 
+
+        self.parsed_params = parse_action_params(self.trigger_params, self.trigger_action, self.trigger_condition, source=self.id)
+        self.scripted_events = compile_script(data.get("scripted_events"), source=self.id)
+        self.action_handler = ActionRegistry.resolve(self.trigger_action) if self.trigger_action and self.trigger_action != "None" else None
         
         self.interacted_once = False
         self.is_hidden = data.get("starts_hidden", False)
@@ -25,59 +38,86 @@ class Interactable(Obstacle):
         # self.interaction_timer = 0
         self.original_image = self.image.copy()
 
+        # The charge sound comes from the sound_library when it starts playing (shared by every object using that file)
         self.charge_sound = None
+        self.charge_sound_path = None
         self.is_playing_charge = False
+        self.charge_channel = None
         charge_path = data.get("charge_sound_path", "None")
 
         if charge_path and charge_path != "None":
-            try:
-                self.charge_sound = pygame.mixer.Sound(resource_path(charge_path))
-                self.charge_sound.set_volume(0.7)
-            except Exception as e:
-                print(f"Error when loading the sound: {e}")
+            self.charge_sound_path = resource_path(charge_path)
 
         self.used_image = None
         used_path = data.get("used_image_path", "None")
         
         if used_path and used_path != "None":
             try:
-                loaded_used = pygame.image.load(resource_path(used_path)).convert_alpha()
-                self.used_image = pygame.transform.scale(
-                    loaded_used, 
-                    (int(loaded_used.get_width() * self.resize_factor), int(loaded_used.get_height() * self.resize_factor))
-                )
+                self.used_image = ResourceManager.get_scaled_image(resource_path(used_path), self.resize_factor)
             except Exception as e:
-                print(f"Error while loading used image: {e}")
+                log.error("Error while loading used image: %s", e)
         
         flash_path = data.get("flash_image_path")
         try:
             if not flash_path:
                 raise pygame.error("No flash image path provided")
                 
-            self.flash_image = pygame.image.load(resource_path(flash_path)).convert_alpha()
-            self.flash_image = pygame.transform.scale(
-                self.flash_image, (self.image.get_width(), self.image.get_height())
-            )
+            # Scaled to the size of the image once and shared (baked by bake_assets.py)
+            self.flash_image = ResourceManager.get_scaled_image(resource_path(flash_path), self.image.get_size())
         except pygame.error as e:
             self.flash_image = self.original_image.copy()
 
+        self._apply_interaction_memory()
+
+    def _apply_interaction_memory(self):
+        """
+        An object already used in this game (game_state) starts used
+        """
         if game_state.has_interacted(self.id):
             self.interacted_once = True
             if self.used_image:
                 self.image = self.used_image
                 self.original_image = self.used_image
 
+    def snapshot_state(self):
+        state = super().snapshot_state()
+        state["original_image"] = self.original_image
+        return state
+
+    def restore_state(self, state):
+        """
+        Puts back a snapshot_state and then applies the interactions of the current game
+        """
+        self._stop_sound()
+        super().restore_state(state)
+        self.original_image = state["original_image"]
+        self.current_progress = 0
+        self._apply_interaction_memory()
+
     def unhide(self):
         """
         Makes the object visibe, therefore, interactable.
         """
         self.is_hidden = False
 
+    def is_present(self):
+        """
+        Hidden interactables aren't, nor the ones used up without a used_image (read() removes them from their groups)
+        """
+        return not self.is_hidden and (not self.interacted_once or bool(self.used_image))
+
     def _stop_sound(self):
         if self.charge_sound and self.is_playing_charge:
-            self.charge_sound.stop()
+            audio_manager.stop_loop(self.charge_channel, self.charge_sound)
+            self.charge_channel = None
             self.is_playing_charge = False
 
+    def on_contact_end(self):
+        """
+        Called by the collision pass when the player stops touching the object
+        """
+        self.reset_interaction()
+
     def progress_interaction(self):
         """
         Called every frame the player holds contact/attack
@@ -85,9 +125,11 @@ class Interactable(Obstacle):
         if self.is_hidden or self.interacted_once:
             return None
         
-        if self.charge_sound and not self.is_playing_charge:
-            self.charge_sound.play(-1)
-            self.is_playing_charge = True
+        if self.charge_sound_path and not self.is_playing_charge:
+            self.charge_sound = sound_library.load(self.charge_sound_path)
+            if self.charge_sound:
+                self.charge_channel = audio_manager.play(self.charge_sound, SoundCategories.UI, loops=-1, volume=0.7)
+                self.is_playing_charge = self.charge_channel is not None
         
         self.current_progress += 1
         
@@ -0,0 +1,180 @@
+import time
+import threading
+from .Scene_Loader import SceneLoader
+from .ImageLoader import ImageLoader
+from .ResourceManager import ResourceManager
+from .SoundLibrary import sound_library
+from .Game_Constants import LEVEL_LOAD_STEP_MS, LEVEL_LOAD_DECODE_CHUNK
+from .Logger import get_logger
+
+log = get_logger("LevelLoadJob")
+
+# Phases, in order
+READING = "READING"
+IMAGES = "IMAGES"
+SOUNDS = "SOUNDS"
+OBJECTS = "OBJECTS"
+SCENE = "SCENE"
+DONE = "DONE"
+
+
+class LevelLoadJob:
+    """
+    Loads a level over several frames so the game keeps running (drawing the loading screen) meanwhile
+        READING (worker thread): reads the JSON and decodes the images of the level that aren't cached (ImageLoader)
+        IMAGES: turns the decoded pixels into Surfaces while the worker keeps decoding the rest
+        SOUNDS: decodes the preload_sounds of the level, one per step
+        OBJECTS: builds the objects zone by zone
+        SCENE: builds the Scene
+    Everything but READING touches pygame or the game state so it runs on the main thread, step() does as
+    much of it as fits in a time budget. run() loads everything at once
+    data can be the level JSON already read (e.g. by the PortalPrefetcher), then the worker only decodes images
+    scene can be a Scene already built (e.g. from the SceneCache), then the job is done from the start
+    """
+    def __init__(self, level_req, player, chase_sound, flee_sound, data=None, scene=None):
+        self.level_req = level_req
+        self.player = player
+        self.chase_sound = chase_sound
+        self.flee_sound = flee_sound
+
+        self.phase = READING if scene is None else DONE
+        self.data = None
+        self._prefetched_data = data
+        self.scene = scene
+
+        # Written by the worker (list appends are atomic), read by the main thread
+        self._requests = []
+        self._decoded = []
+        self._worker_done = False
+        self._error = None
+        self._thread = None
+
+        self._uploaded = 0
+        self._sounds = None
+        self._sounds_done = 0
+        self._zones = None
+        self._built_zones = {}
+
+    @property
+    def done(self):
+        return self.phase == DONE
+
+    @property
+    def progress(self):
+        """
+        From 0.0 to 1.0, every image, sound and zone counts the same
+        """
+        if self.done:
+            return 1.0
+        if self.data is None:
+            return 0.0
+        sounds = len(self.data.get("preload_sounds", []))
+        zones = len(self.data.get("zones", {}))
+        total = 2 + 2 * len(self._requests) + sounds + zones
+        done = 1 + len(self._decoded) + self._uploaded + self._sounds_done + len(self._built_zones) + (1 if self.done else 0)
+        return min(1.0, done / total)
+
+    # --- Worker ---
+
+    def start(self):
+        """
+        Starts the worker thread, then call step() every frame until it returns True
+        """
+        if self.done:
+            return self
+        self._thread = threading.Thread(target=self._work, name="LevelLoadJob", daemon=True)
+        self._thread.start()
+        return self
+
+    def _work(self):
+        try:
+            data = self._prefetched_data
+            if data is None:
+                data = SceneLoader.read_level(self.level_req["json_path"])
+            requests = SceneLoader.image_requests(data.get("zones", {}))
+            self._requests = [request for request in dict.fromkeys(requests) if not ResourceManager.is_image_cached(*request)]
+            self.data = data
+
+            loader = ImageLoader()
+            for i in range(0, len(self._requests), LEVEL_LOAD_DECODE_CHUNK):
+                self._decoded.extend(loader.decode(self._requests[i:i + LEVEL_LOAD_DECODE_CHUNK]))
+        except Exception as e:
+            self._error = e
+        finally:
+            self._worker_done = True
+
+    # --- Main thread ---
+
+    def _advance(self):
+        """
+        Does one unit of main thread work, returns False if it has to wait for the worker
+        """
+        if self._error is not None:
+            raise self._error
+
+        if self.phase == READING:
+            if self.data is None:
+                return False
+            self.phase = IMAGES
+
+        if self.phase == IMAGES:
+            if self._uploaded < len(self._decoded):
+                request = self._requests[self._uploaded]
+                surface = ImageLoader.upload(request, self._decoded[self._uploaded])
+                if surface is not None:
+                    ResourceManager.cache_scaled_image(request[0], request[1], surface)
+                self._uploaded += 1
+                return True
+            if not self._worker_done:
+                return False
+            self._sounds = sound_library.pin_level(self.data.get("preload_sounds", []))
+            self.phase = SOUNDS
+
+        if self.phase == SOUNDS:
+            if self._sounds_done < len(self._sounds):
+                sound_library.get(self._sounds[self._sounds_done])
+                self._sounds_done += 1
+                return True
+            self._zones = list(self.data.get("zones", {}).items())
+            self.phase = OBJECTS
+
+        if self.phase == OBJECTS:
+            if len(self._built_zones) < len(self._zones):
+                zone_str, objects_data_list = self._zones[len(self._built_zones)]
+                self._built_zones[eval(zone_str)] = SceneLoader.build_zone(objects_data_list, self.player)
+                return True
+            self.phase = SCENE
+
+        if self.phase == SCENE:
+            req = self.level_req
+            self.scene = SceneLoader.build_scene(
+                self.data, self._built_zones, req["map_matrix"], req["entry_zone"], self.player,
+                self.chase_sound, self.flee_sound, req["music_path"], req["darkness"]
+            )
+            self.phase = DONE
+            log.debug("Level %s loaded", req["json_path"])
+
+        return True
+
+    def step(self, budget_ms=LEVEL_LOAD_STEP_MS):
+        """
+        Advances the main thread phases for up to budget_ms, returns True when the level is loaded
+        """
+        start = time.perf_counter()
+        while not self.done:
+            if not self._advance():
+                break
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+        return self.done
+
+    def run(self):
+        """
+        Loads the whole level now, in the calling thread
+        """
+        if self._thread is None and not self.done:
+            self._work()
+        while not self.done:
+            if not self._advance():
+                self._thread.join(0.005)
+        return self.scene
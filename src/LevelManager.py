@@ -1,20 +1,32 @@
 import pygame
-from src.Scene_Loader import SceneLoader
-from src.GameState import game_state
+from src.LevelLoadJob import LevelLoadJob
+from src.PortalPrefetcher import PortalPrefetcher
+from src.SceneCache import SceneCache, scene_surfaces
 from src.ResourceManager import ResourceManager
+from src.LevelTemplate import LevelTemplate
+from src.GameState import game_state
 from src.Game_Constants import MAPS, LEVEL_MUSIC, LEVEL_DARKNESS, SCREEN_WIDTH, SCREEN_HEIGHT, TRANSITION_BIAS, MUSIC_END_EVENT
 from utils import resource_path
+from src.AudioManager import audio_manager
+from src.Game_Enums import SoundCategories
 import random
+from src.Logger import get_logger
+
+log = get_logger("LevelManager")
 
 class LevelManager:
     def __init__(self, sounds, retro_effects):
         self.sounds = sounds
-        self.ambience_sounds = ResourceManager.load_all_sounds("assets/sounds/ambience")
-        print(f"[LevelManager] Loaded {len(self.ambience_sounds)} ambience tracks.")
+        self.ambience_sounds = self.sounds.index_folder("assets/sounds/ambience")
+        log.info("Loaded %s ambience tracks", len(self.ambience_sounds))
         self.retro_effects = retro_effects
 
         self.current_scene = None
         self.current_music_path = None
+        self.current_level_path = None
+        self.templates = {} # json_path -> LevelTemplate, only for the current and cached levels
+        self.scene_cache = SceneCache(on_evict=self._on_level_evicted)
+        self.prefetcher = PortalPrefetcher(is_loaded=self.scene_cache.__contains__)
 
         self.silence_timer = 0
         self.is_in_silence = False
@@ -41,27 +53,116 @@ class LevelManager:
         self.is_in_silence = False
         self.ambience_timer = 0
 
+    def start_level_load(self, level_req, player_sprite):
+        """
+        Leaves the current level and starts loading the requested one in the background
+        Call step() on the returned LevelLoadJob every frame and finish_level_load once it's done
+        The level left is kept in the scene_cache, coming back to a cached level needs no loading at all
+        If the level was prefetched (the player walked up to the door) its JSON is reused
+        """
+        self._leave_current_level()
+
+        job = self._take_cached_level(level_req, player_sprite)
+        if job is not None:
+            return job
+
+        data = self.prefetcher.take(level_req["json_path"])
+        job = LevelLoadJob(level_req, player_sprite, self.sounds.get("chase_loop"), self.sounds.get("flee_loop"), data=data)
+        return job.start()
+
     def load_level_from_request(self, level_req, player_sprite):
+        """
+        Starts a level from scratch all at once (e.g. a new game, after game_state.reset())
+        The cached levels are restored to their LevelTemplate (the ones without one are dropped) and the
+        requested one, if it's cached, is instantiated from it, so restarting a level already built takes no loading
+        """
+        self._leave_current_level()
+
+        json_path = level_req["json_path"]
+        for cached_path in self.scene_cache.keys():
+            template = self.templates.get(cached_path)
+            if template is None:
+                self.scene_cache.discard(cached_path)
+            elif cached_path != json_path:
+                template.restore()
+
+        if json_path in self.scene_cache:
+            self.scene_cache.take(json_path)
+            scene = self.templates[json_path].instantiate(level_req["entry_zone"])
+            job = self._cached_level_job(level_req, player_sprite, scene)
+        else:
+            self.prefetcher.cancel()
+            job = LevelLoadJob(level_req, player_sprite, self.sounds.get("chase_loop"), self.sounds.get("flee_loop"))
+            job.run()
+        self.finish_level_load(job, player_sprite)
+
+    def _take_cached_level(self, level_req, player_sprite):
+        """
+        Returns a finished LevelLoadJob with the cached scene of the level activated, None if it isn't cached
+        """
+        json_path = level_req["json_path"]
+        scene = self.scene_cache.take(json_path)
+        if scene is None:
+            return None
+
+        scene.activate(level_req["entry_zone"])
+        log.debug("Level %s restored from the cache", json_path)
+        return self._cached_level_job(level_req, player_sprite, scene)
+
+    def _cached_level_job(self, level_req, player_sprite, scene):
+        """
+        Returns a finished LevelLoadJob for a scene that is already built and activated
+        """
+        self.prefetcher.cancel()
+        self.sounds.pin_level(scene.preload_sounds)
+        return LevelLoadJob(level_req, player_sprite, None, None, scene=scene)
+
+    def _leave_current_level(self):
         if self.current_scene:
             self.current_scene.cleanup()
-            
-        self.current_scene = SceneLoader.load_from_json(
-            level_req["json_path"],
-            level_req["map_matrix"],
-            level_req["entry_zone"],
-            player_sprite,
-            self.sounds.get("chase_loop"),
-            self.sounds.get("flee_loop"),
-            level_req["music_path"],
-            level_req["darkness"]
-        )
+            self.scene_cache.put(self.current_level_path, self.current_scene)
+
+    def _drop_template(self, json_path):
+        self.templates.pop(json_path, None)
+
+    def _on_level_evicted(self, json_path, scene):
+        """
+        A level dropped from the scene_cache: its template goes and so do the cached images only it was using
+        (the ones the current level or another cached level use stay in the ResourceManager cache)
+        """
+        self._drop_template(json_path)
+
+        in_use = {}
+        for other in self.scene_cache.scenes() + [self.current_scene]:
+            if other is not None and other is not scene:
+                in_use.update(scene_surfaces(other))
+        unused = {key: surface for key, surface in scene_surfaces(scene).items() if key not in in_use}
+        released = ResourceManager.release_images(unused)
+        log.debug("Level %s evicted, %s cached images released", json_path, released)
+
+    def finish_level_load(self, job, player_sprite):
+        """
+        Makes the scene of a finished LevelLoadJob the current one, starts its music and places the player
+        """
+        level_req = job.level_req
+        self.current_scene = job.scene
+        self.current_level_path = level_req["json_path"]
+
+        # A scene just built from its JSON (not one from the cache) is pristine, it's the template of the level
+        if job.data is not None:
+            template = LevelTemplate.capture(self.current_level_path, self.current_scene)
+            if template is not None:
+                self.templates[self.current_level_path] = template
+            else:
+                self._drop_template(self.current_level_path)
+        self.prefetcher.set_scene(self.current_scene)
 
         self.silence_timer = 0
         self.is_in_silence = False
 
         new_music = level_req["music_path"]
         if new_music and new_music != self.current_music_path:
-            print(f"[LevelManager] Changing music to: {new_music}")
+            log.info("Changing music to: %s", new_music)
             pygame.mixer.music.fadeout(500)
             try:
                 pygame.mixer.music.load(resource_path(new_music))
@@ -69,27 +170,30 @@ class LevelManager:
                 pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
                 pygame.mixer.music.set_volume(0.5)
             except Exception as e:
-                print(f"Error loading music: {e}")
+                log.error("Error loading music: %s", e)
             self.current_music_path = new_music
 
         self.current_zone = level_req["entry_zone"]
         
         pos = level_req["player_pos"]
         player_sprite.teleport(pos[0], pos[1])
+        game_state.enter_level(level_req)
         
-        print(f"[LevelManager] Level loaded at zone: {self.current_zone}")
+        log.info("Level loaded at zone: %s", self.current_zone)
 
     def on_music_ended(self):
         self.silence_timer = random.randint(80000, 100000)
         self.is_in_silence = True
         self.ambience_timer = random.randint(15000, 30000)
-        print(f"[LevelManager] Music ended. Silence for {self.silence_timer/1000} seconds.")
+        log.info("Music ended. Silence for %s seconds", self.silence_timer / 1000)
 
-    def update(self, delta_time):
+    def update(self, delta_time, player=None):
         if self.current_scene:
-            self.current_scene.enemies.update(delta_time)
+            self.current_scene.update_enemies(delta_time, player)
             self.current_scene.obstacles.update()
             self.current_scene.interactables.update()
+            if player is not None:
+                self.prefetcher.update(player)
 
         if self.is_in_silence:
             self.silence_timer -= delta_time
@@ -98,14 +202,13 @@ class LevelManager:
 
             if self.ambience_timer <= 0:
                 if self.ambience_sounds:
-                    sound_key = random.choice(list(self.ambience_sounds.keys()))
-                    sfx = self.ambience_sounds[sound_key]
+                    sound_key = random.choice(self.ambience_sounds)
+                    sfx = self.sounds.get(sound_key)
 
                     if sfx:
                         vol = random.uniform(0.5, 1)
-                        sfx.set_volume(vol)
-                        sfx.play()
-                        print(f"[Ambience] Played '{sound_key}' at vol {vol:.2f}")
+                        audio_manager.play(sfx, SoundCategories.AMBIENCE, volume=vol)
+                        log.debug("Ambience: played '%s' at vol %.2f", sound_key, vol)
 
                         self.retro_effects.add_trauma(1)
 
@@ -115,11 +218,11 @@ class LevelManager:
                 self.is_in_silence = False
                 if self.current_music_path:
                     try:
-                        print("[LevelManager] Silence over. Replaying music.")
+                        log.info("Silence over. Replaying music")
                         pygame.mixer.music.play(0)
                         pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
                     except Exception as e:
-                        print(f"Error replaying music: {e}")
+                        log.error("Error replaying music: %s", e)
 
     def draw(self, screen, player_sprite):
         if self.current_scene:
@@ -179,4 +282,5 @@ class LevelManager:
         if transition_occurred:
             self.current_zone = (y_cord, x_cord)
             self.current_scene.set_location(self.current_zone)
-            player_sprite.pos = pygame.Vector2(player_sprite.rect.center)
\ No newline at end of file
+            player_sprite.pos = pygame.Vector2(player_sprite.rect.center)
+            game_state.enter_zone(self.current_zone, player_sprite.rect.center)
\ No newline at end of file
@@ -0,0 +1,53 @@
+from .GameState import game_state
+from .Logger import get_logger
+
+log = get_logger("LevelTemplate")
+
+
+class LevelTemplate:
+    """
+    Pristine copy of a level as it was built from its JSON, to start it again without reading or building anything
+    It keeps the Scene built the first time (object definitions, parsed params and shared Surfaces) and the
+    snapshot_state of every object taken right after building it. instantiate() puts every object back to that
+    snapshot (hidden, interacted, images...) and activates the scene, so a restart costs milliseconds
+    There's only one runtime copy: the Scene of the template is the one that is played
+    """
+    def __init__(self, json_path, scene):
+        self.json_path = json_path
+        self.scene = scene
+        self._states = [(obj, obj.snapshot_state()) for obj in self._objects(scene)]
+
+    @staticmethod
+    def _objects(scene):
+        for zones in (scene.obstacles_dict, scene._interactables_dict, scene._triggers_dict):
+            for objects in zones.values():
+                yield from objects
+
+    @classmethod
+    def capture(cls, json_path, scene):
+        """
+        Returns the template of a scene just built, None if it isn't pristine
+        (an object was built already used because game_state remembers an interaction with it)
+        """
+        for obj in cls._objects(scene):
+            if getattr(obj, "interacted_once", False) or (obj.id and game_state.has_interacted(obj.id)):
+                log.debug("Level %s isn't pristine, no template", json_path)
+                return None
+        return cls(json_path, scene)
+
+    def restore(self):
+        """
+        Puts every object back to its snapshot, the scene must have been left with cleanup() first
+        """
+        for obj, state in self._states:
+            obj.restore_state(state)
+        self.scene.navigation.reset()
+        log.debug("Level %s restored from its template", self.json_path)
+
+    def instantiate(self, location):
+        """
+        Restores the level and makes its scene playable at location
+        """
+        self.restore()
+        self.scene.activate(location)
+        return self.scene
@@ -0,0 +1,195 @@
+import atexit
+import collections
+import os
+import sys
+import threading
+import time
+from .Game_Constants import LOG_LEVEL, LOG_LEVELS, LOG_FILE, LOG_CONSOLE_LEVEL, LOG_BUFFER_SIZE, LOG_FLUSH_INTERVAL
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_VALUES = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR, "OFF": OFF}
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+# Arguments that can't change before the writer thread formats them
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def _level_value(level):
+    if isinstance(level, str):
+        return LEVEL_VALUES.get(level.upper(), INFO)
+    return level
+
+
+def _format(message, args):
+    try:
+        return message % args
+    except (TypeError, ValueError):
+        return f"{message} {args}"
+
+
+class LogWriter:
+    """
+    Background writer shared by every Logger
+    Records are appended to a ring buffer (a deque with maxlen, appending and popping are atomic so the game
+    thread never waits for a lock) and a daemon thread formats them and writes them to the log file
+    If the buffer is full the oldest records are dropped instead of stalling the frame
+    """
+    def __init__(self, path=LOG_FILE, console_level=LOG_CONSOLE_LEVEL, buffer_size=LOG_BUFFER_SIZE, interval=LOG_FLUSH_INTERVAL):
+        self.path = path
+        self.console_level = _level_value(console_level)
+        self.interval = interval
+        self.buffer = collections.deque(maxlen=buffer_size)
+
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = None
+        self._file = None
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+
+    def push(self, record):
+        self.buffer.append(record)
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        # Threads logging for the first time at once must start only one writer
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _open(self):
+        if self._file is None and self.path:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "w", encoding="utf-8")
+            except OSError as e:
+                self.path = None
+                sys.stderr.write(f"[Logger] Can't open log file: {e}\n")
+        return self._file
+
+    def _run(self):
+        while not self._stop:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.drain()
+
+    def drain(self):
+        """
+        Writes every buffered record (called by the writer thread, and on close)
+        """
+        with self._write_lock:
+            log_file = self._open()
+            buffer = self.buffer
+            wrote = False
+            while buffer:
+                try:
+                    created, level, name, message, args = buffer.popleft()
+                except IndexError:
+                    break
+
+                if args:
+                    message = _format(message, args)
+
+                line = f"{time.strftime('%H:%M:%S', time.localtime(created))}.{int(created * 1000) % 1000:03d} {LEVEL_NAMES.get(level, level)} [{name}] {message}\n"
+                if log_file:
+                    log_file.write(line)
+                    wrote = True
+                if level >= self.console_level:
+                    sys.stderr.write(f"[{name}] {message}\n")
+
+            if wrote:
+                log_file.flush()
+
+    def flush(self):
+        """
+        Asks the writer thread to write what is buffered now
+        """
+        self._wake.set()
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self.drain()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class Logger:
+    """
+    Leveled logger of a module
+    Messages use lazy %-style arguments: log.debug("Flag '%s' set to %s", key, value)
+    They are formatted by the writer thread, unless an argument is mutable (a dict, a list...) and could change
+    before that, then the message is formatted right away. Disabled levels are bound to a function that does nothing
+    """
+    def __init__(self, name, level=LOG_LEVEL, writer=None):
+        self.name = name
+        self.writer = writer
+        self.set_level(level)
+
+    def set_level(self, level):
+        self.level = _level_value(level)
+        self.debug = self._bind(DEBUG)
+        self.info = self._bind(INFO)
+        self.warning = self._bind(WARNING)
+        self.error = self._bind(ERROR)
+
+    def is_enabled(self, level):
+        return _level_value(level) >= self.level
+
+    def _bind(self, level):
+        if level < self.level:
+            return _noop
+
+        push = self.writer.push
+        name = self.name
+        clock = time.time
+
+        def log(message, *args):
+            for arg in args:
+                if type(arg) not in _IMMUTABLE_ARGS:
+                    message, args = _format(message, args), ()
+                    break
+            push((clock(), level, name, message, args))
+        return log
+
+
+_writer = LogWriter()
+_loggers = {}
+
+
+def get_logger(name):
+    """
+    Returns the Logger of a module, its level comes from LOG_LEVELS (or LOG_LEVEL) in Game_Constants
+    """
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = Logger(name, LOG_LEVELS.get(name, LOG_LEVEL), _writer)
+        _loggers[name] = logger
+    return logger
+
+
+def set_level(name, level):
+    """
+    Changes the level of a module at runtime
+    """
+    get_logger(name).set_level(level)
+
+
+def flush():
+    _writer.flush()
@@ -1,7 +1,11 @@
 import pygame
 from .Game_Constants import RESIZE_FACTOR
 from .Animations import Animation
+from .ResourceManager import ResourceManager
 from utils import resource_path
+from .Logger import get_logger
+
+log = get_logger("Obstacles")
 
 class Obstacle(pygame.sprite.Sprite):
     """
@@ -42,11 +46,8 @@ class Obstacle(pygame.sprite.Sprite):
             if not image_path or image_path == "None":
                 raise ValueError("Image path is none or is empty")
                 
-            self.image = pygame.image.load(resource_path(image_path)).convert_alpha()
-            
-            self.image = pygame.transform.scale(self.image, 
-                (int(self.image.get_width() * resize_factor), int(self.image.get_height() * resize_factor))
-            )
+            # Shared with every object using the same file and size, SceneLoader decodes them in parallel beforehand
+            self.image = ResourceManager.get_scaled_image(resource_path(image_path), resize_factor)
             
         except Exception as e:
             self.image = pygame.Surface((int(20 * resize_factor), int(20 * resize_factor)))
@@ -79,7 +80,7 @@ class Obstacle(pygame.sprite.Sprite):
                 if images:
                     self.animation = Animation(self, images, data.get("animation_speed", 0.1))
             except Exception as e:
-                print(f"ERROR: Can't load animation for {data.get('id')}: {e}")
+                log.error("Can't load animation for %s: %s", data.get('id'), e)
 
     def update(self):
         """
@@ -98,6 +99,31 @@ class Obstacle(pygame.sprite.Sprite):
     def hide(self):
         self.is_hidden = True
 
+    def is_present(self):
+        """
+        Tells if the object is added to its zone when the zone is loaded (drawn, collidable and blocking the pathfinding)
+        Obstacles always are, hiding one only takes it out of the zone being played (see Scene.hide_object_by_id)
+        """
+        return True
+
+    def snapshot_state(self):
+        """
+        Returns the state that changes while playing (see LevelTemplate), restore_state puts it back
+        """
+        return {
+            "is_hidden": self.is_hidden,
+            "interacted_once": self.interacted_once,
+            "image": self.image,
+            "animation_index": self.animation.index if self.animation else 0,
+        }
+
+    def restore_state(self, state):
+        self.is_hidden = state["is_hidden"]
+        self.interacted_once = state["interacted_once"]
+        self.image = state["image"]
+        if self.animation:
+            self.animation.index = state["animation_index"]
+
     @property
     def collision_rect(self):
         """
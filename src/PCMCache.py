@@ -0,0 +1,153 @@
+import os
+import json
+import mmap
+import hashlib
+import pygame
+from .Game_Constants import PCM_CACHE_DIR
+from .Logger import get_logger
+
+log = get_logger("PCMCache")
+
+_INDEX_FILE = "index.json"
+
+
+class PCMCache:
+    """
+    On-disk cache of sounds already decoded to the mixer format
+    A cached file is the raw PCM of a sound, named after the hash of the source file and the mixer settings
+    (frequency, format, channels), so a changed file or mixer gets a new entry and stale ones are never read
+    The index keeps the size and mtime of every source, a file is only hashed again when one of them changes
+    Warm loads map the cached PCM and give it to pygame.mixer.Sound(buffer=...), no decoding at all
+    """
+    def __init__(self, directory=PCM_CACHE_DIR):
+        self.directory = directory
+        self.stats = {"hits": 0, "misses": 0}
+        self._index = None
+        self._index_dirty = False
+
+    # --- Index ---
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+
+        self._index = {}
+        try:
+            with open(os.path.join(self.directory, _INDEX_FILE), "r") as f:
+                self._index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.warning("PCM cache index unreadable, starting a new one: %s", e)
+        return self._index
+
+    def save_index(self):
+        if not self._index_dirty:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = os.path.join(self.directory, _INDEX_FILE + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, os.path.join(self.directory, _INDEX_FILE))
+            self._index_dirty = False
+        except OSError as e:
+            log.warning("Can't save the PCM cache index: %s", e)
+
+    @staticmethod
+    def _hash_file(path):
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _source_hash(self, path):
+        """
+        Returns the content hash of a source file, reusing the indexed one while its size and mtime are the same
+        """
+        index = self._load_index()
+        stat = os.stat(path)
+        entry = index.get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return entry["hash"]
+
+        file_hash = self._hash_file(path)
+        if entry and entry["hash"] != file_hash:
+            self._remove_stale(entry["hash"], path)
+
+        index[path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": file_hash}
+        self._index_dirty = True
+        return file_hash
+
+    def _remove_stale(self, old_hash, path):
+        """
+        Deletes the cached PCM of an old version of a file (if no other indexed file has the same content)
+        """
+        if any(other != path and entry["hash"] == old_hash for other, entry in self._index.items()):
+            return
+        for filename in os.listdir(self.directory):
+            if filename.startswith(old_hash + "_"):
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+
+    # --- Sounds ---
+
+    def _cache_path(self, file_hash, mixer):
+        frequency, sample_format, channels = mixer
+        return os.path.join(self.directory, f"{file_hash}_{frequency}_{sample_format}_{channels}.pcm")
+
+    def load_sound(self, path):
+        """
+        Returns a pygame.mixer.Sound for the file, from the cache or decoded (and cached) if it isn't there
+        Raises the same errors as pygame.mixer.Sound(path)
+        """
+        mixer = pygame.mixer.get_init()
+        if mixer is None:
+            return pygame.mixer.Sound(path)
+
+        path = os.path.abspath(path)
+        try:
+            cache_path = self._cache_path(self._source_hash(path), mixer)
+        except OSError:
+            return pygame.mixer.Sound(path) # Missing source, pygame raises the usual error
+
+        sound = self._read(cache_path)
+        if sound is not None:
+            self.stats["hits"] += 1
+            return sound
+
+        self.stats["misses"] += 1
+        sound = pygame.mixer.Sound(path)
+        self._write(cache_path, sound)
+        self.save_index()
+        return sound
+
+    @staticmethod
+    def _read(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as pcm:
+                    return pygame.mixer.Sound(buffer=pcm)
+        except (OSError, ValueError):
+            # Not cached yet (or empty, mmap can't map 0 bytes)
+            return None
+
+    def _write(self, cache_path, sound):
+        raw = sound.get_raw()
+        if not raw:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(raw)
+            os.replace(tmp_path, cache_path)
+            log.debug("Cached PCM %s (%s KB)", os.path.basename(cache_path), len(raw) // 1024)
+        except OSError as e:
+            log.warning("Can't write the PCM cache %s: %s", cache_path, e)
+
+
+pcm_cache = PCMCache()
@@ -0,0 +1,164 @@
+from array import array
+from collections import deque
+from .Game_Constants import SCREEN_WIDTH, SCREEN_HEIGHT, PATHFINDING_CELL_SIZE, PATHFINDING_CLEARANCE
+
+# 8 neighbours, diagonals can't cut the corner of a blocked cell
+_NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class WalkabilityGrid:
+    """
+    A zone rasterized into square cells
+    A cell is blocked if a collidable collision_rect (grown by clearance so bodies don't clip corners) covers it
+    """
+    def __init__(self, obstacles, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, cell_size=PATHFINDING_CELL_SIZE, clearance=PATHFINDING_CLEARANCE):
+        self.cell_size = cell_size
+        self.cols = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.blocked = bytearray(self.cols * self.rows)
+
+        for obj in obstacles:
+            rect = obj.collision_rect
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            rect = rect.inflate(clearance * 2, clearance * 2)
+
+            first_col = max(0, rect.left // cell_size)
+            last_col = min(self.cols - 1, (rect.right - 1) // cell_size)
+            first_row = max(0, rect.top // cell_size)
+            last_row = min(self.rows - 1, (rect.bottom - 1) // cell_size)
+
+            for row in range(first_row, last_row + 1):
+                start = row * self.cols
+                for col in range(first_col, last_col + 1):
+                    self.blocked[start + col] = 1
+
+    def cell_index(self, x, y):
+        """
+        Returns the index of the cell under (x, y) or None if it's outside the zone
+        """
+        col = int(x // self.cell_size)
+        row = int(y // self.cell_size)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def is_walkable(self, index):
+        return index is not None and not self.blocked[index]
+
+    def center(self, index):
+        size = self.cell_size
+        return ((index % self.cols) * size + size / 2, (index // self.cols) * size + size / 2)
+
+
+class FlowField:
+    """
+    Breadth-first search from the target cell over the walkable cells of a grid
+    Every reached cell stores the next cell towards the target, so following it costs O(1) per enemy
+    """
+    def __init__(self, grid, target_index):
+        self.grid = grid
+        self.target_index = target_index
+        self.next_cell = array('i', [-1]) * (grid.cols * grid.rows)
+        self._build()
+
+    def _build(self):
+        grid = self.grid
+        cols, rows = grid.cols, grid.rows
+        blocked = grid.blocked
+        next_cell = self.next_cell
+
+        # The target cell is the seed even if it is blocked (the player can stand next to a wall)
+        next_cell[self.target_index] = self.target_index
+        queue = deque((self.target_index,))
+
+        while queue:
+            index = queue.popleft()
+            col, row = index % cols, index // cols
+
+            for dc, dr in _NEIGHBOURS:
+                ncol, nrow = col + dc, row + dr
+                if not (0 <= ncol < cols and 0 <= nrow < rows):
+                    continue
+
+                neighbour = nrow * cols + ncol
+                if blocked[neighbour] or next_cell[neighbour] != -1:
+                    continue
+                if dc and dr and (blocked[row * cols + ncol] or blocked[nrow * cols + col]):
+                    continue
+
+                next_cell[neighbour] = index
+                queue.append(neighbour)
+
+    def in_target_cell(self, x, y):
+        return self.grid.cell_index(x, y) == self.target_index
+
+    def waypoint(self, x, y):
+        """
+        Returns the center of the next cell an agent at (x, y) should walk to, or None if there is no path
+        from there (outside the zone, inside a blocked cell or in an area the target can't be reached from)
+        """
+        index = self.grid.cell_index(x, y)
+        if index is None:
+            return None
+
+        step = self.next_cell[index]
+        if step == -1:
+            return None
+        return self.grid.center(step)
+
+
+class Navigation:
+    """
+    Pathfinding service of a Scene
+    Walkability grids are built once per zone and flow fields are rebuilt only when the target (the player)
+    moves to another cell, so every enemy of the zone shares the same field
+    """
+    def __init__(self, scene, cell_size=PATHFINDING_CELL_SIZE, clearance=PATHFINDING_CLEARANCE):
+        self.scene = scene
+        self.cell_size = cell_size
+        self.clearance = clearance
+        self._grids = {}
+        self._fields = {}
+
+    def grid_for(self, zone):
+        grid = self._grids.get(zone)
+        if grid is None:
+            obstacles = self.scene.obstacles if zone == self.scene.location else self._zone_obstacles(zone)
+            grid = WalkabilityGrid(obstacles, cell_size=self.cell_size, clearance=self.clearance)
+            self._grids[zone] = grid
+        return grid
+
+    def _zone_obstacles(self, zone):
+        objects = list(self.scene.obstacles_dict.get(zone, [])) + list(self.scene._interactables_dict.get(zone, []))
+        return [obj for obj in objects if obj.is_present()]
+
+    def invalidate(self, zone):
+        """
+        Forces the zone grid to be rebuilt (an obstacle was hidden, revealed or used up)
+        """
+        self._grids.pop(zone, None)
+        self._fields.pop(zone, None)
+
+    def reset(self):
+        """
+        Forgets every grid and field (e.g. the objects of the scene were restored by a LevelTemplate)
+        """
+        self._grids.clear()
+        self._fields.clear()
+
+    def flow_field(self, x, y, zone=None):
+        """
+        Returns the FlowField towards (x, y) in zone (the current one by default), None if (x, y) is outside the zone
+        """
+        zone = self.scene.location if zone is None else zone
+        grid = self.grid_for(zone)
+        target_index = grid.cell_index(x, y)
+        if target_index is None:
+            return None
+
+        field = self._fields.get(zone)
+        if field is None or field.target_index != target_index or field.grid is not grid:
+            field = FlowField(grid, target_index)
+            self._fields[zone] = field
+        return field
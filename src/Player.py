@@ -1,17 +1,23 @@
 import pygame
 from .Game_Constants import *
 from .Animations import Animation
+from .AudioManager import audio_manager
+from .ResourceManager import ResourceManager
+from .Game_Enums import SoundCategories
 from utils import resource_path
 
 class Player(pygame.sprite.Sprite):
     """
     Represents the playable character in the game
     """
+    # Image and scale of the player (read by bake_assets.py too)
+    IMAGE_PATH = "assets/images/detective_1.png"
+    IMAGE_FACTOR = RESIZE_FACTOR
+
     def __init__(self, start_x, start_y, walking_sound=None):
         super().__init__()
 
-        self.image = pygame.image.load(resource_path('assets/images/detective_1.png')).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (self.image.get_width() * RESIZE_FACTOR, self.image.get_height() * RESIZE_FACTOR))
+        self.image = ResourceManager.get_scaled_image(resource_path(self.IMAGE_PATH), self.IMAGE_FACTOR)
         self.rect = self.image.get_rect(center = (start_x, start_y))
         self.pos = pygame.math.Vector2(self.rect.center)
         self.prev_pos = self.pos.copy()
@@ -32,6 +38,7 @@ class Player(pygame.sprite.Sprite):
         
         self.walking_sound = walking_sound
         self.is_walking_sound_playing = False
+        self.walking_channel = None
 
         # ---Animations---
         self.animations = {
@@ -92,7 +99,8 @@ class Player(pygame.sprite.Sprite):
         self.rect = self.image.get_rect(center = self.pos)
 
         if self.is_walking_sound_playing:
-            self.walking_sound.stop()
+            audio_manager.stop_loop(self.walking_channel, self.walking_sound)
+            self.walking_channel = None
             self.is_walking_sound_playing = False
 
     def _handle_walking_sound(self):
@@ -106,11 +114,12 @@ class Player(pygame.sprite.Sprite):
 
         if is_moving:
             if not self.is_walking_sound_playing:
-                self.walking_sound.play(loops=-1)
-                self.is_walking_sound_playing = True
+                self.walking_channel = audio_manager.play(self.walking_sound, SoundCategories.AMBIENCE, loops=-1)
+                self.is_walking_sound_playing = self.walking_channel is not None
         else:
             if self.is_walking_sound_playing:
-                self.walking_sound.stop()
+                audio_manager.stop_loop(self.walking_channel, self.walking_sound)
+                self.walking_channel = None
                 self.is_walking_sound_playing = False
 
     def stop_attack(self):
@@ -0,0 +1,217 @@
+import time
+import threading
+from collections import namedtuple
+from utils import resource_path
+from .Game_Enums import Actions
+from .Game_Constants import MAPS, LEVEL_MUSIC, PREFETCH_DISTANCE, LEVEL_LOAD_STEP_MS, LEVEL_LOAD_DECODE_CHUNK
+from .Scene_Loader import SceneLoader
+from .ImageLoader import ImageLoader
+from .ResourceManager import ResourceManager
+from .Logger import get_logger
+
+log = get_logger("PortalPrefetcher")
+
+# An object that moves the player: the zone it's in, the object, its action (ChangeLevel or Teleport) and the step params
+Portal = namedtuple("Portal", ["zone", "obj", "action", "params"])
+
+
+def _portal_params(obj, action):
+    """
+    Params of every step of an object (trigger action or scripted event) that runs the action
+    """
+    main_action = obj.action if hasattr(obj, "condition") else obj.trigger_action
+    params = [obj.parsed_params] if main_action == action else []
+    params.extend(step.params for step in getattr(obj, "scripted_events", ()) if step.action == action)
+    return params
+
+
+class LevelPrefetch:
+    """
+    Speculative load of the level behind a ChangeLevel door, without side effects on the game:
+    a thread reads the JSON, decodes the images of the entry zone and reads the music file (so the OS has it cached),
+    step() turns the decoded images into Surfaces of the ResourceManager cache
+    cancel() drops whatever is left, the parsed JSON is handed to the LevelLoadJob if the door is taken
+    """
+    def __init__(self, json_path, entry_zone, music_path=None):
+        self.json_path = json_path
+        self.entry_zone = entry_zone
+        self.music_path = music_path
+
+        self.data = None
+        self.cancelled = False
+        self._requests = []
+        self._decoded = []
+        self._uploaded = 0
+        self._worker_done = False
+
+        self._thread = threading.Thread(target=self._work, name="LevelPrefetch", daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self):
+        return self._worker_done and self._uploaded >= len(self._decoded)
+
+    def _work(self):
+        try:
+            data = SceneLoader.read_level(self.json_path)
+            self.data = data
+
+            entry_zone = {zone_str: objects for zone_str, objects in data.get("zones", {}).items() if eval(zone_str) == tuple(self.entry_zone)}
+            requests = [request for request in dict.fromkeys(SceneLoader.image_requests(entry_zone)) if not ResourceManager.is_image_cached(*request)]
+            self._requests = requests
+
+            loader = ImageLoader()
+            for i in range(0, len(requests), LEVEL_LOAD_DECODE_CHUNK):
+                if self.cancelled:
+                    return
+                self._decoded.extend(loader.decode(requests[i:i + LEVEL_LOAD_DECODE_CHUNK]))
+
+            if self.music_path and not self.cancelled:
+                with open(resource_path(self.music_path), "rb") as f:
+                    while f.read(1 << 20):
+                        if self.cancelled:
+                            return
+        except Exception as e:
+            log.debug("Prefetch of %s failed: %s", self.json_path, e)
+        finally:
+            self._worker_done = True
+
+    def step(self, budget_ms=LEVEL_LOAD_STEP_MS):
+        """
+        Uploads the images decoded so far (main thread)
+        """
+        start = time.perf_counter()
+        while not self.cancelled and self._uploaded < len(self._decoded):
+            request = self._requests[self._uploaded]
+            if not ResourceManager.is_image_cached(*request):
+                surface = ImageLoader.upload(request, self._decoded[self._uploaded])
+                if surface is not None:
+                    ResourceManager.cache_scaled_image(request[0], request[1], surface)
+            self._uploaded += 1
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class PortalPrefetcher:
+    """
+    Indexes the ChangeLevel and Teleport objects of the current scene and prepares the destination
+    of the one the player is close to (within PREFETCH_DISTANCE px, or anywhere in its zone if it's None)
+        - ChangeLevel: a LevelPrefetch of the destination level, taking the door hands its JSON to the LevelLoadJob
+          and the entry zone images are already cached
+        - Teleport: the walkability grid of the destination zone is built beforehand
+    When the player walks away from the portal the speculative work is dropped
+    is_loaded (optional) tells if a level JSON path needs no prefetch (e.g. it's in the SceneCache)
+    """
+    def __init__(self, is_loaded=None):
+        self.is_loaded = is_loaded
+        self.scene = None
+        self._portals = {}
+        self.target = None
+        self.prefetch = None
+        self.stats = {"started": 0, "cancelled": 0, "used": 0}
+
+    def set_scene(self, scene):
+        """
+        Indexes the portals of a scene (called when it becomes the current one)
+        """
+        self.scene = scene
+        self._portals = {}
+        self.target = None
+
+        for action in (Actions.CHANGE_LEVEL, Actions.TELEPORT):
+            for entry in scene.query(action=action):
+                for params in _portal_params(entry.obj, action):
+                    self._portals.setdefault(entry.zone, []).append(Portal(entry.zone, entry.obj, action, params))
+
+        log.debug("Portals indexed: %s", sum(len(portals) for portals in self._portals.values()))
+
+    def _closest_portal(self, player):
+        closest = None
+        closest_distance = None
+        for portal in self._portals.get(self.scene.location, ()):
+            if getattr(portal.obj, "is_hidden", False):
+                continue
+            dx = portal.obj.rect.centerx - player.rect.centerx
+            dy = portal.obj.rect.centery - player.rect.centery
+            distance = dx * dx + dy * dy
+            if PREFETCH_DISTANCE is not None and distance > PREFETCH_DISTANCE * PREFETCH_DISTANCE:
+                continue
+            if closest is None or distance < closest_distance:
+                closest, closest_distance = portal, distance
+        return closest
+
+    def update(self, player):
+        """
+        Picks the portal to prepare and advances its prefetch, call it every frame
+        """
+        if self.scene is None:
+            return
+
+        portal = self._closest_portal(player)
+        if portal is not self.target:
+            self.target = portal
+            self._start(portal)
+
+        if self.prefetch is not None and not self.prefetch.done:
+            self.prefetch.step()
+
+    def _start(self, portal):
+        """
+        Prepares the destination of the new target, the prefetch of a level that isn't the target anymore is cancelled
+        """
+        if portal is None:
+            self.cancel()
+            return
+
+        params = portal.params
+        if portal.action == Actions.TELEPORT:
+            self.cancel()
+            zone = params.get("zone")
+            if zone is not None and self.scene.check_zone(zone):
+                self.scene.navigation.grid_for(zone)
+            return
+
+        level_name, json_file, zone = params.get("level"), params.get("json"), params.get("zone")
+        if level_name not in MAPS or not json_file or not zone:
+            self.cancel()
+            return
+
+        json_path = resource_path(json_file)
+        if self.is_loaded is not None and self.is_loaded(json_path):
+            self.cancel()
+            return
+        if self.prefetch is not None:
+            if self.prefetch.json_path == json_path and tuple(self.prefetch.entry_zone) == tuple(zone) and not self.prefetch.cancelled:
+                return
+            self.cancel()
+
+        self.prefetch = LevelPrefetch(json_path, zone, LEVEL_MUSIC.get(level_name))
+        self.stats["started"] += 1
+        log.debug("Prefetching %s at zone %s", json_file, zone)
+
+    def cancel(self):
+        if self.prefetch is not None:
+            self.prefetch.cancel()
+            self.prefetch = None
+            self.stats["cancelled"] += 1
+
+    def take(self, json_path):
+        """
+        Returns the level data prefetched for json_path (None if there is none) and drops the prefetch
+        """
+        prefetch = self.prefetch
+        self.prefetch = None
+        self.target = None
+        if prefetch is None:
+            return None
+
+        prefetch.cancel()
+        if prefetch.json_path != json_path or prefetch.data is None:
+            self.stats["cancelled"] += 1
+            return None
+
+        self.stats["used"] += 1
+        return prefetch.data
@@ -1,9 +1,16 @@
 import pygame
 import os
 from utils import resource_path
+from src.PCMCache import pcm_cache
+from src.ImageLoader import ImageLoader
+from src.BakedAssets import baked_assets, read_baked, scaled_size
+from src.Logger import get_logger
+
+log = get_logger("ResourceManager")
 
 class ResourceManager:
     _fonts = {}
+    _scaled_images = {}
 
 
     @staticmethod
@@ -13,14 +20,79 @@ class ResourceManager:
                 font_path = resource_path("assets/fonts/little-pixel.ttf")
                 font = pygame.font.Font(font_path, size)
                 ResourceManager._fonts[size] = font
-                print(f"[ResourceManager] Loaded Global Font size {size}")
+                log.debug("Loaded Global Font size %s", size)
             except Exception as e:
-                print(f"[ResourceManager] Error loading font size {size}: {e}")
+                log.error("Error loading font size %s: %s", size, e)
                 ResourceManager._fonts[size] = pygame.font.SysFont("Arial", size)
             
         return ResourceManager._fonts[size]
 
 
+    @staticmethod
+    def get_scaled_image(path, factor=1):
+        """
+        Returns the image at path scaled by factor (or to a (width, height)), loaded once and shared by every caller
+        Baked images (see bake_assets.py) are used as they are, without decoding or scaling
+        The surface is shared: don't draw on it, copy it first
+        """
+        key = (path, factor)
+        if key not in ResourceManager._scaled_images:
+            baked = baked_assets.lookup(path, factor)
+            if baked is not None:
+                image = ImageLoader.upload(key, read_baked(baked))
+            if baked is None or image is None:
+                # An image scaled to a size is made from the unscaled one when it's cached (e.g. flash images)
+                image = ResourceManager._scaled_images.get((path, 1)) if isinstance(factor, tuple) else None
+                if image is None:
+                    image = pygame.image.load(path).convert_alpha()
+                if factor != 1:
+                    image = pygame.transform.scale(image, scaled_size(image.get_size(), factor))
+            ResourceManager._scaled_images[key] = image
+            log.debug("Cached image %s (x%s)", path, factor)
+
+        return ResourceManager._scaled_images[key]
+
+    @staticmethod
+    def release_images(surfaces):
+        """
+        Forgets the cached images that are one of surfaces ({id: Surface}, e.g. the images of a level dropped)
+        They are freed once nothing else uses them, a later get_scaled_image loads them again. Returns how many
+        """
+        keys = [key for key, image in ResourceManager._scaled_images.items() if image is not None and id(image) in surfaces]
+        for key in keys:
+            del ResourceManager._scaled_images[key]
+        return len(keys)
+
+    @staticmethod
+    def is_image_cached(path, factor=1):
+        return (path, factor) in ResourceManager._scaled_images
+
+    @staticmethod
+    def cache_scaled_image(path, factor, surface):
+        """
+        Stores an image loaded elsewhere (e.g. by a LevelLoadJob) so get_scaled_image returns it
+        """
+        ResourceManager._scaled_images[(path, factor)] = surface
+
+    @staticmethod
+    def preload_scaled_images(requests, workers=None):
+        """
+        Loads every (path, factor) of requests that isn't cached yet, decoding them in parallel (see ImageLoader)
+        Later get_scaled_image calls for them are cache hits
+        """
+        missing = [request for request in dict.fromkeys(requests) if request not in ResourceManager._scaled_images]
+        if missing:
+            ResourceManager._scaled_images.update(ImageLoader(workers).load(missing))
+
+
+    @staticmethod
+    def load_sound(path):
+        """
+        Returns a pygame.mixer.Sound for a file, from the decoded PCM cache when the file didn't change (see PCMCache)
+        """
+        return pcm_cache.load_sound(path)
+
+
     @staticmethod
     def load_all_sounds(folder_relative_path):
         sounds = {}
@@ -29,10 +101,10 @@ class ResourceManager:
         valid_ext = ('.wav', '.mp3', '.ogg')
 
         if not os.path.exists(full_path):
-            print(f"[ResourceManager] Error: Folder {folder_relative_path} doesn't exist")
+            log.error("Folder %s doesn't exist", folder_relative_path)
             return sounds
 
-        print(f"[ResourceManager] Loading sounds from: {folder_relative_path}...")
+        log.info("Loading sounds from: %s...", folder_relative_path)
 
         for root, _, files in os.walk(full_path):
             for filename in files:
@@ -41,11 +113,11 @@ class ResourceManager:
                     file_path = os.path.join(root, filename)
                     
                     try:
-                        sound = pygame.mixer.Sound(file_path)
+                        sound = ResourceManager.load_sound(file_path)
                         sounds[key_name] = sound
-                        print(f"  -> Loaded: {key_name}")
+                        log.debug("  -> Loaded: %s", key_name)
                     except Exception as e:
-                        print(f"  -> Error loading {filename}: {e}")
+                        log.error("Error loading %s: %s", filename, e)
         
         return sounds
     
@@ -56,29 +128,30 @@ class ResourceManager:
         valid_ext = ('.png', '.jpg', '.jpeg')
 
         if not os.path.exists(full_path):
-            print(f"[ResourceManager] Error: Folder: {folder_relative_path} doesn't exist")
+            log.error("Folder %s doesn't exist", folder_relative_path)
             return images
 
-        print(f"[ResourceManager] Loading images from: {folder_relative_path}...")
+        log.info("Loading images from: %s...", folder_relative_path)
 
+        files_by_name = {}
         for root, _, files in os.walk(full_path):
             for filename in files:
                 if filename.lower().endswith(valid_ext):
-                    key_name = os.path.splitext(filename)[0]
-                    file_path = os.path.join(root, filename)
-                    
-                    try:
-                        img = pygame.image.load(file_path).convert_alpha()
-                        images[key_name] = img
-                    except Exception as e:
-                        print(f"  -> Error loading image {filename}: {e}")
+                    files_by_name[os.path.splitext(filename)[0]] = os.path.join(root, filename)
+
+        # Decoded in parallel and kept in the scaled image cache (factor 1)
+        ResourceManager.preload_scaled_images([(file_path, 1) for file_path in files_by_name.values()])
+        for key_name, file_path in files_by_name.items():
+            img = ResourceManager._scaled_images.get((file_path, 1))
+            if img is not None:
+                images[key_name] = img
         
         return images
     
     @staticmethod
     def load_images_from_list(file_paths):
         loaded_images = []
-        print(f"[RESOURCE MANAGER] Loading batch of {len(file_paths)} images...")
+        log.debug("Loading batch of %s images...", len(file_paths))
 
         for path in file_paths:
             full_path = resource_path(path)
@@ -86,7 +159,7 @@ class ResourceManager:
                 img = pygame.image.load(full_path).convert_alpha()
                 loaded_images.append(img)
             except Exception as e:
-                print(f"[RESOURCE MANAGER] Error loading animation frame '{path}': {e}")
+                log.error("Error loading animation frame '%s': %s", path, e)
 
             
         return loaded_images
@@ -97,14 +170,14 @@ class ResourceManager:
             full_path = resource_path(relative_path)
             
             if not os.path.exists(full_path):
-                print(f"[ResourceManager] Error: Music file not found at {full_path}")
+                log.error("Music file not found at %s", full_path)
                 return
 
-            print(f"[ResourceManager] Playing music: {relative_path}")
+            log.info("Playing music: %s", relative_path)
             pygame.mixer.music.fadeout(fade_ms)
             pygame.mixer.music.load(full_path)
             pygame.mixer.music.set_volume(volume)
             pygame.mixer.music.play(loops)
             
         except Exception as e:
-            print(f"[ResourceManager] Critical Error loading music '{relative_path}': {e}")
\ No newline at end of file
+            log.error("Critical Error loading music '%s': %s", relative_path, e)
\ No newline at end of file
@@ -0,0 +1,284 @@
+import atexit
+import collections
+import json
+import os
+import shutil
+import threading
+from utils import resource_path
+from .GameState import game_state
+from .Game_Constants import SAVE_DIR, SAVE_COMPACT_RECORDS, SAVE_FLUSH_INTERVAL
+from .Logger import get_logger
+
+log = get_logger("SaveSystem")
+
+_SNAPSHOT_FILE = "snapshot.json"
+_JOURNAL_FILE = "journal.jsonl"
+_VERSION = 1
+
+
+def empty_state():
+    return {"flags": {}, "interacted": [], "level": None, "zone": None, "pos": None}
+
+
+def apply_record(state, record):
+    """
+    Applies one journal record [seq, op, *args] to a saved state
+    """
+    op, args = record[1], record[2:]
+    if op == "flag":
+        state["flags"][args[0]] = args[1]
+    elif op == "interact":
+        if args[0] not in state["interacted"]:
+            state["interacted"].append(args[0])
+    elif op == "level":
+        state["level"] = args[0]
+        state["zone"] = args[0]["entry_zone"]
+        state["pos"] = args[0]["player_pos"]
+    elif op == "zone":
+        state["zone"], state["pos"] = args[0], args[1]
+    else:
+        log.warning("Unknown save record '%s'", op)
+
+
+def _serialize_level(level_req):
+    """
+    A level request with its paths relative to the game folder (the saves work if the game is moved)
+    """
+    base = resource_path("")
+    music_path = level_req.get("music_path")
+    return {
+        "json_path": os.path.relpath(level_req["json_path"], base),
+        "map_matrix": level_req["map_matrix"],
+        "entry_zone": list(level_req["entry_zone"]),
+        "player_pos": list(level_req["player_pos"]),
+        "music_path": os.path.relpath(music_path, base) if music_path else None,
+        "darkness": level_req.get("darkness", False),
+    }
+
+
+def level_request(state):
+    """
+    Returns the level request (see GameState.request_level_change) that puts the player where a saved state left them
+    """
+    level = state["level"]
+    return {
+        "json_path": resource_path(level["json_path"]),
+        "map_matrix": level["map_matrix"],
+        "entry_zone": tuple(state["zone"]),
+        "player_pos": tuple(state["pos"]),
+        "music_path": resource_path(level["music_path"]) if level["music_path"] else None,
+        "darkness": level["darkness"],
+    }
+
+
+class SaveWriter:
+    """
+    Background writer of one save slot
+    The game thread only appends records to a deque (atomic, it never waits for the disk), a daemon thread
+    writes them to the journal and keeps its own copy of the saved state by applying them
+    Every SAVE_COMPACT_RECORDS records that copy is written as the new snapshot and the journal starts again
+    With snapshot the state is written as the snapshot of the slot before starting (e.g. a new game)
+    """
+    def __init__(self, directory, state, seq, interval=SAVE_FLUSH_INTERVAL, snapshot=False):
+        self.directory = directory
+        self.interval = interval
+        self.state = state
+        self.seq = seq # Last record written
+        self.buffer = collections.deque()
+
+        self._journal_records = 0
+        self._file = None
+        self._wake = threading.Event()
+        self._stop = False
+        self._write_lock = threading.Lock()
+        if snapshot:
+            self.compact()
+        self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+        self._thread.start()
+
+    def push(self, record):
+        self.buffer.append(record)
+
+    def _run(self):
+        while not self._stop:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.drain()
+
+    def _journal(self):
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(os.path.join(self.directory, _JOURNAL_FILE), "a", encoding="utf-8")
+        return self._file
+
+    def drain(self):
+        """
+        Writes every buffered record (called by the writer thread, and on close)
+        """
+        with self._write_lock:
+            buffer = self.buffer
+            if not buffer:
+                return
+            try:
+                journal = self._journal()
+                while buffer:
+                    self.seq += 1
+                    record = [self.seq, *buffer.popleft()]
+                    apply_record(self.state, record)
+                    journal.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    self._journal_records += 1
+                journal.flush()
+                os.fsync(journal.fileno())
+
+                if self._journal_records >= SAVE_COMPACT_RECORDS:
+                    self.compact()
+            except (OSError, TypeError, ValueError) as e:
+                log.error("Can't write the save %s: %s", self.directory, e)
+
+    def compact(self):
+        """
+        Writes the state as the new snapshot and empties the journal
+        A crash in between is harmless: loading skips the journal records already in the snapshot (by seq)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, _SNAPSHOT_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": _VERSION, "seq": self.seq, "state": self.state}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.directory, _SNAPSHOT_FILE))
+
+        if self._file:
+            self._file.close()
+        self._file = open(os.path.join(self.directory, _JOURNAL_FILE), "w", encoding="utf-8")
+        self._journal_records = 0
+        log.debug("Save %s compacted at record %s", self.directory, self.seq)
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self.drain()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class SaveSystem:
+    """
+    Save slots written incrementally while playing
+    Each slot is a folder with a snapshot (the whole saved state at some record) and a journal of the changes after it
+    While a slot is active every change of game_state (flags, interactions, level and zone) is appended to the
+    journal by a SaveWriter thread, so autosaving never stalls the frame
+    Loading a slot reads the snapshot and replays the journal records after it
+    """
+    def __init__(self, directory=SAVE_DIR):
+        self.directory = directory
+        self.slot = None
+        self._writer = None
+        atexit.register(self.close)
+
+    def _slot_dir(self, slot):
+        return os.path.join(self.directory, f"slot_{slot}")
+
+    def has_save(self, slot):
+        state = self.load(slot)
+        return state is not None and state["level"] is not None
+
+    def load(self, slot):
+        """
+        Returns the saved state of a slot ({"flags", "interacted", "level", "zone", "pos"}), None if there is none
+        """
+        state, seq = self._read(slot)
+        return state if seq is not None else None
+
+    def _read(self, slot):
+        """
+        Returns (state, last seq) of a slot, seq is None if the slot doesn't exist
+        """
+        slot_dir = self._slot_dir(slot)
+        state, seq = empty_state(), None
+
+        try:
+            with open(os.path.join(slot_dir, _SNAPSHOT_FILE), "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") == _VERSION:
+                state, seq = snapshot["state"], snapshot["seq"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            log.error("Save snapshot of slot %s unreadable: %s", slot, e)
+
+        try:
+            with open(os.path.join(slot_dir, _JOURNAL_FILE), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # The last line can be cut if the game closed while writing it
+                        break
+                    if seq is not None and record[0] <= seq:
+                        continue
+                    apply_record(state, record)
+                    seq = record[0]
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log.error("Save journal of slot %s unreadable: %s", slot, e)
+
+        return state, seq
+
+    # --- Recording ---
+
+    def start_new(self, slot):
+        """
+        Deletes the slot and records the current game (just reset) in it
+        """
+        self.close()
+        shutil.rmtree(self._slot_dir(slot), ignore_errors=True)
+        self._start(slot, empty_state(), 0, snapshot=True)
+
+    def resume(self, slot):
+        """
+        Loads a slot and keeps recording the game in it, returns the saved state (None if there is none)
+        Apply it to game_state with GameState.restore (not recorded) and load its level_request
+        """
+        self.close()
+        state, seq = self._read(slot)
+        if seq is None:
+            return None
+        # Compacted right away, the journal starts clean (a line cut by a crash would spoil the next ones)
+        self._start(slot, state, seq, snapshot=True)
+        # The writer works on its own copy, the caller gets another one
+        return json.loads(json.dumps(state))
+
+    def _start(self, slot, state, seq, snapshot=False):
+        self.slot = slot
+        self._writer = SaveWriter(self._slot_dir(slot), state, seq, snapshot=snapshot)
+        game_state.recorder = self.record
+        log.info("Recording the game in save slot %s", slot)
+
+    def record(self, op, *args):
+        """
+        Called by game_state for every change, it only queues the record
+        """
+        if op == "level":
+            args = (_serialize_level(args[0]),)
+        elif op == "zone":
+            args = (list(args[0]), [int(args[1][0]), int(args[1][1])])
+        self._writer.push((op, *args))
+
+    def close(self):
+        """
+        Stops recording, what is queued is written first
+        """
+        if game_state.recorder == self.record:
+            game_state.recorder = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self.slot = None
+
+
+save_system = SaveSystem()
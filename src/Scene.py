@@ -1,7 +1,16 @@
 import pygame
 from .Interactable import Interactable
-from .Trigger import Trigger
 from .GameState import game_state
+from .Broadphase import Broadphase
+from .Game_Enums import Conditions
+from .Pathfinding import Navigation
+from .EnemyBatch import EnemyBatch
+from .AIScheduler import AIScheduler
+from .EnemyFactory import enemy_factory
+from .SceneIndex import SceneIndex, OBSTACLE, INTERACTABLE, TRIGGER
+from .Logger import get_logger
+
+log = get_logger("Scene")
 
 class Scene:
     """
@@ -9,14 +18,17 @@ class Scene:
     The same Scene object is going to be used to represent the "open world", what diferentiates one scene from another is its location
     You may need to make a new Scene object if you "enter a house", because the house will have a different scenario, different object, different events, etc.
     """
-    def __init__(self, initial_location: tuple, obstacles: dict, interactables: dict, triggers: dict, enemies: dict, map_level, global_enemies=None, music_path=None, has_darkness=False):
+    def __init__(self, initial_location: tuple, obstacles: dict, interactables: dict, triggers: dict, enemies: dict, map_level, global_enemies=None, music_path=None, has_darkness=False, enemy_context=None, preload_sounds=None):
         """
         Description: Initializes the scene
         Parameters:
             initial_locaiton (tuple): A tuple (x, y) representing the starting zone in the map_level.
             obstacles (dict): A dictionary where keys are zone coordinates and values are a list of _Obstacle objects in the zone
-            enemies (dict): A dictionary where keys are zone coordinates and values are a lis of _Enemy objects in the zone
+            enemies (dict): A dictionary where keys are zone coordinates and values are a list of enemy specs (see EnemyFactory) of the zone
             map_level: The 2D array representing the game map, indicating traversable zones.
+            global_enemies (list): Enemy specs of the enemies that follow the player through every zone
+            enemy_context (dict): Runtime arguments for the enemy behaviours (target, chase_sound, flee_sound)
+            preload_sounds (list): Names of the sounds the level pins while it's the current one (see SoundLibrary.pin_level)
         Functionality:
             Initializes _obstacles which is a list of all obstacles in the scene, it will be used to load and draw the obstacles in different locations
             Initializes _interactables which is a kind of obstacles that is interactable e.g. (a door, a tree that has apples in it, a trapdoor, etc.)
@@ -28,9 +40,10 @@ class Scene:
         self._interactables_dict = interactables
         self._triggers_dict = triggers
         self.enemies_dict = enemies
-        self.global_enemies = global_enemies if global_enemies else []
+        self.enemy_context = enemy_context if enemy_context else {}
         
         self.music_path = music_path
+        self.preload_sounds = preload_sounds if preload_sounds else []
         self.darkness = has_darkness
         self.map_level = map_level
 
@@ -39,6 +52,25 @@ class Scene:
         self._triggers = pygame.sprite.Group()
         self._enemies = pygame.sprite.Group()
 
+        self.broadphase = Broadphase(self)
+        self.index = SceneIndex(obstacles, interactables, triggers)
+        self.navigation = Navigation(self)
+        self.enemy_batch = EnemyBatch()
+        self.ai_scheduler = AIScheduler()
+
+        # Enemies come from the enemy_factory pool: the global ones live as long as the scene,
+        # the ones of a zone are spawned when it's loaded and released when it's left
+        self.global_enemy_specs = global_enemies if global_enemies else []
+        self.global_enemies = enemy_factory.spawn_all(self.global_enemy_specs, self.enemy_context)
+        self._zone_enemies = []
+
+        # AutoStart triggers are queued when their flag condition becomes true, Game runs them
+        self._autostart_queue = []
+        for zone_triggers in self._triggers_dict.values():
+            for trig in zone_triggers:
+                if trig.condition == Conditions.AUTO_START and trig.flag_condition is not None:
+                    trig.flag_condition.listeners.append(lambda trig=trig: self._queue_autostart(trig))
+
         self._load_obstacles_for_current_location()
         self._load_enemies_for_current_location()
 
@@ -62,6 +94,36 @@ class Scene:
     @property
     def enemies(self):
         return self._enemies
+
+    def query_contacts(self, player):
+        """
+        Returns the triggers, interactables and enemies touching the player this frame (see Broadphase.query)
+        """
+        return self.broadphase.query(player)
+
+    def query(self, type=None, action=None, condition=None, flag=None, asset=None, zone=None, kind=None):
+        """
+        Searches the objects of every zone of the level through the indexes built at load
+        Returns a list of IndexEntry (zone, kind, obj), see SceneIndex.query
+        e.g. scene.query(action=Actions.TELEPORT) or scene.query(flag="have_key", zone=scene.location)
+        """
+        return self.index.query(type=type, action=action, condition=condition, flag=flag, asset=asset, zone=zone, kind=kind)
+
+    def _queue_autostart(self, trig):
+        if self._triggers.has(trig) and trig not in self._autostart_queue:
+            self._autostart_queue.append(trig)
+
+    def _check_autostart(self, trig):
+        if trig.condition == Conditions.AUTO_START and trig.flag_condition is not None and trig.flag_condition.value:
+            self._queue_autostart(trig)
+
+    def consume_autostarts(self):
+        """
+        Returns the AutoStart triggers that are ready to run and empties the queue
+        """
+        queue = self._autostart_queue
+        self._autostart_queue = []
+        return queue
     
 
     # I didn't change the name but a more correct name is:
@@ -75,14 +137,13 @@ class Scene:
         self._triggers.empty()
 
         if self.location in self.obstacles_dict:
-            self._obstacles.add(self.obstacles_dict[self.location])
+            for obj in self.obstacles_dict[self.location]:
+                if obj.is_present():
+                    self._obstacles.add(obj)
 
         if self.location in self._interactables_dict:
             for obj in self._interactables_dict[self.location]:
-                is_hidden = getattr(obj, 'is_hidden', False)
-                
-                should_show = not is_hidden and (not obj.interacted_once or obj.used_image)
-                if should_show:
+                if obj.is_present():
                     if isinstance(obj, Interactable):
                          self._interactables.add(obj)
                     
@@ -93,83 +154,110 @@ class Scene:
                 if trig.id and game_state.has_interacted(trig.id) or trig.is_hidden:
                     continue
                 self._triggers.add(trig)
+                self._check_autostart(trig)
 
     def _load_enemies_for_current_location(self):
+        self.enemy_batch.release()
         self._enemies.empty()
 
-        if self.location in self.enemies_dict:
-            for enemy in self.enemies_dict[self.location]:
-                self._enemies.add(enemy)
-        
-        for genemy in self.global_enemies:
-            self._enemies.add(genemy)
+        enemy_factory.release(self._zone_enemies)
+        self._zone_enemies = enemy_factory.spawn_all(self.enemies_dict.get(self.location, []), self.enemy_context)
+
+        for enemy in self._zone_enemies + self.global_enemies:
+            # Behaviours that walk around obstacles (e.g. PathfindingBehaviour) use the navigation of the scene
+            if hasattr(enemy.behaviours, "navigation"):
+                enemy.behaviours.navigation = self.navigation
+            enemy.on_moved = self.broadphase.move_enemy
+            self._enemies.add(enemy)
+
+        self.broadphase.reset_enemies()
+        self.enemy_batch.rebuild(self._enemies)
+        self.ai_scheduler.reset()
+
+    def update_enemies(self, delta_time, player=None):
+        """
+        Moves the batched enemies in bulk (see EnemyBatch) and then updates the enemies that are due this frame
+        (see AIScheduler, without a player every enemy is updated)
+        """
+        self.enemy_batch.update(delta_time, self._enemies)
+        self.ai_scheduler.update(delta_time, self._enemies, player)
     
     def set_location(self, new_location: tuple):
         """
-        Changes the current's scene location and reloads the appropriate obstacles
+        Changes the current's scene location and reloads the appropriate obstacles and enemies
+        (the enemies of the zone left go back to the enemy pool)
         """
         if self.location != new_location:
-            self.location = new_location
-            self._load_obstacles_for_current_location()
+            self.change_zone(new_location)
+
+    def _reveal(self, entry):
+        """
+        Unhides an indexed object of the current zone and adds it to its groups
+        """
+        obj = entry.obj
+        obj.unhide()
+        if entry.kind != TRIGGER:
+            self.navigation.invalidate(entry.zone)
+
+        if entry.kind == INTERACTABLE:
+            self._interactables.add(obj)
+            if not getattr(obj, 'is_passable', False):
+                self._obstacles.add(obj)
+        elif entry.kind == OBSTACLE:
+            self._obstacles.add(obj)
+        elif entry.kind == TRIGGER:
+            self._triggers.add(obj)
+            self._check_autostart(obj)
 
     def unhide_object_by_id(self, target_id):
         """
-        Searches for an object by id, ignoring spaces and checking all lists
+        Reveals an object by id (spaces are ignored) using the level index
+        The first match of the current zone is revealed right away, if the id isn't in the current zone
+        every match in the other zones is unhidden and will appear when its zone is loaded
         """
-        print(f"[SCENE] Searching hidden object with id: '{target_id}'")
-        clean_target = str(target_id).replace(" ", "")
+        entries = self.index.find(target_id)
+        if not entries:
+            log.warning("No object id found similiar to '%s'", target_id)
+            return
 
-        def search_and_reveal(object_list, destination_group):
-            for obj in object_list:
-                obj_id = getattr(obj, 'id', "")
-                clean_obj_id = str(obj_id).replace(" ", "")
-                
-                if clean_obj_id == clean_target:
-                    obj.unhide()
-                    destination_group.add(obj)
-                    
-                    if not getattr(obj, 'is_passable', False) and not isinstance(obj, Trigger):
-                        self._obstacles.add(obj)
-                        
-                    print(f"[SCENE] Object '{obj_id}' revealed.")
-                    return True
-            return False
+        current = [entry for entry in entries if entry.zone == self.location]
+        if current:
+            self._reveal(current[0])
+            log.debug("Object '%s' revealed", target_id)
+            return
 
-        if self.location in self._interactables_dict:
-            if search_and_reveal(self._interactables_dict[self.location], self._interactables):
-                return
+        for entry in entries:
+            entry.obj.unhide()
+            if entry.kind != TRIGGER:
+                self.navigation.invalidate(entry.zone)
+        log.debug("Object '%s' revealed in zone(s) %s", target_id, [entry.zone for entry in entries])
 
-        if self.location in self.obstacles_dict:
-            if search_and_reveal(self.obstacles_dict[self.location], self._obstacles):
-                return
-            
-        if self.location in self._triggers_dict:
-            if search_and_reveal(self._triggers_dict[self.location], self._triggers):
-                return
-            
-        print(f"[SCENE] ERROR: No object id found similiar to '{target_id}' in {self.location}")
+    def consume_interactable(self, obj):
+        """
+        Finishes the interaction of an interactable of the current zone (see Interactable.read)
+        If it's used up and gone the zone grid is rebuilt so enemies stop walking around it
+        """
+        obj.read()
+        if not obj.is_present():
+            self.navigation.invalidate(self.location)
 
     def hide_object_by_id(self, target_id):
-        print(f"[SCENE] Hiding object with id: '{target_id}'")
-        clean_target = str(target_id).replace(" ", "")
+        """
+        Hides every object with that id in the current zone, or in the other zones if there is none here
+        """
+        entries = self.index.find(target_id)
+        current = [entry for entry in entries if entry.zone == self.location]
 
+        for entry in current or entries:
+            entry.obj.hide()
+            entry.obj.kill()
+            if entry.kind != TRIGGER:
+                self.navigation.invalidate(entry.zone)
 
-        all_sprites = list(self._obstacles) + list(self._interactables) + list(self._triggers)
-        
-        found = False
-        for obj in all_sprites:
-            obj_id = getattr(obj, 'id', "")
-            clean_obj_id = str(obj_id).replace(" ", "")
-            
-            if clean_obj_id == clean_target:
-                if hasattr(obj, 'hide'):
-                    obj.hide()
-                
-                obj.kill()
-                found = True
-        
-        if not found:
-            print(f"[SCENE] Warning: Object '{target_id}' not found to hide.")
+        if not entries:
+            log.warning("Object '%s' not found to hide", target_id)
+        else:
+            log.debug("Object '%s' hidden", target_id)
             
     def unhide_object_by_interaction_type(self, interaction_type_to_unhide: str):
         """
@@ -188,13 +276,35 @@ class Scene:
                 self._obstacles.add(obj)
                 
                 found_and_unhidden = True
-                print(f"Secret revealed. type {interaction_type_to_unhide} appeared")
+                log.debug("Secret revealed. type %s appeared", interaction_type_to_unhide)
 
         return found_and_unhidden
     
     def cleanup(self):
-        for enemy in self._enemies:
-            enemy.reset_state()
+        """
+        Called when the level is left: ends the contacts, sends every enemy back to the pool and empties the groups
+        The objects keep their state (hidden, interacted...), the scene can be used again with activate()
+        """
+        self.broadphase.end_contacts()
+        self.enemy_batch.release()
+        self._enemies.empty()
+        enemy_factory.release(self._zone_enemies + self.global_enemies)
+        self._zone_enemies = []
+        self.global_enemies = []
+
+        self._obstacles.empty()
+        self._interactables.empty()
+        self._triggers.empty()
+        self._autostart_queue = []
+
+    def activate(self, location):
+        """
+        Makes a scene left with cleanup() playable again at location (e.g. a level cached by the LevelManager)
+        """
+        self.location = location
+        self.global_enemies = enemy_factory.spawn_all(self.global_enemy_specs, self.enemy_context)
+        self._load_obstacles_for_current_location()
+        self._load_enemies_for_current_location()
 
     def draw(self, screen, player):
         render_list = []
@@ -209,8 +319,11 @@ class Scene:
 
         render_list.append(player)
 
+        # Offscreen enemies (e.g. a Stalker waiting at -300 px) are not drawn
+        screen_rect = screen.get_rect()
         for enemy in self._enemies:
-            render_list.append(enemy)
+            if enemy.rect.colliderect(screen_rect):
+                render_list.append(enemy)
 
         def sort_key(sprite):
             if sprite in self._enemies:
@@ -248,4 +361,4 @@ class Scene:
             new_loc = (int(parts[0]), int(parts[1]))
             self.change_zone(new_loc)
         except Exception as e:
-            print(f"Error changing zone to {zone_str}: {e}")
\ No newline at end of file
+            log.error("Error changing zone to %s: %s", zone_str, e)
\ No newline at end of file
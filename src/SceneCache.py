@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from .Game_Constants import LEVEL_CACHE_BUDGET
+from .Logger import get_logger
+
+log = get_logger("SceneCache")
+
+_IMAGE_ATTRS = ("image", "original_image", "used_image", "flash_image")
+
+
+def scene_surfaces(scene):
+    """
+    Returns {id: Surface} of every Surface the objects of a scene use (images and animation frames)
+    """
+    surfaces = {}
+    for zones in (scene.obstacles_dict, scene._interactables_dict):
+        for objects in zones.values():
+            for obj in objects:
+                for attr in _IMAGE_ATTRS:
+                    surface = getattr(obj, attr, None)
+                    if surface is not None:
+                        surfaces[id(surface)] = surface
+                animation = getattr(obj, "animation", None)
+                if animation is not None:
+                    for surface in animation.images:
+                        surfaces[id(surface)] = surface
+    return surfaces
+
+
+def estimate_scene_memory(scene):
+    """
+    Bytes of the Surfaces the objects of a scene keep alive (each Surface counted once)
+    Surfaces shared through the ResourceManager cache are counted too, the LevelManager releases the ones
+    no other level uses from that cache when the scene is evicted
+    """
+    surfaces = scene_surfaces(scene)
+    return sum(surface.get_width() * surface.get_height() * surface.get_bytesize() for surface in surfaces.values())
+
+
+class SceneCache:
+    """
+    Levels recently left, kept with cleanup() already run so coming back is just Scene.activate()
+    Scenes are keyed by the path of their JSON, their objects keep their state (hidden, interacted...)
+    When the scenes kept go over the memory budget the least recently left ones are dropped
+    The scene being played is never in the cache: take() removes it and put() adds it back when it's left
+    on_evict (optional) is called with (json_path, scene) for every scene dropped for the budget, it's
+    the one that frees its images (e.g. releasing them from the ResourceManager cache)
+    """
+    def __init__(self, budget=LEVEL_CACHE_BUDGET, on_evict=None):
+        self.budget = budget
+        self.on_evict = on_evict
+        self.memory_used = 0
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+        self._scenes = OrderedDict() # json_path -> (scene, size), least recently left first
+
+    def __contains__(self, json_path):
+        return json_path in self._scenes
+
+    def __len__(self):
+        return len(self._scenes)
+
+    def keys(self):
+        return list(self._scenes)
+
+    def scenes(self):
+        return [scene for scene, size in self._scenes.values()]
+
+    def put(self, json_path, scene):
+        """
+        Keeps a scene that was just left (cleanup() already called)
+        """
+        self.discard(json_path)
+        size = estimate_scene_memory(scene)
+        if size > self.budget:
+            log.debug("Level %s (%s KB) doesn't fit in the cache", json_path, size // 1024)
+            if self.on_evict:
+                self.on_evict(json_path, scene)
+            return
+
+        self._scenes[json_path] = (scene, size)
+        self.memory_used += size
+        self._evict()
+        log.debug("Level %s cached (%s KB)", json_path, size // 1024)
+
+    def take(self, json_path):
+        """
+        Removes and returns the cached scene of a level, None if it isn't cached
+        """
+        entry = self._scenes.pop(json_path, None)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.memory_used -= entry[1]
+        self.stats["hits"] += 1
+        return entry[0]
+
+    def discard(self, json_path):
+        entry = self._scenes.pop(json_path, None)
+        if entry is not None:
+            self.memory_used -= entry[1]
+
+    def clear(self):
+        self._scenes.clear()
+        self.memory_used = 0
+
+    def _evict(self):
+        while self.memory_used > self.budget and self._scenes:
+            json_path, (scene, size) = self._scenes.popitem(last=False)
+            self.memory_used -= size
+            self.stats["evicted"] += 1
+            log.debug("Evicted level %s", json_path)
+            if self.on_evict:
+                self.on_evict(json_path, scene)
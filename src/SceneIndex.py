@@ -0,0 +1,181 @@
+from collections import namedtuple
+from .ActionParams import parse_action_params, compile_script, EMPTY_PARAMS
+from .FlagConditions import compile_expression
+
+# Which scene list an object belongs to
+OBSTACLE = "obstacle"
+INTERACTABLE = "interactable"
+TRIGGER = "trigger"
+
+# Object types (the 'type' of the JSON) stored in each list
+_KIND_BY_TYPE = {"Interactable": INTERACTABLE, "Trigger": TRIGGER}
+
+# An indexed object: the zone it lives in, its kind and the object itself
+# (a game object when built by the Scene, the raw JSON dict when built with from_level_data)
+IndexEntry = namedtuple("IndexEntry", ["zone", "kind", "obj"])
+
+# JSON fields and action parameters that hold a path or the name of an asset
+_ASSET_FIELDS = ("image_path", "used_image_path", "flash_image_path", "charge_sound_path")
+_ASSET_PARAMS = ("image", "path", "music", "json", "sound")
+_FLAG_PARAMS = ("flag", "flag_a", "flag_b")
+
+
+def normalize_id(obj_id):
+    """
+    Ids are compared ignoring spaces ('obj 1' == 'obj1'), the editor doesn't strip them
+    """
+    return str(obj_id).replace(" ", "")
+
+
+def _is_set(value):
+    return value not in (None, "", "None")
+
+
+class SceneIndex:
+    """
+    Indexes of every object of a level (all zones, loaded or not)
+    Built once at load: by normalized id, zone, type, action (trigger_action and scripted_events),
+    trigger_condition, referenced flags and asset paths. query() intersects them so neither the game
+    nor the tools need to walk the zones
+    """
+    def __init__(self, obstacles=None, interactables=None, triggers=None):
+        self._entries = []
+        self._by_id = {}
+        self._indexes = {"zone": {}, "type": {}, "action": {}, "condition": {}, "flag": {}, "asset": {}}
+
+        # Same order the scene used to search: interactables, obstacles, triggers
+        for kind, zones in ((INTERACTABLE, interactables), (OBSTACLE, obstacles), (TRIGGER, triggers)):
+            for zone, objects in (zones or {}).items():
+                for obj in objects:
+                    self.add(zone, kind, obj)
+
+    @classmethod
+    def from_level_data(cls, data):
+        """
+        Builds the index from a level JSON (already loaded as a dict), e.g. for the editor
+        Entries hold the object dicts and zones stay as the JSON keys ('(y, x)')
+        """
+        index = cls()
+        for zone, objects in data.get("zones", {}).items():
+            for obj_data in objects:
+                index.add(zone, _KIND_BY_TYPE.get(obj_data.get("type"), OBSTACLE), obj_data)
+        return index
+
+    def add(self, zone, kind, obj):
+        position = len(self._entries)
+        self._entries.append(IndexEntry(zone, kind, obj))
+
+        data = obj if isinstance(obj, dict) else getattr(obj, "data", {})
+
+        obj_id = data.get("id") if isinstance(obj, dict) else getattr(obj, "id", None)
+        if _is_set(obj_id):
+            self._by_id.setdefault(normalize_id(obj_id), []).append(position)
+
+        self._add_key("zone", zone, position)
+        self._add_key("type", data.get("type"), position)
+        if kind != OBSTACLE:
+            self._add_key("condition", self._action_and_condition(obj, data)[1], position)
+
+        actions, flags, assets = self._references(obj, kind, data)
+        for action in actions:
+            self._add_key("action", action, position)
+        for flag in flags:
+            self._add_key("flag", flag, position)
+        for asset in assets:
+            self._add_key("asset", asset, position)
+
+    def _add_key(self, index, key, position):
+        if not _is_set(key):
+            return
+        positions = self._indexes[index].setdefault(key, [])
+        if not positions or positions[-1] != position:
+            positions.append(position)
+
+    @staticmethod
+    def _action_and_condition(obj, data):
+        if isinstance(obj, dict):
+            return data.get("trigger_action"), data.get("trigger_condition")
+        if hasattr(obj, "condition"):
+            return obj.action, obj.condition
+        return obj.trigger_action, obj.trigger_condition
+
+    def _references(self, obj, kind, data):
+        """
+        Returns the (actions, flags, assets) an object refers to, from its fields, params and scripted events
+        Game objects already have their params parsed, raw dicts are parsed here
+        """
+        flags = []
+        assets = [data.get(field) for field in _ASSET_FIELDS]
+        assets.extend(data.get("animation_images") or [])
+
+        # Only interactables and triggers run actions, plain obstacles ignore their trigger fields
+        if kind == OBSTACLE:
+            return [], [], [asset for asset in assets if isinstance(asset, str)]
+
+        action, condition = self._action_and_condition(obj, data)
+        if isinstance(obj, dict):
+            params = parse_action_params(data.get("trigger_params", ""), action, condition, source=data.get("id"))
+            script = compile_script(data.get("scripted_events"), source=data.get("id"))
+        else:
+            params = getattr(obj, "parsed_params", EMPTY_PARAMS)
+            script = getattr(obj, "scripted_events", ())
+
+        actions = [action]
+
+        for step_params in [params] + [step.params for step in script]:
+            flags.extend(step_params.get(key) for key in _FLAG_PARAMS)
+            assets.extend(step_params.get(key) for key in _ASSET_PARAMS)
+        actions.extend(step.action for step in script)
+
+        flag_condition = getattr(obj, "flag_condition", None)
+        if flag_condition is not None:
+            flags.extend(flag_condition.flags)
+        elif params.get("expr"):
+            try:
+                flags.extend(compile_expression(params.get("expr"))[0])
+            except ValueError:
+                pass
+
+        return actions, [flag for flag in flags if isinstance(flag, str)], [asset for asset in assets if isinstance(asset, str)]
+
+    def find(self, obj_id, zone=None):
+        """
+        Returns the IndexEntry list of every object with that id (only the ones in zone if given)
+        """
+        entries = [self._entries[position] for position in self._by_id.get(normalize_id(obj_id), ())]
+        if zone is None:
+            return entries
+        return [entry for entry in entries if entry.zone == zone]
+
+    def __contains__(self, obj_id):
+        return normalize_id(obj_id) in self._by_id
+
+    def query(self, type=None, action=None, condition=None, flag=None, asset=None, zone=None, kind=None):
+        """
+        Returns the IndexEntry list (in load order) of the objects that match every filter given
+        e.g. query(action=Actions.TELEPORT), query(flag="have_key"), query(type="Interactable", zone=(1, 1))
+        An action matches the trigger_action or any step of the scripted events
+        """
+        filters = {"type": type, "action": action, "condition": condition, "flag": flag, "asset": asset, "zone": zone}
+
+        result = None
+        for index, key in filters.items():
+            if key is None:
+                continue
+            positions = self._indexes[index].get(key, ())
+            result = set(positions) if result is None else result.intersection(positions)
+            if not result:
+                return []
+
+        positions = sorted(result) if result is not None else range(len(self._entries))
+        entries = [self._entries[position] for position in positions]
+        if kind is not None:
+            entries = [entry for entry in entries if entry.kind == kind]
+        return entries
+
+    def keys(self, index):
+        """
+        Returns every value indexed for 'zone', 'type', 'action', 'condition', 'flag' or 'asset'
+        e.g. keys("flag") lists every flag the level refers to
+        """
+        return list(self._indexes[index].keys())
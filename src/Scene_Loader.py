@@ -1,69 +1,128 @@
 import json
 from .Scene import Scene
-from .Enemies import *
-from .Behaviour import *
 from .Obstacles import Obstacle
 from .Primitive import Primitive
 from .Mirror import Mirror
 from .Interactable import Interactable
 from .Trigger import Trigger
+from .SoundLibrary import sound_library
+from .ResourceManager import ResourceManager
+from .Game_Constants import RESIZE_FACTOR
+from utils import resource_path
+
+def _is_path(value):
+    return isinstance(value, str) and value not in ("", "None")
+
 
 class SceneLoader:
     @staticmethod
-    def load_from_json(path: str, map_level: list, initial_zone: tuple, player, chase_sound, flee_sound, music_path=None, has_darkness=False) -> Scene:
+    def image_requests(zone_data):
+        """
+        Returns the (path, factor) of every image the objects of the level will load, in the same
+        form the objects ask ResourceManager.get_scaled_image for them
+        """
+        requests = []
+        for objects_data_list in zone_data.values():
+            for obj_data in objects_data_list:
+                if obj_data.get("type") not in ("Obstacle", "Mirror", "Interactable"):
+                    continue
+                resize_factor = obj_data.get("resize_factor", RESIZE_FACTOR)
+                if _is_path(obj_data.get("image_path")):
+                    requests.append((resource_path(obj_data["image_path"]), resize_factor))
+                if obj_data.get("type") == "Interactable":
+                    if _is_path(obj_data.get("used_image_path")):
+                        requests.append((resource_path(obj_data["used_image_path"]), float(resize_factor)))
+                    if _is_path(obj_data.get("flash_image_path")):
+                        # Scaled to the size of the image when the object is built (from this one if it isn't baked)
+                        requests.append((resource_path(obj_data["flash_image_path"]), 1))
+                for path in obj_data.get("animation_images") or []:
+                    requests.append((resource_path(path), RESIZE_FACTOR))
+        return requests
+
+    @staticmethod
+    def read_level(path: str) -> dict:
         with open(path, 'r') as f:
-            data = json.load(f)
+            return json.load(f)
 
-        zone_data = data.get("zones", {})
-        zone_obstacles = {}
-        zone_interactables = {}
-        zone_triggers = {}
+    @staticmethod
+    def build_zone(objects_data_list: list, player):
+        """
+        Builds the objects of one zone, returns the lists (obstacles, interactables, triggers)
+        """
+        obstacle_list = []
+        interactable_list = []
+        trigger_list = []
 
-        for zone_str, objects_data_list in zone_data.items():
-            zone = eval(zone_str)
-            obstacle_list = []
-            interactable_list = []
-            trigger_list = []
+        for obj_data in objects_data_list:
+            obj_type = obj_data.get("type")
 
-            for obj_data in objects_data_list:
-                obj_type = obj_data.get("type")
-
-                if obj_type == "Obstacle":
-                    obstacle = Obstacle(obj_data)
-                    obstacle_list.append(obstacle)
-                elif obj_type == "Primitive":
-                    primitive = Primitive(obj_data)
-                    obstacle_list.append(primitive)
-                elif obj_type == "Mirror":
-                    mirror = Mirror(obj_data, player)
-                    obstacle_list.append(mirror)
-                elif obj_type == "Interactable":
-                    interactable = Interactable(obj_data)
-                    interactable_list.append(interactable)
-                elif obj_type == "Trigger":
-                    trigger = Trigger(obj_data)
-                    trigger_list.append(trigger)
-                
-            zone_obstacles[zone] = obstacle_list
-            zone_interactables[zone] = interactable_list
-            zone_triggers[zone] = trigger_list
-
-            global_enemies = []
-            if "school" not in path.lower():
-                stalker = Stalker_Ghost(-200, -200, 100, StalkerBehaviour(player, speed=300, min_wait=20.0, max_wait=60.0, stop_distance=50, chase_sound=chase_sound, flee_sound=flee_sound))
-                global_enemies.append(stalker)
-
-            enemy_dict_placeholder = {}
+            if obj_type == "Obstacle":
+                obstacle = Obstacle(obj_data)
+                obstacle_list.append(obstacle)
+            elif obj_type == "Primitive":
+                primitive = Primitive(obj_data)
+                obstacle_list.append(primitive)
+            elif obj_type == "Mirror":
+                mirror = Mirror(obj_data, player)
+                obstacle_list.append(mirror)
+            elif obj_type == "Interactable":
+                interactable = Interactable(obj_data)
+                interactable_list.append(interactable)
+            elif obj_type == "Trigger":
+                trigger = Trigger(obj_data)
+                trigger_list.append(trigger)
+
+        return obstacle_list, interactable_list, trigger_list
+
+    @staticmethod
+    def build_scene(data: dict, zones: dict, map_level: list, initial_zone: tuple, player, chase_sound, flee_sound, music_path=None, has_darkness=False) -> Scene:
+        """
+        Builds the Scene from the level data and its zones already built with build_zone ({zone: (obstacles, interactables, triggers)})
+        """
+        zone_obstacles = {zone: objects[0] for zone, objects in zones.items()}
+        zone_interactables = {zone: objects[1] for zone, objects in zones.items()}
+        zone_triggers = {zone: objects[2] for zone, objects in zones.items()}
+
+        # Enemies are declared in the JSON as specs ({"type", "x", "y", "health", "behaviour"}, see EnemyFactory)
+        # "enemies" has the ones of each zone and "global_enemies" the ones that follow the player through every zone
+        zone_enemies = {}
+        for zone_str, enemy_specs in data.get("enemies", {}).items():
+            zone_enemies[eval(zone_str)] = enemy_specs
+        global_enemies = data.get("global_enemies", [])
 
+        enemy_context = {"target": player, "chase_sound": chase_sound, "flee_sound": flee_sound}
 
         return Scene(
             initial_zone, 
             zone_obstacles, 
             zone_interactables, 
             zone_triggers, 
-            enemy_dict_placeholder, 
+            zone_enemies, 
             map_level, 
             global_enemies=global_enemies, 
             music_path=music_path, 
-            has_darkness=has_darkness
-        )
\ No newline at end of file
+            has_darkness=has_darkness,
+            enemy_context=enemy_context,
+            preload_sounds=data.get("preload_sounds", [])
+        )
+
+    @staticmethod
+    def load_from_json(path: str, map_level: list, initial_zone: tuple, player, chase_sound, flee_sound, music_path=None, has_darkness=False) -> Scene:
+        """
+        Loads a whole level at once (see LevelLoadJob to load it over several frames)
+        """
+        data = SceneLoader.read_level(path)
+
+        # Sounds the level needs right away (decoded now instead of the first time they play)
+        sound_library.preload_level(data.get("preload_sounds", []))
+
+        zone_data = data.get("zones", {})
+
+        # Every image of the level is decoded at once on all cores, the objects below get them from the cache
+        ResourceManager.preload_scaled_images(SceneLoader.image_requests(zone_data))
+
+        zones = {}
+        for zone_str, objects_data_list in zone_data.items():
+            zones[eval(zone_str)] = SceneLoader.build_zone(objects_data_list, player)
+
+        return SceneLoader.build_scene(data, zones, map_level, initial_zone, player, chase_sound, flee_sound, music_path, has_darkness)
@@ -0,0 +1,201 @@
+import os
+from collections import OrderedDict
+import pygame
+from utils import resource_path
+from .ResourceManager import ResourceManager
+from .Game_Constants import SOUND_MEMORY_BUDGET, SOUND_DEFAULT_VOLUMES
+from .Logger import get_logger
+
+log = get_logger("SoundLibrary")
+
+_VALID_EXT = ('.wav', '.mp3', '.ogg')
+
+
+class _LoadedSound:
+    __slots__ = ("sound", "size")
+
+    def __init__(self, sound, size):
+        self.sound = sound
+        self.size = size
+
+
+class SoundLibrary:
+    """
+    Registry of every sound of the game
+    Folders are only indexed at startup (name -> path), a sound is decoded the first time it's requested
+    Each file is loaded once (through ResourceManager.load_sound, decoded or from the PCM cache) whatever the name or object asking for it (deduplicated by path)
+    When the decoded sounds go over the memory budget the least recently used ones are dropped,
+    except the pinned ones and the ones that are playing
+    It can be used like the old dict of sounds: sounds.get("scream"), sounds["scream"], "scream" in sounds
+    Don't keep the Sound objects of unpinned sounds, ask the library every time (an evicted sound is decoded again)
+    """
+    def __init__(self, budget=SOUND_MEMORY_BUDGET):
+        self.budget = budget
+        self.memory_used = 0
+        self.stats = {"hits": 0, "decoded": 0, "evicted": 0}
+
+        self._paths = {}
+        self._loaded = OrderedDict() # path -> _LoadedSound, least recently used first
+        self._pinned = set() # paths
+        self._level_pinned = set() # paths pinned by the preload list of the current level
+        self._missing = set() # paths that failed, so they aren't retried every frame
+
+    # --- Index ---
+
+    def index_folder(self, folder_relative_path):
+        """
+        Registers every sound file of a folder (and its subfolders) by its name without extension
+        Returns the names found
+        """
+        full_path = resource_path(folder_relative_path)
+        names = []
+
+        if not os.path.exists(full_path):
+            log.error("Folder %s doesn't exist", folder_relative_path)
+            return names
+
+        for root, _, files in os.walk(full_path):
+            for filename in files:
+                if filename.lower().endswith(_VALID_EXT):
+                    name = os.path.splitext(filename)[0]
+                    self._paths[name] = os.path.abspath(os.path.join(root, filename))
+                    names.append(name)
+
+        log.info("Indexed %s sounds from: %s", len(names), folder_relative_path)
+        return names
+
+    def path_of(self, name):
+        return self._paths.get(name)
+
+    # --- Dict interface ---
+
+    def __contains__(self, name):
+        return name in self._paths
+
+    def __getitem__(self, name):
+        if name not in self._paths:
+            raise KeyError(name)
+        return self.load(self._paths[name], name)
+
+    def get(self, name, default=None):
+        if name not in self._paths:
+            return default
+        sound = self.load(self._paths[name], name)
+        return sound if sound is not None else default
+
+    def keys(self):
+        return self._paths.keys()
+
+    def __len__(self):
+        return len(self._paths)
+
+    # --- Loading ---
+
+    def load(self, path, name=None):
+        """
+        Returns the Sound of a file path, decoding it if it isn't in memory, or None if it can't be loaded
+        """
+        path = os.path.abspath(path)
+        entry = self._loaded.get(path)
+        if entry is not None:
+            self._loaded.move_to_end(path)
+            self.stats["hits"] += 1
+            return entry.sound
+
+        if path in self._missing:
+            return None
+
+        try:
+            sound = ResourceManager.load_sound(path)
+        except Exception as e:
+            log.error("Error loading sound %s: %s", path, e)
+            self._missing.add(path)
+            return None
+
+        name = name if name is not None else os.path.splitext(os.path.basename(path))[0]
+        if name in SOUND_DEFAULT_VOLUMES:
+            sound.set_volume(SOUND_DEFAULT_VOLUMES[name])
+
+        entry = _LoadedSound(sound, self._decoded_size(sound))
+        self._loaded[path] = entry
+        self.memory_used += entry.size
+        self.stats["decoded"] += 1
+        log.debug("Decoded %s (%s KB)", name, entry.size // 1024)
+
+        self._evict(keep=path)
+        return sound
+
+    @staticmethod
+    def _decoded_size(sound):
+        """
+        Bytes of PCM of a decoded sound, from its length and the mixer format
+        """
+        frequency, sample_format, channels = pygame.mixer.get_init() or (44100, -16, 2)
+        return int(sound.get_length() * frequency * channels * (abs(sample_format) // 8))
+
+    def _evict(self, keep=None):
+        """
+        Drops the least recently used sounds until the memory used fits in the budget
+        """
+        if self.memory_used <= self.budget:
+            return
+
+        for path in list(self._loaded):
+            if self.memory_used <= self.budget:
+                break
+            if path == keep or path in self._pinned or path in self._level_pinned:
+                continue
+
+            entry = self._loaded[path]
+            if entry.sound.get_num_channels() > 0:
+                continue
+
+            del self._loaded[path]
+            self.memory_used -= entry.size
+            self.stats["evicted"] += 1
+            log.debug("Evicted %s", path)
+
+        if self.memory_used > self.budget:
+            log.warning("Sounds in use take %s KB, over the budget of %s KB", self.memory_used // 1024, self.budget // 1024)
+
+    # --- Pinning and preload ---
+
+    def pin(self, *names):
+        """
+        Pinned sounds are never evicted (e.g. sounds kept by objects for a long time, like the chase loop)
+        """
+        for name in names:
+            if name in self._paths:
+                self._pinned.add(self._paths[name])
+
+    def unpin(self, *names):
+        for name in names:
+            self._pinned.discard(self._paths.get(name))
+
+    def pin_level(self, names):
+        """
+        Pins the sounds of the preload list of a level until the next level replaces the list
+        (the sounds of the previous list can be evicted again), returns the names that exist
+        """
+        self._level_pinned = set()
+        found = []
+        for name in names:
+            path = self._paths.get(name)
+            if path is None:
+                log.warning("Sound '%s' to preload not found", name)
+                continue
+            self._level_pinned.add(path)
+            found.append(name)
+        return found
+
+    def preload_level(self, names):
+        """
+        Pins (see pin_level) and decodes the sounds of the preload list of a level
+        """
+        for name in self.pin_level(names):
+            self.load(self._paths[name], name)
+
+        self._evict()
+
+
+sound_library = SoundLibrary()
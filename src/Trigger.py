@@ -1,6 +1,9 @@
 import pygame
 from .GameState import game_state
 from .Game_Enums import Conditions
+from .ActionParams import parse_action_params, compile_script
+from .ActionRegistry import ActionRegistry
+from .FlagConditions import build_flag_condition
 
 class Trigger(pygame.sprite.Sprite):
     def __init__(self, data):
@@ -10,6 +13,16 @@ class Trigger(pygame.sprite.Sprite):
         self.condition = data.get("trigger_condition", Conditions.ON_STAY)
         self.action = data.get("trigger_action", "None")
         self.params = data.get("trigger_params", "")
+
+        # Parsed once here, executing the trigger doesn't parse strings again
+        self.parsed_params = parse_action_params(self.params, self.action, self.condition, source=self.id)
+        self.scripted_events = compile_script(data.get("scripted_events"), source=self.id)
+        self.action_handler = ActionRegistry.resolve(self.action) if self.action and self.action != "None" else None
+
+        # IfFlag/AutoStart triggers keep their condition cached, it's only evaluated again when its flags change
+        self.flag_condition = None
+        if self.condition in (Conditions.IF_FLAG, Conditions.AUTO_START):
+            self.flag_condition = build_flag_condition(self.parsed_params, source=self.id)
         
         x = data.get("x", 0)
         y = data.get("y", 0)
@@ -41,5 +54,14 @@ class Trigger(pygame.sprite.Sprite):
     def unhide(self):
         self.is_hidden = False
 
+    def snapshot_state(self):
+        """
+        Returns the state that changes while playing (see LevelTemplate), restore_state puts it back
+        """
+        return {"is_hidden": self.is_hidden}
+
+    def restore_state(self, state):
+        self.is_hidden = state["is_hidden"]
+
     def update(self):
         pass
\ No newline at end of file
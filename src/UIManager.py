@@ -2,6 +2,11 @@ import pygame
 from utils import resource_path
 from src.Game_Constants import SCREEN_WIDTH, SCREEN_HEIGHT
 from src.ResourceManager import ResourceManager
+from src.AudioManager import audio_manager
+from src.Game_Enums import SoundCategories
+from src.Logger import get_logger
+
+log = get_logger("UIManager")
 
 class UIManager:
     def __init__(self, sounds, retro_effects):
@@ -65,7 +70,7 @@ class UIManager:
             self.active = True
             self.is_blocking = blocking
         else:
-            print(f"[UI] Error: No valid frames for animation.")
+            log.error("No valid frames for animation")
             self.active = False
             self.is_blocking = False
 
@@ -102,13 +107,13 @@ class UIManager:
                 if self.content_type == "NOTE" and self.current_page < len(self.note_pages) -1:
                     self.current_page += 1
                     self.content_data = self.note_pages[self.current_page]
-                    self.sounds["turn_pages"].play()
+                    audio_manager.play(self.sounds["turn_pages"], SoundCategories.UI)
                     self.retro_effects.add_trauma(0.5)
                 elif self.content_type == "NOTE" and self.current_page == len(self.note_pages) -1:
-                    self.sounds["note_closed"].play()
+                    audio_manager.play(self.sounds["note_closed"], SoundCategories.UI)
                     self.close()
                 elif self.content_type == "DIALOGUE":
-                    self.sounds["dialogue_closed"].play()
+                    audio_manager.play(self.sounds["dialogue_closed"], SoundCategories.UI)
                     self.close()
                 else:
                     # Here are the other content_types: DIALOGUE, IMAGE, ANIMATION
@@ -235,7 +240,7 @@ class UIManager:
             screen.blit(img, img_rect)
             
         except Exception as e:
-            print(f"Error UI image: {e}")
+            log.error("Error UI image: %s", e)
 
         close_txt = self.ui_font.render("Press 'SPACE' to close", True, (200, 200, 200))
         rect = close_txt.get_rect(centerx=SCREEN_WIDTH//2, bottom=SCREEN_HEIGHT - 20)
@@ -248,6 +253,26 @@ class UIManager:
         img_rect = current_img.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
         screen.blit(current_img, img_rect)
 
+    @staticmethod
+    def draw_loading_screen(screen, progress):
+        """
+        Draws the loading screen of a level: an animated text and a progress bar (progress from 0.0 to 1.0)
+        The RetroEffects are drawn on top by the Game
+        """
+        screen.fill((0, 0, 0))
+
+        dots = "." * (1 + (pygame.time.get_ticks() // 300) % 3)
+        font = ResourceManager.get_font(40)
+        txt = font.render("Cargando" + dots, True, (200, 200, 200))
+        screen.blit(txt, txt.get_rect(midleft=(SCREEN_WIDTH // 2 - txt.get_width() // 2, SCREEN_HEIGHT // 2 - 30)))
+
+        bar = pygame.Rect(0, 0, SCREEN_WIDTH // 3, 12)
+        bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20)
+        pygame.draw.rect(screen, (200, 200, 200), bar, 1)
+        fill = bar.inflate(-4, -4)
+        fill.width = int(fill.width * max(0.0, min(1.0, progress)))
+        pygame.draw.rect(screen, (200, 200, 200), fill)
+
     @staticmethod
     def draw_game_over(screen, image):
         if image: